@@ -0,0 +1,176 @@
+"""Benchmark gitag components and the end-to-end flow on synthetic repositories.
+
+Usage:
+    python -m benchmarks.run --commits 1000 100000 --merge-every 0 10 --output results.json
+    python -m benchmarks.run --commits 100000 --baseline benchmarks/baseline.json          # compare
+    python -m benchmarks.run --commits 100000 --baseline benchmarks/baseline.json --update-baseline
+    python -m benchmarks.run --commits 10000 --backends subprocess pygit2 dulwich           # compare backends
+
+Each metric is measured `--repeat` times; the minimum is used for regression checks
+because it is the least sensitive to scheduler noise.
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from benchmarks.synth_repo import DEFAULT_MIX, RepoSpec, cached_repo, parse_mix
+from gitag.auto_tagger import GitAutoTagger
+from gitag.backends import BACKENDS
+from gitag.changelog_writer import ChangelogWriter
+from gitag.config import MergeStrategy
+from gitag.git_repo import GitRepo
+from gitag.version_manager import VersionManager
+
+
+def measure(func: Callable[[], object], repeat: int) -> dict:
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return {"min": round(min(durations), 6), "median": round(statistics.median(durations), 6)}
+
+
+def bench_repo(path: Path, repeat: int, workdir: Path, backend: str = "subprocess") -> dict:
+    repo = GitRepo(cwd=str(path), merge_strategy=MergeStrategy.ALWAYS, backend=backend)
+    versioning = VersionManager(str(workdir / "pyproject.toml"))
+    base = repo.get_latest_tag(fetch=False)
+    tail = repo.get_commit_messages(since_tag=base)
+    history = repo.get_commit_messages(since_tag=None)
+    categorized = versioning.categorize_commits(history)
+    changelog = ChangelogWriter(path=str(workdir / "CHANGELOG.md"), mode="overwrite")
+
+    def end_to_end():
+        tagger = GitAutoTagger(repo_path=str(path), changelog=True, versioning=versioning, backend=backend)
+        tagger.changelog_writer = ChangelogWriter(path=str(workdir / "E2E_CHANGELOG.md"), mode="overwrite")
+        tagger.run(dry_run=True)
+
+    return {
+        "commits_in_tail": len(tail),
+        "commits_in_history": len(history),
+        "metrics": {
+            "git.latest_tag": measure(lambda: repo.get_latest_tag(fetch=False), repeat),
+            "git.commit_messages.tail": measure(lambda: repo.get_commit_messages(since_tag=base), repeat),
+            "git.commit_messages.history": measure(lambda: repo.get_commit_messages(since_tag=None), repeat),
+            "version.determine_bump": measure(lambda: versioning.determine_bump(history), repeat),
+            "version.categorize_commits": measure(lambda: versioning.categorize_commits(history), repeat),
+            "changelog.write": measure(lambda: changelog.write("v9.9.9", categorized), repeat),
+            "end_to_end.dry_run": measure(end_to_end, repeat),
+        },
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float, floor: float) -> list[dict]:
+    """Return metrics whose minimum time grew by more than `threshold` (ratio) against the baseline."""
+    regressions = []
+    for scenario, current in results["results"].items():
+        previous = baseline.get("results", {}).get(scenario)
+        if not previous:
+            continue
+        for metric, timing in current["metrics"].items():
+            before = previous["metrics"].get(metric)
+            if not before:
+                continue
+            now, then = timing["min"], before["min"]
+            if max(now, then) < floor:
+                continue  # Too fast to compare reliably
+            ratio = now / then if then else float("inf")
+            if ratio > threshold:
+                regressions.append(
+                    {"scenario": scenario, "metric": metric, "baseline": then, "current": now, "ratio": round(ratio, 2)}
+                )
+    return regressions
+
+
+def environment() -> dict:
+    git = subprocess.run(["git", "--version"], capture_output=True, text=True).stdout.strip()
+    return {"python": platform.python_version(), "git": git, "platform": platform.platform()}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run gitag benchmarks on synthetic repositories.")
+    parser.add_argument("--commits", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--tags", type=int, default=20)
+    parser.add_argument("--tail", type=int, default=None, help="Commits after the last tag (default: 10%%)")
+    parser.add_argument("--merge-every", type=int, nargs="+", default=[0])
+    parser.add_argument("--branch-length", type=int, default=3)
+    parser.add_argument("--mix", type=parse_mix, default=dict(DEFAULT_MIX))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        choices=list(BACKENDS),
+        default=["subprocess"],
+        help="Git backends to measure; scenarios for non-default backends are keyed `<scenario>@<backend>`",
+    )
+    parser.add_argument("--repos-dir", type=Path, default=Path(tempfile.gettempdir()) / "gitag-bench-repos")
+    parser.add_argument("--output", type=Path, help="Write results JSON here")
+    parser.add_argument("--baseline", type=Path, help="Baseline JSON to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Slowdown ratio counted as regression")
+    parser.add_argument("--floor", type=float, default=0.002, help="Ignore metrics faster than this (seconds)")
+    args = parser.parse_args(argv)
+
+    logging.getLogger("gitag").setLevel(logging.ERROR)
+
+    results = {"environment": environment(), "results": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        for commits, merge_every in itertools.product(args.commits, args.merge_every):
+            spec = RepoSpec(
+                commits=commits,
+                tags=args.tags,
+                tail=args.tail if args.tail is not None else max(commits // 10, 1),
+                merge_every=merge_every,
+                branch_length=args.branch_length,
+                mix=args.mix,
+            )
+            start = time.perf_counter()
+            path = cached_repo(args.repos_dir, spec)
+            print(f"▶ {spec.key()} (repo ready in {time.perf_counter() - start:.1f}s)", file=sys.stderr)
+
+            for backend in args.backends:
+                scenario = bench_repo(path, args.repeat, workdir, backend)
+                scenario["spec"] = spec.to_dict()
+                key = spec.key() if backend == "subprocess" else f"{spec.key()}@{backend}"
+                results["results"][key] = scenario
+                if len(args.backends) > 1:
+                    print(f"  [{backend}]", file=sys.stderr)
+                for metric, timing in scenario["metrics"].items():
+                    print(f"  {metric:<30} min {timing['min']:.4f}s  median {timing['median']:.4f}s", file=sys.stderr)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+    exit_code = 0
+    if args.baseline and args.baseline.exists() and not args.update_baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold, args.floor)
+        for r in regressions:
+            print(
+                f"❌ Regression {r['scenario']} {r['metric']}: {r['baseline']:.4f}s → {r['current']:.4f}s "
+                f"(x{r['ratio']})",
+                file=sys.stderr,
+            )
+        exit_code = 1 if regressions else 0
+        if not regressions:
+            print("✅ No regressions against baseline.", file=sys.stderr)
+
+    if args.baseline and args.update_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"📝 Baseline written to {args.baseline}", file=sys.stderr)
+
+    return exit_code
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""Build synthetic git repositories for benchmarking via `git fast-import`.
+
+Commits carry no file content (every commit reuses the empty tree), so even
+million-commit histories are generated in seconds and stay small on disk.
+"""
+
+import argparse
+import random
+import subprocess
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+DEFAULT_MIX = {"feat": 20, "fix": 40, "chore": 20, "docs": 5, "breaking": 2, "other": 13}
+
+_SUBJECTS = {
+    "feat": "feat({scope}): add {noun} support",
+    "fix": "fix({scope}): handle empty {noun}",
+    "chore": "chore: bump {noun} dependency",
+    "docs": "docs: describe {noun} options",
+    "breaking": "feat({scope})!: drop legacy {noun} API",
+    "other": "Update {noun} handling in {scope}",
+}
+_SCOPES = ["cli", "core", "parser", "api", "build", "ui"]
+_NOUNS = ["config", "cache", "token", "index", "stream", "report", "plugin"]
+
+
+@dataclass
+class RepoSpec:
+    commits: int = 1000
+    tags: int = 10
+    tail: int = 100  # Commits on top of the last tag (the range gitag analyses)
+    merge_every: int = 0  # 0 = linear history; otherwise merge a feature branch every N mainline commits
+    branch_length: int = 3
+    mix: dict[str, int] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    seed: int = 42
+
+    def key(self) -> str:
+        mix = "-".join(f"{k}{v}" for k, v in sorted(self.mix.items()))
+        return (
+            f"c{self.commits}-t{self.tags}-tail{self.tail}-m{self.merge_every}x{self.branch_length}-{mix}-s{self.seed}"
+        )
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def parse_mix(text: str) -> dict[str, int]:
+    mix = {}
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        if kind not in _SUBJECTS:
+            raise ValueError(f"Unknown message kind '{kind}' (expected one of {', '.join(_SUBJECTS)})")
+        mix[kind] = int(weight)
+    return mix
+
+
+def _message(rng: random.Random, kinds: list[str], weights: list[int]) -> str:
+    kind = rng.choices(kinds, weights)[0]
+    return _SUBJECTS[kind].format(scope=rng.choice(_SCOPES), noun=rng.choice(_NOUNS))
+
+
+def _commit_block(ref: str, mark: int, when: int, message: str, parents: list[int]) -> bytes:
+    data = message.encode()
+    lines = [
+        f"commit {ref}",
+        f"mark :{mark}",
+        f"committer Bench <bench@example.com> {when} +0000",
+        f"data {len(data)}",
+    ]
+    head = "\n".join(lines).encode() + b"\n" + data + b"\n"
+    if parents:
+        head += f"from :{parents[0]}\n".encode()
+        for parent in parents[1:]:
+            head += f"merge :{parent}\n".encode()
+    return head + b"\n"
+
+
+def generate(path: Path, spec: RepoSpec) -> Path:
+    """Create a repository at `path` following `spec`; returns the path."""
+    path.mkdir(parents=True, exist_ok=True)
+    subprocess.run(["git", "init", "-q", "-b", "main", str(path)], check=True)
+
+    rng = random.Random(spec.seed)
+    kinds, weights = list(spec.mix), list(spec.mix.values())
+    tag_span = max(spec.commits - spec.tail, 1)
+    tag_every = max(tag_span // spec.tags, 1) if spec.tags else 0
+
+    proc = subprocess.Popen(["git", "fast-import", "--quiet"], cwd=path, stdin=subprocess.PIPE)
+    mark, made, mainline, tags, when = 0, 0, 0, 0, 1_600_000_000
+    previous = None
+    while made < spec.commits:
+        if spec.merge_every and previous and mainline % spec.merge_every == 0:
+            # Feature branch forked from the current mainline tip, then merged back
+            branch_tip = previous
+            for _ in range(min(spec.branch_length, spec.commits - made - 1)):
+                mark += 1
+                when += 60
+                message = _message(rng, kinds, weights)
+                proc.stdin.write(_commit_block("refs/heads/feature", mark, when, message, [branch_tip]))
+                branch_tip, made = mark, made + 1
+            if branch_tip != previous:
+                mark += 1
+                when += 60
+                proc.stdin.write(
+                    _commit_block("refs/heads/main", mark, when, "Merge branch 'feature'", [previous, branch_tip])
+                )
+                previous, made, mainline = mark, made + 1, mainline + 1
+                continue
+
+        mark += 1
+        when += 60
+        parents = [previous] if previous else []
+        proc.stdin.write(_commit_block("refs/heads/main", mark, when, _message(rng, kinds, weights), parents))
+        previous, made, mainline = mark, made + 1, mainline + 1
+
+        if tag_every and tags < spec.tags and made <= tag_span and made >= (tags + 1) * tag_every:
+            tags += 1
+            proc.stdin.write(f"reset refs/tags/v0.{tags}.0\nfrom :{previous}\n\n".encode())
+
+    proc.stdin.write(b"done\n")
+    proc.stdin.close()
+    if proc.wait() != 0:
+        raise RuntimeError(f"git fast-import failed for {path}")
+    subprocess.run(["git", "update-ref", "-d", "refs/heads/feature"], cwd=path, check=False, capture_output=True)
+    subprocess.run(["git", "reset", "-q", "--hard"], cwd=path, check=True)
+    return path
+
+
+def cached_repo(root: Path, spec: RepoSpec) -> Path:
+    """Generate the repository for `spec` under `root`, reusing an earlier build with the same parameters."""
+    path = root / spec.key()
+    if not (path / ".git").is_dir():
+        generate(path, spec)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic git repository for benchmarks.")
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--commits", type=int, default=1000)
+    parser.add_argument("--tags", type=int, default=10)
+    parser.add_argument("--tail", type=int, default=100)
+    parser.add_argument("--merge-every", type=int, default=0)
+    parser.add_argument("--branch-length", type=int, default=3)
+    parser.add_argument("--mix", type=parse_mix, default=dict(DEFAULT_MIX))
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+    spec = RepoSpec(
+        commits=args.commits,
+        tags=args.tags,
+        tail=args.tail,
+        merge_every=args.merge_every,
+        branch_length=args.branch_length,
+        mix=args.mix,
+        seed=args.seed,
+    )
+    generate(args.path, spec)
+    print(f"Generated {spec.key()} at {args.path}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -1,8 +1,16 @@
 import logging
+import os
+import subprocess
+import sys
+from functools import cached_property
+from typing import Optional
 
-from gitag.changelog_writer import ChangelogWriter
-from gitag.config import MergeStrategy
+from gitag.config import BumpLevel, MergeStrategy
 from gitag.git_repo import GitRepo
+from gitag.result_cache import ResultCache
+from gitag.tag_index import SemverIndex, needs_counter
+from gitag.tag_transaction import is_push_rejection
+from gitag.utils.timings import phase
 from gitag.version_manager import VersionManager
 
 logger = logging.getLogger(__name__)
@@ -19,6 +27,15 @@ class GitAutoTagger:
         build=None,
         include_merges: bool = True,
         merge_strategy: MergeStrategy = MergeStrategy.AUTO,
+        repo_path: Optional[str] = None,
+        versioning: Optional[VersionManager] = None,
+        race_safe: bool = False,
+        max_attempts: int = 5,
+        cache_path: Optional[str] = None,
+        commit_graph: bool = False,
+        backend: Optional[str] = None,
+        compact: bool = False,
+        dedup_cherry_picks: bool = False,
     ):
         self.debug = debug
         self.push = push
@@ -27,48 +44,265 @@ class GitAutoTagger:
         self.build = build
         self.include_merges = include_merges
         self.merge_strategy = merge_strategy
+        self.repo_path = repo_path
+        self.dedup_cherry_picks = dedup_cherry_picks  # Leave patch-id duplicates out of the changelog
+        self.race_safe = race_safe  # Optimistic concurrency: lease-protected push, recompute on conflict
+        self.max_attempts = max_attempts
+        self.cache = ResultCache(cache_path) if cache_path else None  # Reuse results across pipeline steps
 
-        self.versioning = VersionManager(config_path)
+        # A preloaded VersionManager can be shared between taggers (e.g. `gitag batch`)
+        self.versioning = versioning or VersionManager(config_path)
         self.repo = GitRepo(
             debug=self.debug,
             include_merges=self.include_merges,
             merge_strategy=self.merge_strategy or self.versioning.merge_strategy or MergeStrategy.AUTO,
+            cwd=self.repo_path,
+            commit_graph=commit_graph,
+            backend=backend or self.versioning.backend,
+            compact=compact,
         )
-        self.changelog_writer = ChangelogWriter()
 
-    def run(self, dry_run: bool = False, since_tag: str = None):
-        tag_base = since_tag or self.repo.get_latest_tag()
+    # The async repo and changelog writer are only needed by some runs; building them lazily
+    # keeps asyncio and the changelog module off the import path of quick queries.
+    @cached_property
+    def async_repo(self):
+        from gitag.async_git_repo import AsyncGitRepo
+
+        return AsyncGitRepo(
+            debug=self.repo.debug,
+            include_merges=self.repo.include_merges,
+            merge_strategy=self.repo.merge_strategy,
+            cwd=self.repo_path,
+        )
+
+    @cached_property
+    def changelog_writer(self):
+        from gitag.changelog_writer import ChangelogWriter
+
+        changelog_path = os.path.join(self.repo_path, "CHANGELOG.md") if self.repo_path else "CHANGELOG.md"
+        return ChangelogWriter(path=changelog_path)
+
+    def run(self, dry_run: bool = False, since_tag: str = None) -> Optional[str]:
+        result = self._cached_result(since_tag)
+        if result is None:
+            result = self._compute_result(since_tag)
+            if self.cache:
+                self.cache.put(self._cache_key(since_tag), result)
+
+        tag_base, new_tag, commits = result["base_tag"], result["next_version"], result["commits"]
+        if not commits:
+            logger.warning("❌ No new commits found.")
+            return None
+
+        if self.race_safe and self.push and not dry_run:
+            # Resolve the final tag first; a lost race may change both version and commits
+            outcome = self._push_tag_race_safe(tag_base, new_tag, commits)
+            if outcome and self.write_changelog:
+                categorized = self._categorize(outcome[1], outcome[2])
+                self.changelog_writer.write(tag=outcome[0], categorized_commits=categorized)
+            return outcome[0] if outcome else None
+
+        if self.write_changelog:
+            with phase("changelog"):
+                categorized = result.get("categorized") or self._categorize(tag_base, commits)
+                self.changelog_writer.write(tag=new_tag, categorized_commits=categorized)
+
+        if dry_run:
+            logger.info("🚫 Dry run enabled – skipping tag creation.")
+            return new_tag
+
+        if self.repo.create_tag(new_tag, self.push):
+            logger.info(f"✅ Tag {new_tag} created" + (" and pushed." if self.push else "."))
+        else:
+            logger.info(f"ℹ️ Tag {new_tag} already exists.")
+        return new_tag
+
+    def _collect_commits(self, tag_base: Optional[str]) -> tuple[list[str], Optional[BumpLevel]]:
+        """Commits since `tag_base`, plus their bump level when the first-parent walk already classified them."""
+        if self.repo.merge_strategy == MergeStrategy.FIRST_PARENT:
+            from gitag.release_walk import ReleaseWalk, merge_memo
+
+            return ReleaseWalk(self.repo, self.versioning, merge_memo(self.repo)).run(tag_base)
+        return self.repo.get_commit_messages(since_tag=tag_base), None
+
+    def _categorize(self, tag_base: Optional[str], commits: list[str]) -> dict[str, list[str]]:
+        duplicates = self.repo.duplicate_subjects(tag_base) if self.dedup_cherry_picks else None
+        return self.versioning.categorize_commits(commits, duplicates)
+
+    def _write_changelog(self, tag: str, tag_base: Optional[str], commits: list[str]):
+        self.changelog_writer.write(tag=tag, categorized_commits=self._categorize(tag_base, commits))
+
+    def _compute_result(self, since_tag: Optional[str]) -> dict:
+        if since_tag:
+            tag_base = since_tag
+            commits, bump_level = self._collect_commits(tag_base)
+        elif self.repo.is_shallow():
+            # Resolving the base may deepen the clone, which must not race the tag fetch for `shallow.lock`
+            self.repo.finish_tag_fetch(self.repo.start_tag_fetch())
+            with phase("latest-tag"):
+                tag_base = self.repo.get_latest_tag(fetch=False) or None
+            commits, bump_level = self._collect_commits(tag_base)
+        else:
+            # Fetch tags in the background and work speculatively against the local tags meanwhile
+            fetch = self.repo.start_tag_fetch()
+            with phase("latest-tag"):
+                tag_base = self.repo.get_latest_tag(fetch=False) or None
+            commits, bump_level = self._collect_commits(tag_base)
+
+            if self.repo.finish_tag_fetch(fetch):
+                with phase("latest-tag"):
+                    fetched_base = self.repo.get_latest_tag(fetch=False) or None
+                if fetched_base != tag_base:
+                    logger.debug(f"Fetched tags moved the base from {tag_base} to {fetched_base}; recomputing.")
+                    tag_base = fetched_base
+                    commits, bump_level = self._collect_commits(tag_base)
+
         if not tag_base:
             logger.info("ℹ️ No previous tag found. Starting from 0.0.0 (virtual)")
-            tag_base = None
 
-        commits = self.repo.get_commit_messages(since_tag=tag_base)
+        result = {"base_tag": tag_base, "next_version": None, "bump": None, "commits": commits, "categorized": None}
         if not commits:
-            logger.warning("❌ No new commits found.")
-            return
+            return result
 
-        bump_level = self.versioning.determine_bump(commits)
-        new_tag = self.versioning.bump_version(
-            current_version=self.versioning.get_default_version() if not tag_base else tag_base,
-            level=bump_level,
+        if self.cache:
+            # Cached results carry the categorized commits; one classification pass yields both
+            with phase("classify"):
+                result["categorized"] = self._categorize(tag_base, commits)
+            # Dedup may leave every section empty; bump a patch then, as `determine_bump` does without levels
+            levels = (level for level in BumpLevel if result["categorized"].get(str(level)))
+            bump_level = next(levels, BumpLevel.PATCH)
+            result["bump"] = str(bump_level)
+        result["next_version"] = self._next_version(tag_base, commits, bump_level)
+        return result
+
+    def _cache_key(self, since_tag: Optional[str]) -> Optional[str]:
+        return self.cache.key(
+            self.repo_path,
+            self.versioning.config_path,
+            since_tag=since_tag,
             pre=self.pre,
             build=self.build,
+            include_merges=self.repo.include_merges,
+            merge_strategy=self.repo.merge_strategy,
+            dedup_cherry_picks=self.dedup_cherry_picks,
         )
 
-        self._log_version_summary(new_tag, bump_level)
+    def _cached_result(self, since_tag: Optional[str]) -> Optional[dict]:
+        if not self.cache:
+            return None
+        result = self.cache.get(self._cache_key(since_tag))
+        if result:
+            logger.info(f"♻️ Using cached result: {result['next_version'] or 'no new version'}")
+        return result
+
+    def _push_tag_race_safe(
+        self, tag_base: Optional[str], new_tag: str, commits: list[str]
+    ) -> Optional[tuple[str, Optional[str], list[str]]]:
+        """Create and push `new_tag`, re-resolving the base tag whenever another runner got there first.
+
+        Returns the pushed tag with the base tag and commits it was computed from."""
+        for attempt in range(1, self.max_attempts + 1):
+            remote_tags = self.repo.list_remote_tags()
+            local_tags = self.repo.list_local_tags()
+            changed = [tag for tag, sha in remote_tags.items() if local_tags.get(tag) != sha]
+
+            if changed:
+                self.repo.fetch_tag_refs(changed)
+                released = self.repo.tags_containing_head(changed)
+                if released:
+                    logger.info(f"ℹ️ HEAD is already released as {released[0]} – nothing to tag.")
+                    return None
+
+                new_base = self.repo.get_latest_tag(fetch=False) or None
+                if new_base != tag_base:
+                    logger.info(f"🔄 Remote base moved from {tag_base} to {new_base}; recomputing version.")
+                    tag_base = new_base
+                    commits, bump_level = self._collect_commits(tag_base)
+                    if not commits:
+                        logger.warning("❌ No new commits found.")
+                        return None
+                    new_tag = self._next_version(tag_base, commits, bump_level)
+
+            if new_tag in remote_tags or self.repo.tag_exists(new_tag):
+                logger.info(f"ℹ️ Tag {new_tag} already exists.")
+                return new_tag, tag_base, commits
 
+            transaction = self.repo.tag_transaction().add(new_tag)
+            transaction.commit()
+            try:
+                transaction.push(lease=True)
+                logger.info(f"✅ Tag {new_tag} created and pushed.")
+                return new_tag, tag_base, commits
+            except subprocess.CalledProcessError as e:
+                transaction.rollback()
+                if not is_push_rejection(e):
+                    logger.error(f"❌ Failed to push tag '{new_tag}': {(e.stderr or '').strip()}")
+                    sys.exit(1)
+                logger.warning(f"⚠️ Push of {new_tag} lost a race (attempt {attempt}/{self.max_attempts}).")
+
+        logger.error(f"❌ Could not push a tag after {self.max_attempts} attempts.")
+        sys.exit(1)
+
+    async def arun(self, dry_run: bool = False, since_tag: str = None) -> Optional[str]:
+        """Async variant of `run`: tag lookup and merge detection are issued concurrently.
+
+        Git failures propagate as `CalledProcessError` rather than exiting the caller's event loop."""
+        import asyncio
+
+        if since_tag:
+            tag_base, head_parents = since_tag, await self.async_repo.get_head_parents()
+        else:
+            tag_base, head_parents = await asyncio.gather(
+                self.async_repo.get_latest_tag(), self.async_repo.get_head_parents()
+            )
+        if not tag_base:
+            logger.info("ℹ️ No previous tag found. Starting from 0.0.0 (virtual)")
+            tag_base = None
+
+        commits = await self.async_repo.get_commit_messages(since_tag=tag_base, head_parents=head_parents)
+        if not commits:
+            logger.warning("❌ No new commits found.")
+            return None
+
+        # Both may run git synchronously (the tag index for `--pre`, patch ids for dedup): keep them off the loop
+        new_tag = await asyncio.to_thread(self._next_version, tag_base, commits)
+
+        pending = []
         if self.write_changelog:
-            categorized = self.versioning.categorize_commits(commits)
-            self.changelog_writer.write(tag=new_tag, categorized_commits=categorized)
+            pending.append(asyncio.to_thread(self._write_changelog, new_tag, tag_base, commits))
 
         if dry_run:
+            await asyncio.gather(*pending)
             logger.info("🚫 Dry run enabled – skipping tag creation.")
-            return
+            return new_tag
 
-        if self.repo.create_tag(new_tag, self.push):
+        created, *_ = await asyncio.gather(self.async_repo.create_tag(new_tag, self.push), *pending)
+        if created:
             logger.info(f"✅ Tag {new_tag} created" + (" and pushed." if self.push else "."))
         else:
             logger.info(f"ℹ️ Tag {new_tag} already exists.")
+        return new_tag
+
+    def _next_version(self, tag_base: Optional[str], commits: list[str], bump_level: Optional[BumpLevel] = None) -> str:
+        if bump_level is None:
+            with phase("classify"):
+                bump_level = self.versioning.determine_bump(commits)
+        new_tag = self.versioning.bump_version(
+            current_version=self.versioning.get_default_version() if not tag_base else tag_base,
+            level=bump_level,
+            pre=self.pre,
+            build=self.build,
+            pre_index=self._pre_index(),
+        )
+        self._log_version_summary(new_tag, bump_level)
+        return new_tag
+
+    def _pre_index(self) -> Optional[SemverIndex]:
+        """Existing pre-release tags, indexed only when `pre` is a bare label gitag has to number."""
+        if not needs_counter(self.pre):
+            return None
+        with phase("tag-index"):
+            return SemverIndex(self.versioning, self.repo.list_local_tags())
 
     def _log_version_summary(self, tag: str, level: str):
         parts = []
@@ -0,0 +1,59 @@
+"""Interchangeable implementations of the git operations gitag performs.
+
+`subprocess` (the default) runs the git CLI; `pygit2` and `dulwich` answer the same queries
+in-process when their packages are installed. `auto` picks the first one available.
+"""
+
+import importlib
+import logging
+from typing import Optional
+
+from gitag.backends.base import Commit, GitBackend, GitError
+from gitag.backends.subprocess_backend import SubprocessBackend
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = {  # Keyed by gitag.config.BACKEND_NAMES (the CLI and config checks use those without importing this)
+    "subprocess": ("gitag.backends.subprocess_backend", "SubprocessBackend"),
+    "pygit2": ("gitag.backends.pygit2_backend", "Pygit2Backend"),
+    "dulwich": ("gitag.backends.dulwich_backend", "DulwichBackend"),
+}
+AUTO_ORDER = ("pygit2", "dulwich", "subprocess")
+
+
+def _backend_class(name: str) -> type[GitBackend]:
+    module, cls = BACKENDS[name]
+    return getattr(importlib.import_module(module), cls)  # Raises ImportError if the package is missing
+
+
+def available_backends() -> list[str]:
+    """Installed backends, in the order "auto" tries them."""
+    available = []
+    for name in AUTO_ORDER:
+        try:
+            _backend_class(name)
+            available.append(name)
+        except ImportError:
+            continue
+    return available
+
+
+def get_backend(name: str = "subprocess", cwd: Optional[str] = None, env: Optional[dict] = None) -> GitBackend:
+    """Instantiate backend `name` ("auto" = first installed of pygit2, dulwich, subprocess)."""
+    if name == "auto":
+        for candidate in AUTO_ORDER:
+            try:
+                return _backend_class(candidate)(cwd=cwd, env=env)
+            except (ImportError, GitError) as e:
+                logger.debug(f"Backend {candidate} unavailable: {e}")
+        return SubprocessBackend(cwd=cwd, env=env)
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown git backend '{name}'. Choose from: auto, {', '.join(BACKENDS)}")
+    try:
+        cls = _backend_class(name)
+    except ImportError as e:
+        raise ValueError(f"Git backend '{name}' requires the {name} package (pip install gitag[{name}])") from e
+    return cls(cwd=cwd, env=env)
+
+
+__all__ = ["BACKENDS", "Commit", "GitBackend", "GitError", "SubprocessBackend", "available_backends", "get_backend"]
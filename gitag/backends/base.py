@@ -0,0 +1,212 @@
+import os
+import subprocess
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from gitag.commit_store import CommitStore
+from gitag.describe import closest_tagged, semver_key
+from gitag.utils.git_cmd import GitTimeout, decode, default_timeout, popen_git, run_git
+from gitag.utils.timings import record_command
+
+
+class GitError(subprocess.CalledProcessError):
+    """Failure of an in-process backend, shaped like a failed git command so callers handle all backends alike."""
+
+    def __init__(self, message: str, operation: str = "git"):
+        super().__init__(128, [operation], stderr=message)
+
+    def __str__(self) -> str:
+        return f"{self.cmd[0]}: {self.stderr}"
+
+
+@dataclass(frozen=True)
+class Commit:
+    sha: str
+    parents: tuple[str, ...]
+    subject: str
+    time: int = 0  # Committer timestamp (seconds since the epoch)
+
+
+def subject_of(message: str) -> str:
+    """First paragraph of a commit message on one line, like git's `%s`."""
+    return " ".join(message.strip().split("\n\n", 1)[0].split("\n")).strip() if message else ""
+
+
+def split_range(range_arg: str) -> tuple[list[str], list[str]]:
+    """`A..B` -> ([B], [A]); a single revision is included as-is."""
+    if ".." in range_arg:
+        exclude, include = range_arg.split("..", 1)
+        return [include or "HEAD"], [exclude] if exclude else []
+    return [range_arg], []
+
+
+class GitBackend(ABC):
+    """Read and tag operations gitag needs from a repository.
+
+    Implementations only have to provide `resolve`, `list_tags`, `walk` and `create_tag`; the other
+    operations are derived from them and may be overridden where the backend has a faster native path.
+    """
+
+    name = "base"
+
+    def __init__(self, cwd: Optional[str] = None, env: Optional[dict] = None):
+        self.cwd = cwd
+        self.env = env
+
+    @abstractmethod
+    def resolve(self, rev: str) -> str:
+        """Commit SHA for `rev` (ref name, tag or SHA); raises `GitError` if unknown."""
+
+    @abstractmethod
+    def list_tags(self) -> dict[str, str]:
+        """Map tag name -> commit SHA (annotated tags peeled)."""
+
+    @abstractmethod
+    def walk(self, include: list[str], exclude: list[str]) -> Iterator[Commit]:
+        """Commits reachable from `include` but not from `exclude`, newest first."""
+
+    @abstractmethod
+    def create_tag(self, tag: str, target: str = "HEAD"):
+        """Create a lightweight tag `tag` pointing at `target`."""
+
+    def push_tag(self, tag: str, remote: str = "origin"):
+        # Pushing goes through git for every backend so credential helpers and remote config apply
+        run_git(["git", "push", remote, tag], cwd=self.cwd, capture=False)
+
+    def walk_topo(self, include: list[str], exclude: list[str]) -> Iterator[Commit]:
+        """Like `walk`, but never yields a commit before all of its children in the range.
+
+        This default buffers the range; backends with a native topological walk stream it instead.
+        """
+        commits = {commit.sha: commit for commit in self.walk(include, exclude)}
+        children = Counter(parent for commit in commits.values() for parent in commit.parents if parent in commits)
+        ready = [sha for sha in commits if not children[sha]]
+        while ready:
+            commit = commits.pop(ready.pop())
+            yield commit
+            for parent in commit.parents:
+                if parent in commits:
+                    children[parent] -= 1
+                    if not children[parent]:
+                        ready.append(parent)
+
+    def first_parent(self, include: list[str], exclude: list[str]) -> Iterator[Commit]:
+        """Like `walk`, but only following first parents from the first of `include`."""
+        in_range = {commit.sha: commit for commit in self.walk(include, exclude)}
+        commit = in_range.get(self.resolve(include[0]))
+        while commit is not None:
+            yield commit
+            commit = in_range.get(commit.parents[0]) if commit.parents else None
+
+    def merge_base(self, revs: list[str]) -> Optional[str]:
+        """Best common ancestor of all `revs` (octopus merge base), or None if they share no history."""
+        try:
+            return run_git(["git", "merge-base", "--octopus", *revs], cwd=self.cwd, env=self.env).stdout.strip() or None
+        except subprocess.CalledProcessError:
+            return None
+
+    def merged_tags(self, rev: str) -> list[str]:
+        """Names of the tags whose commits are reachable from `rev`."""
+        cmd = ["git", "for-each-ref", "--merged", rev, "--format=%(refname:strip=2)", "refs/tags"]
+        return run_git(cmd, cwd=self.cwd, env=self.env).stdout.split()
+
+    def patch_id_groups(self, range_arg: str) -> dict[str, list[str]]:
+        """Commits of `range_arg` grouped by `git patch-id --stable` (same change = same id), newest first.
+
+        The whole range is diffed by one `git log -p` piped straight into one `git patch-id`, so the cost
+        is two processes however many commits there are. Merges and empty commits have no patch and no id.
+        """
+        log_cmd = ["git", "log", "-p", "--no-merges", "--no-color", "--no-ext-diff", "--no-textconv"]
+        log_cmd += ["--format=commit %H", range_arg, "--"]
+        patch_id_cmd = ["git", "patch-id", "--stable"]
+        timeout = default_timeout(log_cmd)
+        start = time.perf_counter()
+        read_end, write_end = os.pipe()
+        try:
+            log = popen_git(log_cmd, cwd=self.cwd, env=self.env, stdout=write_end, stderr=subprocess.PIPE)
+        except OSError:
+            os.close(read_end)
+            raise
+        finally:
+            os.close(write_end)
+        try:
+            patch_id = popen_git(
+                patch_id_cmd, cwd=self.cwd, env=self.env, stdin=read_end, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+            )
+        except OSError:
+            log.kill()
+            log.communicate()
+            raise
+        finally:
+            os.close(read_end)  # patch-id holds the only reader; git log stops on SIGPIPE if it exits early
+        try:
+            output, patch_id_err = patch_id.communicate(timeout=timeout)
+            _, log_err = log.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            for proc in (log, patch_id):
+                proc.kill()
+                proc.communicate()
+            raise GitTimeout(log_cmd, timeout) from None
+        finally:
+            record_command(log_cmd, start, log.returncode)
+            record_command(patch_id_cmd, start, patch_id.returncode)
+        for proc, cmd, stderr in ((log, log_cmd, log_err), (patch_id, patch_id_cmd, patch_id_err)):
+            if proc.returncode != 0:
+                raise subprocess.CalledProcessError(proc.returncode, cmd, stderr=decode(stderr))
+
+        groups: dict[str, list[str]] = {}
+        for line in decode(output).splitlines():
+            patch_id_hash, _, sha = line.partition(" ")
+            groups.setdefault(patch_id_hash, []).append(sha)
+        return groups
+
+    def parents(self, rev: str) -> list[str]:
+        for commit in self.walk([rev], []):
+            return list(commit.parents)
+        raise GitError(f"unknown revision {rev}", "parents")
+
+    def describe(self, rev: str) -> str:
+        """The tag `git describe --tags` picks for `rev`; raises `GitError` if none is reachable.
+
+        The tag with the fewest commits of `rev`'s history outside it wins, the newest commit on a tie
+        (describe's date-ordered walk meets it first), and the highest version among tags on one commit.
+        """
+        tagged: dict[str, list[str]] = {}
+        for name, sha in self.list_tags().items():
+            tagged.setdefault(sha, []).append(name)
+        times: dict[str, int] = {}
+
+        def commits() -> Iterator[tuple[str, tuple[str, ...]]]:
+            for commit in self.walk_topo([rev], []):
+                times[commit.sha] = commit.time
+                yield commit.sha, commit.parents
+
+        closest = closest_tagged(commits(), tagged) if tagged else []
+        if not closest:
+            raise GitError(f"no tag reachable from {rev}", "describe")
+        return max(tagged[max(closest, key=times.__getitem__)], key=semver_key)
+
+    def iter_log(self, range_arg: str, include_merges: bool) -> Iterator[str]:
+        """Commit subjects in `range_arg` (`A..B` or a revision), newest first."""
+        include, exclude = split_range(range_arg)
+        for commit in self.walk(include, exclude):
+            if include_merges or len(commit.parents) < 2:
+                yield commit.subject
+
+    def log(self, range_arg: str, include_merges: bool) -> list[str]:
+        return list(self.iter_log(range_arg, include_merges))
+
+    def iter_log_raw(self, range_arg: str, include_merges: bool) -> Iterator[memoryview]:
+        """Like `iter_log`, but each subject as UTF-8 bytes, for classification without decoding."""
+        for subject in self.iter_log(range_arg, include_merges):
+            yield memoryview(subject.encode())
+
+    def log_store(self, range_arg: str, include_merges: bool) -> CommitStore:
+        """Subjects of `range_arg` as a compact `CommitStore` instead of a list of str."""
+        return CommitStore.from_messages(self.iter_log(range_arg, include_merges))
+
+    def tag_exists(self, tag: str) -> bool:
+        return tag in self.list_tags()
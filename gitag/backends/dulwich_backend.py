@@ -0,0 +1,65 @@
+from typing import Iterator
+
+from dulwich.errors import NotGitRepository
+from dulwich.objects import Commit as DulwichCommit
+from dulwich.objects import Tag
+from dulwich.objectspec import parse_commit
+from dulwich.repo import Repo
+from dulwich.walk import ORDER_DATE, ORDER_TOPO
+
+from gitag.backends.base import Commit, GitBackend, GitError, subject_of
+
+
+class DulwichBackend(GitBackend):
+    """In-process backend in pure Python (`pip install gitag[dulwich]`)."""
+
+    name = "dulwich"
+
+    def __init__(self, cwd=None, env=None):
+        super().__init__(cwd, env)
+        try:
+            self.repo = Repo.discover(cwd or ".")
+        except NotGitRepository as e:
+            raise GitError(str(e), "open") from e
+
+    def _sha(self, rev: str) -> bytes:
+        try:
+            return parse_commit(self.repo, rev).id
+        except (KeyError, ValueError) as e:
+            raise GitError(f"unknown revision {rev}", "resolve") from e
+
+    def resolve(self, rev: str) -> str:
+        return self._sha(rev).decode()
+
+    def list_tags(self) -> dict[str, str]:
+        tags = {}
+        for ref, sha in self.repo.refs.as_dict(b"refs/tags").items():
+            obj = self.repo[sha]
+            while isinstance(obj, Tag):
+                obj = self.repo[obj.object[1]]
+            if isinstance(obj, DulwichCommit):
+                tags[ref.decode()] = obj.id.decode()
+        return tags
+
+    def walk(self, include: list[str], exclude: list[str], order: str = ORDER_DATE) -> Iterator[Commit]:
+        walker = self.repo.get_walker(
+            include=[self._sha(rev) for rev in include], exclude=[self._sha(rev) for rev in exclude], order=order
+        )
+        for entry in walker:
+            commit = entry.commit
+            yield Commit(
+                commit.id.decode(),
+                tuple(p.decode() for p in commit.parents),
+                subject_of(commit.message.decode("utf-8", "replace")),
+                commit.commit_time,
+            )
+
+    def walk_topo(self, include: list[str], exclude: list[str]) -> Iterator[Commit]:
+        return self.walk(include, exclude, order=ORDER_TOPO)
+
+    def create_tag(self, tag: str, target: str = "HEAD"):
+        if not self.repo.refs.add_if_new(f"refs/tags/{tag}".encode(), self._sha(target)):
+            raise GitError(f"tag '{tag}' already exists", "tag")
+
+    def parents(self, rev: str) -> list[str]:
+        return [p.decode() for p in self.repo[self._sha(rev)].parents]
@@ -0,0 +1,84 @@
+from typing import Iterator
+
+import pygit2
+
+from gitag.backends.base import Commit, GitBackend, GitError, subject_of
+
+
+class Pygit2Backend(GitBackend):
+    """In-process backend on libgit2 (`pip install gitag[pygit2]`)."""
+
+    name = "pygit2"
+
+    def __init__(self, cwd=None, env=None):
+        super().__init__(cwd, env)
+        try:
+            self.repo = pygit2.Repository(cwd or ".")
+        except pygit2.GitError as e:
+            raise GitError(str(e), "open") from e
+
+    def _commit(self, rev: str) -> "pygit2.Commit":
+        try:
+            return self.repo.revparse_single(rev).peel(pygit2.Commit)
+        except (KeyError, ValueError, pygit2.GitError) as e:
+            raise GitError(f"unknown revision {rev}", "resolve") from e
+
+    def resolve(self, rev: str) -> str:
+        return str(self._commit(rev).id)
+
+    def list_tags(self) -> dict[str, str]:
+        tags = {}
+        for ref in self.repo.references.iterator(pygit2.enums.ReferenceFilter.TAGS):
+            try:
+                tags[ref.shorthand] = str(ref.peel(pygit2.Commit).id)
+            except (ValueError, pygit2.GitError):
+                continue  # Tag pointing at a tree or blob
+        return tags
+
+    def walk(
+        self, include: list[str], exclude: list[str], first_parent: bool = False, topo_order: bool = False
+    ) -> Iterator[Commit]:
+        starts = [self._commit(rev).id for rev in include]
+        sort = pygit2.enums.SortMode.TIME
+        if topo_order:
+            sort |= pygit2.enums.SortMode.TOPOLOGICAL
+        walker = self.repo.walk(starts[0], sort)
+        for start in starts[1:]:
+            walker.push(start)
+        for rev in exclude:
+            walker.hide(self._commit(rev).id)
+        if first_parent:
+            walker.simplify_first_parent()
+        for commit in walker:
+            yield Commit(
+                str(commit.id),
+                tuple(str(p) for p in commit.parent_ids),
+                subject_of(commit.message),
+                commit.commit_time,
+            )
+
+    def walk_topo(self, include: list[str], exclude: list[str]) -> Iterator[Commit]:
+        return self.walk(include, exclude, topo_order=True)
+
+    def first_parent(self, include: list[str], exclude: list[str]) -> Iterator[Commit]:
+        return self.walk(include[:1], exclude, first_parent=True)
+
+    def create_tag(self, tag: str, target: str = "HEAD"):
+        try:
+            self.repo.references.create(f"refs/tags/{tag}", self._commit(target).id)
+        except (ValueError, pygit2.AlreadyExistsError) as e:
+            raise GitError(f"tag '{tag}' already exists", "tag") from e
+
+    def parents(self, rev: str) -> list[str]:
+        return [str(p) for p in self._commit(rev).parent_ids]
+
+    def describe(self, rev: str) -> str:
+        try:
+            return self.repo.describe(
+                self._commit(rev), describe_strategy=pygit2.enums.DescribeStrategy.TAGS, abbreviated_size=0
+            )
+        except (KeyError, pygit2.GitError) as e:
+            raise GitError(f"no tag reachable from {rev}", "describe") from e
+
+    def tag_exists(self, tag: str) -> bool:
+        return f"refs/tags/{tag}" in self.repo.references
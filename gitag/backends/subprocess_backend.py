@@ -0,0 +1,133 @@
+import subprocess
+import time
+from typing import Iterator
+
+from gitag.backends.base import Commit, GitBackend
+from gitag.commit_store import CommitStore
+from gitag.utils.git_cmd import decode, popen_git, run_git
+from gitag.utils.timings import record_command
+
+STREAM_CHUNK = 64 * 1024
+
+
+def log_command(range_arg: str, include_merges: bool, nul_terminated: bool = False) -> list[str]:
+    cmd = ["git", "log", "-z", "--pretty=%s"] if nul_terminated else ["git", "log", "--pretty=%s"]
+    if not include_merges:
+        cmd.append("--no-merges")
+    cmd.append(range_arg)
+    return cmd
+
+
+def nul_records(stream) -> Iterator[memoryview]:
+    """Split NUL-terminated output into views of the chunks read from `stream`.
+
+    Records are never copied or decoded, except one straddling two chunks, which is joined.
+    """
+    tail = b""
+    while chunk := stream.read1(STREAM_CHUNK):
+        view, pos = memoryview(chunk), 0
+        end = chunk.find(b"\0")
+        if tail and end >= 0:
+            yield memoryview(tail + chunk[:end])
+            tail, pos = b"", end + 1
+            end = chunk.find(b"\0", pos)
+        while end >= 0:
+            yield view[pos:end]
+            pos = end + 1
+            end = chunk.find(b"\0", pos)
+        tail += chunk[pos:]
+    if tail:
+        yield memoryview(tail)
+
+
+class SubprocessBackend(GitBackend):
+    """Default backend: every operation is one `git` invocation."""
+
+    name = "subprocess"
+
+    def _run(self, cmd: list[str]) -> str:
+        return run_git(cmd, cwd=self.cwd, env=self.env).stdout
+
+    def _stream(self, cmd: list[str], records: bool = False) -> Iterator:
+        """Yield output lines as git produces them (NUL-terminated records as bytes views with `records`);
+        closing the generator early stops git."""
+        start = time.perf_counter()
+        proc = popen_git(cmd, cwd=self.cwd, env=self.env, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        finished = False
+        try:
+            if records:
+                yield from nul_records(proc.stdout)
+            else:
+                for line in proc.stdout:
+                    yield decode(line).rstrip("\n")
+            finished = True
+        finally:
+            if not finished:
+                proc.kill()  # Consumer stopped early; the rest of the output is not needed
+            _, stderr = proc.communicate()
+            record_command(cmd, start, proc.returncode)
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd, stderr=decode(stderr))
+
+    def resolve(self, rev: str) -> str:
+        return self._run(["git", "rev-parse", "--verify", "--quiet", f"{rev}^{{commit}}"]).strip()
+
+    def list_tags(self) -> dict[str, str]:
+        output = self._run(
+            ["git", "for-each-ref", "refs/tags", "--format=%(refname:strip=2) %(objectname) %(*objectname)"]
+        )
+        tags = {}
+        for line in output.splitlines():
+            name, sha, *peeled = line.split(" ")
+            tags[name] = peeled[0] if peeled and peeled[0] else sha
+        return tags
+
+    def walk(
+        self, include: list[str], exclude: list[str], first_parent: bool = False, topo_order: bool = False
+    ) -> Iterator[Commit]:
+        cmd = ["git", "log", "--format=%H%x00%P%x00%ct%x00%s"]
+        if first_parent:
+            cmd.append("--first-parent")
+        if topo_order:
+            cmd.append("--topo-order")
+        cmd += [*include, *(f"^{rev}" for rev in exclude), "--"]
+        for line in self._stream(cmd):
+            sha, parents, time, subject = line.split("\0", 3)
+            yield Commit(sha, tuple(parents.split()), subject, int(time))
+
+    def walk_topo(self, include: list[str], exclude: list[str]) -> Iterator[Commit]:
+        return self.walk(include, exclude, topo_order=True)
+
+    def first_parent(self, include: list[str], exclude: list[str]) -> Iterator[Commit]:
+        return self.walk(include[:1], exclude, first_parent=True)
+
+    def create_tag(self, tag: str, target: str = "HEAD"):
+        cmd = ["git", "tag", tag] if target == "HEAD" else ["git", "tag", tag, target]
+        run_git(cmd, cwd=self.cwd, capture=False)
+
+    def parents(self, rev: str) -> list[str]:
+        return self._run(["git", "rev-list", "--parents", "-n", "1", rev]).strip().split()[1:]
+
+    def describe(self, rev: str) -> str:
+        return self._run(["git", "describe", "--tags", "--abbrev=0", rev]).strip()
+
+    def iter_log(self, range_arg: str, include_merges: bool) -> Iterator[str]:
+        return self._stream(log_command(range_arg, include_merges))
+
+    def log(self, range_arg: str, include_merges: bool) -> list[str]:
+        output = self._run(log_command(range_arg, include_merges))
+        return output.strip().split("\n") if output.strip() else []
+
+    def iter_log_raw(self, range_arg: str, include_merges: bool) -> Iterator[memoryview]:
+        return self._stream(log_command(range_arg, include_merges, nul_terminated=True), records=True)
+
+    def log_store(self, range_arg: str, include_merges: bool) -> CommitStore:
+        # NUL-terminated subjects; the store indexes git's output buffer as is
+        cmd = log_command(range_arg, include_merges, nul_terminated=True)
+        return CommitStore.from_output(run_git(cmd, cwd=self.cwd, env=self.env, text=False).stdout)
+
+    def tag_exists(self, tag: str) -> bool:
+        try:
+            return tag in self._run(["git", "tag"]).strip().split("\n")
+        except subprocess.CalledProcessError:
+            return False
@@ -0,0 +1,86 @@
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+from gitag.auto_tagger import GitAutoTagger
+from gitag.version_manager import VersionManager
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchResult:
+    repo: str
+    exit_code: int
+    duration: float
+    tag: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.exit_code == 0
+
+
+def read_repo_list(path: str) -> list[str]:
+    """Read one repository path per line, ignoring blank lines and `#` comments."""
+    repos = []
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                repos.append(line)
+    return repos
+
+
+def _tag_repo(repo: str, versioning: VersionManager, dry_run: bool, tagger_kwargs: dict) -> BatchResult:
+    start = time.perf_counter()
+    try:
+        if not Path(repo).is_dir():
+            raise FileNotFoundError(f"Repository path not found: {repo}")
+        tagger = GitAutoTagger(repo_path=repo, versioning=versioning, **tagger_kwargs)
+        tag = tagger.run(dry_run=dry_run)
+        return BatchResult(repo=repo, exit_code=0, duration=time.perf_counter() - start, tag=tag)
+    except SystemExit as e:
+        # GitRepo exits on fatal git errors; keep the other workers alive
+        code = e.code if isinstance(e.code, int) else 1
+        return BatchResult(repo=repo, exit_code=code, duration=time.perf_counter() - start, error="git command failed")
+    except Exception as e:
+        return BatchResult(repo=repo, exit_code=1, duration=time.perf_counter() - start, error=str(e))
+
+
+def run_batch(
+    repos: list[str],
+    jobs: int = 4,
+    config_path: Optional[str] = None,
+    dry_run: bool = False,
+    **tagger_kwargs,
+) -> list[BatchResult]:
+    """Run the tagging flow for every repository on a thread pool and return results in input order."""
+    versioning = VersionManager(config_path)
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        futures = [pool.submit(_tag_repo, repo, versioning, dry_run, tagger_kwargs) for repo in repos]
+        return [future.result() for future in futures]
+
+
+def format_report(results: list[BatchResult]) -> str:
+    width = max([len(r.repo) for r in results] + [len("Repository")])
+    lines = [f"{'Repository':<{width}}  Exit  Time (s)  Result", "-" * (width + 30)]
+    for r in results:
+        outcome = r.error if r.error else (r.tag or "no new commits")
+        lines.append(f"{r.repo:<{width}}  {r.exit_code:>4}  {r.duration:>8.2f}  {outcome}")
+
+    failed = sum(1 for r in results if not r.ok)
+    total = sum(r.duration for r in results)
+    lines.append("-" * (width + 30))
+    lines.append(f"{len(results)} repositories, {failed} failed, {total:.2f}s cumulative")
+    return "\n".join(lines)
+
+
+def write_report(results: list[BatchResult], path: str):
+    with open(path, "w") as f:
+        json.dump([asdict(r) for r in results], f, indent=2)
+        f.write("\n")
@@ -0,0 +1,96 @@
+import logging
+from collections import Counter
+from typing import Optional
+
+from gitag.backends import GitBackend
+from gitag.config import BumpLevel
+from gitag.tag_index import SemverIndex, needs_counter
+from gitag.utils.timings import phase
+from gitag.version_manager import VersionManager
+
+logger = logging.getLogger(__name__)
+
+
+def _latest_tag(backend: GitBackend, versioning: VersionManager, ref: str) -> Optional[str]:
+    """Highest version among the tags merged into `ref`, not the nearest tag: a release branch merged
+    back into main brings older versions closer to main's tip than main's own latest release."""
+    keyed = [(key, tag) for tag in backend.merged_tags(ref) if (key := versioning.version_key(tag))]
+    return max(keyed)[1] if keyed else None
+
+
+def next_versions(
+    backend: GitBackend,
+    versioning: VersionManager,
+    refs: list[str],
+    include_merges: bool = True,
+    pre: Optional[str] = None,
+    build: Optional[str] = None,
+) -> list[dict]:
+    """Next version of each of `refs` (e.g. main and release/x.y branches) from one shared history walk.
+
+    Each ref's range is `<highest version tag merged into it>..<ref>`. The union of the ranges is read in one walk,
+    bounded by the merge base of all base tags, so history the ranges share is read and classified once.
+    Which ranges a commit belongs to is worked out in-process: bitmasks of the refs reaching it and of
+    the base tags reaching it are pushed from children to parents in topological order.
+    """
+    tips = [backend.resolve(ref) for ref in refs]
+    bases = [_latest_tag(backend, versioning, ref) for ref in refs]
+    base_shas = [backend.resolve(tag) if tag else None for tag in bases]
+    boundary = backend.merge_base(base_shas) if all(base_shas) else None
+    logger.debug(f"Base tags: {dict(zip(refs, bases))}; shared walk stops at {boundary or 'the root'}.")
+
+    with phase("walk"):
+        graph = {c.sha: c for c in backend.walk(tips, [boundary] if boundary else [])}
+
+    reach: dict[str, int] = {}
+    covered: dict[str, int] = {}
+    for bit, (tip, base) in enumerate(zip(tips, base_shas)):
+        reach[tip] = reach.get(tip, 0) | 1 << bit
+        if base in graph:
+            covered[base] = covered.get(base, 0) | 1 << bit
+
+    children = Counter(parent for commit in graph.values() for parent in commit.parents if parent in graph)
+    ready = [sha for sha in graph if not children[sha]]
+    in_range: list[tuple[str, int]] = []  # (subject, mask of the refs whose range contains the commit)
+    while ready:
+        sha = ready.pop()
+        commit = graph[sha]
+        mask = reach.get(sha, 0) & ~covered.get(sha, 0)
+        if mask and (include_merges or len(commit.parents) < 2):
+            in_range.append((commit.subject, mask))
+        for parent in commit.parents:
+            if parent in graph:
+                reach[parent] = reach.get(parent, 0) | reach.get(sha, 0)
+                covered[parent] = covered.get(parent, 0) | covered.get(sha, 0)
+                children[parent] -= 1
+                if not children[parent]:
+                    ready.append(parent)
+
+    levels = [Counter() for _ in refs]
+    with phase("classify"):
+        classified = versioning.classify(subject for subject, _ in in_range)
+        for (_, level), (_, mask) in zip(classified, in_range):
+            for bit in range(len(refs)):
+                if mask >> bit & 1:
+                    levels[bit][level] += 1
+    logger.debug(f"Walked {len(graph)} commits, classified {len(in_range)} for {len(refs)} refs.")
+
+    pre_index = SemverIndex(versioning, backend.list_tags()) if needs_counter(pre) else None
+    results = []
+    for ref, base, counts in zip(refs, bases, levels):
+        bump: Optional[BumpLevel] = min(counts, default=None)
+        next_version = None
+        if bump is not None:
+            next_version = versioning.bump_version(
+                base or versioning.get_default_version(), bump, pre=pre, build=build, pre_index=pre_index
+            )
+        results.append(
+            {
+                "ref": ref,
+                "next_version": next_version,
+                "base_tag": base,
+                "bump": str(bump) if bump is not None else None,
+                "commits": sum(counts.values()),
+            }
+        )
+    return results
@@ -15,7 +15,8 @@ class ChangelogWriter:
         self.include_date = include_date
         self.mode = mode  # 'append' or 'overwrite'
 
-    def _generate_entry(self, tag: str, categorized_commits: dict[str, list[str]]) -> str:
+    def generate_entry(self, tag: str, categorized_commits: dict[str, list[str]]) -> str:
+        """Markdown section for `tag`, as `write` adds it to the changelog."""
         lines = []
 
         # Entry header
@@ -60,7 +61,7 @@ class ChangelogWriter:
         return "\n".join(toc)
 
     def write(self, tag: str, categorized_commits: dict[str, list[str]]):
-        new_entry = self._generate_entry(tag, categorized_commits)
+        new_entry = self.generate_entry(tag, categorized_commits)
 
         entries = [(tag, categorized_commits)]
         existing_body = ""
@@ -0,0 +1,41 @@
+import logging
+from typing import Optional
+
+from gitag.utils.git_cmd import run_git
+from gitag.utils.timings import phase
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FILTER = "tree:0"  # Commits and tags only; trees and blobs are fetched on demand
+
+
+def clone_for_tagging(
+    url: str,
+    directory: str,
+    filter_spec: str = DEFAULT_FILTER,
+    branch: Optional[str] = None,
+    depth: Optional[int] = None,
+    checkout: tuple[str, ...] = ("pyproject.toml",),
+):
+    """Clone `url` with just enough data for tagging: all commits and tags, no file content.
+
+    Only the files in `checkout` (e.g. pyproject.toml, CHANGELOG.md) are written to the work tree,
+    through a non-cone sparse checkout, so just their blobs (and the trees leading to them) are fetched.
+    """
+    cmd = ["git", "clone", f"--filter={filter_spec}", "--no-checkout"]
+    if branch:
+        cmd += ["--branch", branch]
+    if depth:
+        cmd += ["--depth", str(depth)]
+    cmd += [url, directory]
+
+    with phase("clone"):
+        run_git(cmd, capture=False)
+    logger.info(f"📦 Cloned {url} into {directory} (filter {filter_spec}, no checkout).")
+
+    if checkout:
+        paths = [f"/{path.lstrip('/')}" for path in checkout]
+        with phase("checkout"):
+            run_git(["git", "sparse-checkout", "set", "--no-cone", *paths], cwd=directory, capture=False)
+            run_git(["git", "checkout", "-q"], cwd=directory, capture=False)
+        logger.info(f"📄 Checked out {', '.join(checkout)}.")
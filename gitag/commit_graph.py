@@ -0,0 +1,188 @@
+import heapq
+import mmap
+import struct
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from gitag.refs import common_dir
+
+SIGNATURE = b"CGPH"
+PARENT_NONE = 0x70000000
+EXTRA_EDGES = 0x80000000
+EDGE_MASK = 0x7FFFFFFF
+HASH_LENGTHS = {1: 20, 2: 32}  # SHA-1, SHA-256
+
+
+class _Layer:
+    """One commit-graph file: memory-mapped, with offsets of the chunks gitag reads."""
+
+    def __init__(self, path: Path, start: int):
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        signature, version, hash_version, num_chunks = struct.unpack_from(">4sBBB", self.data, 0)
+        if signature != SIGNATURE or version != 1 or hash_version not in HASH_LENGTHS:
+            raise ValueError(f"Unsupported commit-graph file: {path}")
+        self.hash_len = HASH_LENGTHS[hash_version]
+
+        chunks = {}
+        for i in range(num_chunks):
+            chunk_id, offset = struct.unpack_from(">4sQ", self.data, 8 + 12 * i)
+            chunks[chunk_id] = offset
+        for required in (b"OIDF", b"OIDL", b"CDAT"):
+            if required not in chunks:
+                raise ValueError(f"commit-graph {path} lacks the {required.decode()} chunk")
+        self.fanout = chunks[b"OIDF"]
+        self.oids = chunks[b"OIDL"]
+        self.cdat = chunks[b"CDAT"]
+        self.edges = chunks.get(b"EDGE")
+        self.count = struct.unpack_from(">I", self.data, self.fanout + 4 * 255)[0]
+        self.start = start  # Global position of this layer's first commit (base layers come first)
+
+    def find(self, oid: bytes) -> Optional[int]:
+        first = oid[0]
+        lo = struct.unpack_from(">I", self.data, self.fanout + 4 * (first - 1))[0] if first else 0
+        hi = struct.unpack_from(">I", self.data, self.fanout + 4 * first)[0]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            at = self.oids + mid * self.hash_len
+            current = self.data[at : at + self.hash_len]
+            if current == oid:
+                return self.start + mid
+            if current < oid:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def close(self):
+        self.data.close()
+
+
+class CommitGraph:
+    """In-process reader for git's commit-graph (single file or split chain).
+
+    Gives parents, generation numbers (topological levels) and commit times by position, so
+    ancestry questions are answered without spawning git. Generation numbers prune walks: a commit
+    with a lower generation than a target can never reach it.
+    """
+
+    def __init__(self, layers: list[_Layer]):
+        self.layers = layers
+
+    @classmethod
+    def load(cls, git_dir: Path) -> Optional["CommitGraph"]:
+        """Open the repository's commit-graph; None if there is none (or it cannot be read)."""
+        info = common_dir(git_dir) / "objects" / "info"
+        single = info / "commit-graph"
+        chain = info / "commit-graphs" / "commit-graph-chain"
+        try:
+            if single.is_file():
+                return cls([_Layer(single, 0)])
+            if chain.is_file():
+                layers, start = [], 0
+                for name in chain.read_text().split():
+                    layer = _Layer(info / "commit-graphs" / f"graph-{name}.graph", start)
+                    layers.append(layer)
+                    start += layer.count
+                return cls(layers)
+        except (OSError, ValueError, struct.error):
+            return None
+        return None
+
+    def __len__(self) -> int:
+        return sum(layer.count for layer in self.layers)
+
+    def close(self):
+        for layer in self.layers:
+            layer.close()
+
+    def _layer(self, pos: int) -> _Layer:
+        for layer in reversed(self.layers):
+            if pos >= layer.start:
+                return layer
+        raise IndexError(pos)
+
+    def position(self, sha: str) -> Optional[int]:
+        try:
+            oid = bytes.fromhex(sha)
+        except ValueError:
+            return None
+        for layer in reversed(self.layers):
+            if len(oid) == layer.hash_len:
+                pos = layer.find(oid)
+                if pos is not None:
+                    return pos
+        return None
+
+    def sha(self, pos: int) -> str:
+        layer = self._layer(pos)
+        at = layer.oids + (pos - layer.start) * layer.hash_len
+        return layer.data[at : at + layer.hash_len].hex()
+
+    def _commit_data(self, pos: int) -> tuple[_Layer, int]:
+        layer = self._layer(pos)
+        return layer, layer.cdat + (pos - layer.start) * (layer.hash_len + 16) + layer.hash_len
+
+    def parents(self, pos: int) -> list[int]:
+        layer, at = self._commit_data(pos)
+        first, second = struct.unpack_from(">II", layer.data, at)
+        parents = [] if first == PARENT_NONE else [first]
+        if second == PARENT_NONE:
+            return parents
+        if not second & EXTRA_EDGES:
+            return parents + [second]
+        # Octopus merge: the remaining parents live in the EDGE chunk, the last one flagged
+        edge = layer.edges + 4 * (second & EDGE_MASK)
+        while True:
+            value = struct.unpack_from(">I", layer.data, edge)[0]
+            parents.append(value & EDGE_MASK)
+            if value & EXTRA_EDGES:
+                return parents
+            edge += 4
+
+    def generation(self, pos: int) -> int:
+        layer, at = self._commit_data(pos)
+        return struct.unpack_from(">I", layer.data, at + 8)[0] >> 2
+
+    def commit_time(self, pos: int) -> int:
+        layer, at = self._commit_data(pos)
+        high, low = struct.unpack_from(">II", layer.data, at + 8)
+        return ((high & 0x3) << 32) | low
+
+    def walk_topo(self, start: int) -> Iterator[tuple[int, list[int]]]:
+        """(position, parents) of `start` and its ancestors, highest generation first, so children before parents.
+
+        Needs generation numbers: a graph written without them (all zero) has no such order.
+        """
+        queue, seen = [(-self.generation(start), start)], {start}
+        while queue:
+            _, pos = heapq.heappop(queue)
+            parents = self.parents(pos)
+            yield pos, parents
+            for parent in parents:
+                if parent not in seen:
+                    seen.add(parent)
+                    heapq.heappush(queue, (-self.generation(parent), parent))
+
+    def nearest(self, start: int, targets: Iterable[int]) -> Optional[int]:
+        """First of `targets` met when walking back from `start` newest-commit-first."""
+        targets = set(targets)
+        if not targets:
+            return None
+        generations = [self.generation(t) for t in targets]
+        floor = 0 if 0 in generations else min(generations)  # Generation 0 means "not computed"
+
+        queue, seen = [(-self.commit_time(start), start)], {start}
+        while queue:
+            _, pos = heapq.heappop(queue)
+            if pos in targets:
+                return pos
+            for parent in self.parents(pos):
+                generation = self.generation(parent)
+                if parent not in seen and (generation >= floor or generation == 0):
+                    seen.add(parent)
+                    heapq.heappush(queue, (-self.commit_time(parent), parent))
+        return None
+
+    def is_ancestor(self, ancestor: int, descendant: int) -> bool:
+        return self.nearest(descendant, [ancestor]) is not None
@@ -0,0 +1,109 @@
+from array import array
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Union
+
+from gitag.config import DEFAULT_LEVELS, BumpLevel
+
+if TYPE_CHECKING:
+    from gitag.version_manager import VersionManager
+
+SEPARATOR = b"\0"  # `git log -z` ends every commit with NUL, which cannot occur in a subject
+UNCLASSIFIED = -1
+
+
+class CommitStore(Sequence):
+    """Commit subjects of a range held column-wise: one bytes buffer, an offsets array and a levels array.
+
+    The buffer is the raw `git log -z` output itself, so memory stays close to the log size:
+    8 bytes of offset and 1 byte of bump level per commit instead of a str object each.
+    Subjects are decoded only when read, e.g. when the changelog writer iterates a section.
+    """
+
+    def __init__(self, data: Union[bytes, bytearray] = b"", offsets: Optional[array] = None):
+        self.data = data
+        self.offsets = offsets if offsets is not None else array("Q", [0])  # Start of each subject, plus the end
+        self.levels = array("b", [UNCLASSIFIED]) * (len(self.offsets) - 1)
+
+    @classmethod
+    def from_output(cls, output: bytes) -> "CommitStore":
+        """Index NUL-terminated `git log -z` output without copying it."""
+        offsets = array("Q", [0])
+        end = output.find(SEPARATOR)
+        while end >= 0:
+            offsets.append(end + 1)
+            end = output.find(SEPARATOR, end + 1)
+        if offsets[-1] < len(output):
+            offsets.append(len(output) + 1)  # Last subject without a terminator
+        return cls(output, offsets)
+
+    @classmethod
+    def from_messages(cls, messages: Iterable[str]) -> "CommitStore":
+        data, offsets = bytearray(), array("Q", [0])
+        for message in messages:
+            data += message.encode() + SEPARATOR
+            offsets.append(len(data))
+        return cls(data, offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def raw(self, i: int) -> memoryview:
+        """Subject `i` as a view into the buffer (no copy)."""
+        return memoryview(self.data)[self.offsets[i] : self.offsets[i + 1] - 1]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("commit index out of range")
+        return str(self.raw(i), "utf-8", "replace")
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self)):
+            yield str(self.raw(i), "utf-8", "replace")
+
+    def __repr__(self) -> str:
+        return f"CommitStore({len(self)} commits, {len(self.data)} bytes)"
+
+    @property
+    def classified(self) -> bool:
+        return UNCLASSIFIED not in self.levels
+
+    def classify(self, versioning: "VersionManager") -> Optional[BumpLevel]:
+        """Fill the levels column (once) and return the highest bump level, or None for an empty store."""
+        if not self.classified:
+            raw = (self.raw(i) for i in range(len(self)))  # Classified as bytes; decoded only for the changelog
+            for i, (_, level) in enumerate(versioning.classify(raw)):
+                self.levels[i] = level
+        return BumpLevel(min(self.levels)) if self.levels else None
+
+    def section(self, level: BumpLevel) -> "CommitSection":
+        return CommitSection(self, level)
+
+    def categorized(self) -> dict[str, "CommitSection"]:
+        """Changelog sections by level name, in the shape `categorize_commits` returns."""
+        return {str(level): self.section(level) for level in DEFAULT_LEVELS}
+
+
+class CommitSection:
+    """Lazy view of the subjects of one bump level; decodes each subject as it is iterated."""
+
+    def __init__(self, store: CommitStore, level: BumpLevel):
+        self.store = store
+        self.level = level
+
+    def __len__(self) -> int:
+        return self.store.levels.count(self.level)
+
+    def __bool__(self) -> bool:
+        return self.level in self.store.levels
+
+    def __iter__(self) -> Iterator[str]:
+        for i, level in enumerate(self.store.levels):
+            if level == self.level:
+                yield str(self.store.raw(i), "utf-8", "replace")
+
+    def __repr__(self) -> str:
+        return f"CommitSection({self.level}, {len(self)} commits)"
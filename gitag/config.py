@@ -19,6 +19,12 @@ class MergeStrategy(str, Enum):
     AUTO = "auto"  # Detect if HEAD is merge, then show only commits of feature branch
     ALWAYS = "always"  # Always use <last_tag>..HEAD (alle Commits)
     MERGE_ONLY = "merge_only"  # Nur Feature-Branch aus aktuellem Merge
+    FIRST_PARENT = "first_parent"  # Every merge on the first-parent path since the last tag, each classified once
+
+
+# --- Git Backends ---
+
+BACKEND_NAMES = ("subprocess", "pygit2", "dulwich")  # Implementations in gitag.backends; "auto" picks one
 
 
 # --- Levels as List ---
@@ -1,6 +1,113 @@
-from typing import Any
+import re
+from typing import Any, Optional
 
-from gitag.config import BumpLevel
+from gitag.config import BACKEND_NAMES, BumpLevel
+
+# The regex parser is private to `re` (`sre_parse` before 3.11, `re._parser` since). All use of it stays
+# behind `_parse`; if it is ever unavailable, patterns are still compiled but no longer vetted.
+try:
+    from re import _constants as sre_constants
+    from re import _parser as sre_parse
+except ImportError:  # pragma: no cover - depends on the Python version
+    try:
+        import sre_constants
+        import sre_parse
+    except ImportError:
+        sre_constants = sre_parse = None
+
+if sre_constants is not None:
+    UNBOUNDED = sre_constants.MAXREPEAT
+    REPEATS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT)
+ANY_CHAR = None  # First-character set of a pattern that may start with any character
+
+
+def _first_chars(items) -> tuple[Optional[set], bool]:
+    """Characters a match of `items` can start with (`ANY_CHAR` when unknown) and whether it can be empty."""
+    first: set = set()
+    for op, av in items:
+        if op == sre_constants.AT:
+            continue  # Anchors consume nothing
+        if op == sre_constants.LITERAL:
+            return first | {av}, False
+        if op == sre_constants.IN and all(kind == sre_constants.LITERAL for kind, _ in av):
+            return first | {char for _, char in av}, False
+        if op == sre_constants.SUBPATTERN or op in REPEATS:
+            body = av[3] if op == sre_constants.SUBPATTERN else av[2]
+            inner, empty = _first_chars(body)
+            if inner is ANY_CHAR:
+                return ANY_CHAR, False
+            first |= inner
+            if not empty and (op == sre_constants.SUBPATTERN or av[0] > 0):
+                return first, False
+            continue  # Can match nothing: what follows can start the match too
+        return ANY_CHAR, False
+    return first, True
+
+
+def _overlapping_branches(branches) -> bool:
+    """True if alternatives can start alike, e.g. `a|aa` (one a prefix of the other), `a|a?` or `a|.`."""
+    seen: set = set()
+    for branch in branches:
+        first, empty = _first_chars(branch)
+        if empty or first is ANY_CHAR or seen & first:
+            return True  # The parser factors shared prefixes out, so `a|aa` arrives as `a(?:|a)`
+        seen |= first
+    return False
+
+
+def _nested_repeat(items, inside_unbounded: bool = False) -> bool:
+    """True if an unbounded repeat occurs inside another one, e.g. `(a+)+` or `(.*)*`, or repeats
+    alternatives that overlap, e.g. `(a|aa)*`."""
+    for op, av in items:
+        if op in REPEATS:
+            unbounded = av[1] == UNBOUNDED
+            if unbounded and inside_unbounded:
+                return True
+            if _nested_repeat(av[2], inside_unbounded or unbounded):
+                return True
+        elif op == sre_constants.SUBPATTERN:
+            if _nested_repeat(av[3], inside_unbounded):
+                return True
+        elif op == sre_constants.BRANCH:
+            if inside_unbounded and _overlapping_branches(av[1]):
+                return True
+            if any(_nested_repeat(branch, inside_unbounded) for branch in av[1]):
+                return True
+        elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            if _nested_repeat(av[1], inside_unbounded):
+                return True
+        elif op == sre_constants.ATOMIC_GROUP:
+            if _nested_repeat(av, False):  # Nothing outside backtracks into an atomic group
+                return True
+        elif op == sre_constants.POSSESSIVE_REPEAT:
+            if _nested_repeat(av[2], False):
+                return True
+    return False
+
+
+def _parse(pattern: str):
+    if sre_parse is None:
+        return None
+    try:
+        return sre_parse.parse(pattern)
+    except re.error:
+        return None
+
+
+def backtracking_risk(pattern: str) -> Optional[str]:
+    """Why `pattern` can backtrack exponentially, or None (also for invalid regexes)."""
+    parsed = _parse(pattern)
+    if parsed is not None and _nested_repeat(parsed):
+        return (
+            "nested unbounded quantifiers or repeated overlapping alternatives can backtrack exponentially; "
+            "use (?>...) or a possessive quantifier"
+        )
+    return None
+
+
+def _unbounded_wildcards(pattern: str) -> int:
+    parsed = _parse(pattern) or []
+    return sum(1 for op, av in parsed if op in REPEATS and av[1] == UNBOUNDED and av[2][0][0] == sre_constants.ANY)
 
 
 def validate_config(config: dict[str, Any]) -> list[str]:
@@ -15,6 +122,18 @@ def validate_config(config: dict[str, Any]) -> list[str]:
     if "version_pattern" in config and not isinstance(config["version_pattern"], str):
         errors.append("version_pattern must be a string")
 
+    if "backend" in config and config["backend"] not in ("auto", *BACKEND_NAMES):
+        errors.append(f"backend must be one of: auto, {', '.join(BACKEND_NAMES)}")
+
+    for key in ("max_subject_length", "max_body_length"):
+        value = config.get(key)
+        if key in config and (not isinstance(value, int) or isinstance(value, bool) or value < 1):
+            errors.append(f"{key} must be a positive integer")
+
+    budget = config.get("classification_budget")
+    if "classification_budget" in config and (not isinstance(budget, (int, float)) or budget < 0):
+        errors.append("classification_budget must be a non-negative number of seconds (0 = unlimited)")
+
     if "patterns" in config:
         patterns = config["patterns"]
         if not isinstance(patterns, dict):
@@ -25,5 +144,22 @@ def validate_config(config: dict[str, Any]) -> list[str]:
                     errors.append(f"Invalid bump level: '{key}'")
                 if not isinstance(val, list) or not all(isinstance(v, str) for v in val):
                     errors.append(f"Values for patterns['{key}'] must be a list of strings")
+                    continue
+                for pattern in val:
+                    try:
+                        re.compile(pattern)
+                    except re.error as e:
+                        errors.append(
+                            f"patterns['{key}'] '{pattern}' is not a valid regex ({e}); matched as plain text"
+                        )
+                        continue
+                    risk = backtracking_risk(pattern)
+                    if risk:
+                        errors.append(f"patterns['{key}'] '{pattern}' ignored: {risk}")
+                    elif _unbounded_wildcards(pattern) > 1:
+                        errors.append(
+                            f"patterns['{key}'] '{pattern}' has several unbounded wildcards; "
+                            "its cost grows polynomially with message length"
+                        )
 
     return errors
@@ -0,0 +1,57 @@
+import re
+from typing import Container, Hashable, Iterable, Sequence
+
+SEMVER = re.compile(r"(\d+)\.(\d+)\.(\d+)(?:-([0-9A-Za-z.-]+))?")
+
+
+def semver_key(tag: str) -> tuple:
+    """Sort key ordering tags by the SemVer version in their name (v1.10.0 after v1.9.0, 1.0.0 after 1.0.0-rc.1).
+
+    Names without a version sort before all versions, by name.
+    """
+    match = SEMVER.search(tag)
+    if not match:
+        return (0, tag)
+    major, minor, patch, pre = match.groups()
+    identifiers = tuple((0, int(i), "") if i.isdigit() else (1, 0, i) for i in pre.split(".")) if pre else ()
+    return (1, int(major), int(minor), int(patch), pre is None, identifiers, tag)
+
+
+def closest_tagged(commits: Iterable[tuple[Hashable, Sequence[Hashable]]], tagged: Container[Hashable]) -> list:
+    """Tagged commits `git describe` chooses between: those with the fewest commits not contained in them.
+
+    `commits` are (commit, parents) pairs from the described commit back, never a commit before its
+    children. Only tags not behind another tag can win (a tag's ancestors have strictly more commits
+    outside them), so only those are candidates; the walk stops once every pending commit is contained
+    in all of them, as older history cannot change their order. Ties are returned in walk order.
+    """
+    masks: dict = {}  # Pending commit -> bits of the candidates containing it
+    candidates: list = []
+    contained: list[int] = []
+    full = partial = total = 0  # `partial`: pending commits missing a candidate's bit
+    for node, parents in commits:
+        mask = 0
+        if node in masks:
+            mask = masks.pop(node)
+            partial -= mask != full
+        if not mask and node in tagged:
+            mask = 1 << len(candidates)
+            candidates.append(node)
+            contained.append(0)
+            full = full << 1 | 1
+            partial = len(masks)  # No pending commit has the new bit yet
+        total += 1
+        for bit in range(len(candidates)):
+            contained[bit] += mask >> bit & 1
+        for parent in parents:
+            before = masks.get(parent)
+            after = masks[parent] = (before or 0) | mask
+            if before is None:
+                partial += after != full
+            elif before != full and after == full:
+                partial -= 1
+        if candidates and not partial:
+            break
+
+    depths = [total - count for count in contained]
+    return [node for node, depth in zip(candidates, depths) if depth == min(depths, default=None)]
@@ -1,15 +1,21 @@
 import argparse
+import json
 import logging
 import os
+import subprocess
 import sys
 
-from gitag.auto_tagger import GitAutoTagger
-from gitag.config import MergeStrategy
-from gitag.git_repo import GitRepo
+from gitag.config import BACKEND_NAMES, MergeStrategy
+from gitag.utils import timings as timing
 from gitag.utils.logging_setup import setup_logging
 
 logger = logging.getLogger("gitag")
 
+COMMIT_GRAPH_HELP = "Resolve tags and merge parents from the commit-graph file, writing it if missing or stale"
+PRE_HELP = "Append pre-release label (e.g. alpha.1); a bare label such as rc is numbered rc.1, rc.2, ..."
+BACKEND_CHOICES = ["auto", *BACKEND_NAMES]
+BACKEND_HELP = "Git implementation for history and tag operations (default: config `backend`, else subprocess)"
+
 
 def detect_ci_context() -> tuple[str, bool, bool]:
     env = os.environ
@@ -26,29 +32,428 @@ def detect_ci_context() -> tuple[str, bool, bool]:
     return ("unknown", False, False)
 
 
-def main(argv=None):
-    parser = argparse.ArgumentParser(description="Automatic git tagger using commit messages.")
+def _add_tagging_arguments(parser: argparse.ArgumentParser):
     parser.add_argument("--dry-run", action="store_true", help="Preview without creating a tag")
     parser.add_argument("--debug", action="store_true", help="Enable debug output")
     parser.add_argument("--push", action="store_true", help="Push the tag to remote")
-    parser.add_argument("--since-tag", type=str, help="Compare commits since this tag")
     parser.add_argument("--changelog", action="store_true", help="Write changelog")
     parser.add_argument(
         "--merge-strategy",
         choices=[e.value for e in MergeStrategy],
         default=None,
-        help="Strategy to determine which commits to include: auto, always, or merge_only",
+        help=f"Strategy to determine which commits to include: {', '.join(e.value for e in MergeStrategy)}",
     )
     parser.add_argument(
         "--no-merges", dest="include_merges", action="store_false", help="Exclude merge commits from changelog"
     )
 
     parser.add_argument("--config", type=str, help="Path to pyproject.toml config")
-    parser.add_argument("--pre", type=str, help="Append pre-release label (e.g. alpha.1)")
+    parser.add_argument("--pre", type=str, help=PRE_HELP)
     parser.add_argument("--build", type=str, help="Append build metadata (e.g. 001abc)")
+
+
+def batch_main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="gitag batch", description="Tag many local repositories concurrently.")
+    parser.add_argument("--repos", required=True, help="File listing one repository path per line")
+    parser.add_argument("--jobs", type=int, default=8, help="Number of repositories processed in parallel")
+    parser.add_argument("--report", type=str, help="Write the per-repository report as JSON to this file")
+    _add_tagging_arguments(parser)
+    args = parser.parse_args(argv)
+
+    from gitag.batch import format_report, read_repo_list, run_batch, write_report
+
+    setup_logging(debug=args.debug)
+
+    results = run_batch(
+        read_repo_list(args.repos),
+        jobs=args.jobs,
+        config_path=args.config,
+        dry_run=args.dry_run,
+        debug=args.debug,
+        push=args.push,
+        changelog=args.changelog,
+        pre=args.pre,
+        build=args.build,
+        include_merges=args.include_merges,
+        merge_strategy=MergeStrategy(args.merge_strategy or "auto"),
+    )
+
+    logger.info("📊 Batch report:\n" + format_report(results))
+    if args.report:
+        write_report(results, args.report)
+        logger.info(f"📝 Batch report written to {args.report}")
+
+    return 0 if all(r.ok for r in results) else 1
+
+
+def serve_main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="gitag serve", description="Answer next-version/changelog queries from a long-lived process."
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port for the HTTP endpoint")
+    parser.add_argument("--socket", type=str, help="Serve on this Unix socket instead of TCP")
+    parser.add_argument("--config", type=str, help="Path to pyproject.toml config (default: each repo's own)")
+    parser.add_argument("--merge-strategy", choices=[e.value for e in MergeStrategy], default=None)
+    parser.add_argument("--no-merges", dest="include_merges", action="store_false")
+    parser.add_argument("--debug", action="store_true", help="Enable debug output")
+    args = parser.parse_args(argv)
+
+    from gitag.server import VersionService, serve
+
+    setup_logging(debug=args.debug)
+
+    service = VersionService(
+        config_path=args.config,
+        include_merges=args.include_merges,
+        merge_strategy=MergeStrategy(args.merge_strategy) if args.merge_strategy else None,
+    )
+    serve(service, host=args.host, port=args.port, socket_path=args.socket)
+    return 0
+
+
+def next_version_main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="gitag next-version", description="Print the next version without tagging or writing a changelog."
+    )
+    parser.add_argument("--json", action="store_true", help="Print next version, base tag and bump level as JSON")
+    parser.add_argument("--fetch", action="store_true", help="Fetch tags from the remote first")
+    parser.add_argument("--config", type=str, help="Path to pyproject.toml config")
+    parser.add_argument("--merge-strategy", choices=[e.value for e in MergeStrategy], default=None)
+    parser.add_argument("--no-merges", dest="include_merges", action="store_false")
+    parser.add_argument("--pre", type=str, help=PRE_HELP)
+    parser.add_argument("--build", type=str, help="Append build metadata (e.g. 001abc)")
+    parser.add_argument("--commit-graph", action="store_true", help=COMMIT_GRAPH_HELP)
+    parser.add_argument("--backend", choices=BACKEND_CHOICES, help=BACKEND_HELP)
+    parser.add_argument(
+        "--branches",
+        nargs="+",
+        metavar="REF",
+        help="Next version of each branch (e.g. main release/1.4) since the highest version tag merged into it, from "
+        "one shared history walk (all commits in the range, as with merge strategy `always`)",
+    )
+    parser.add_argument("--debug", action="store_true", help="Enable debug output")
+    args = parser.parse_args(argv)
+
+    from gitag.next_version import compute_next_version
+
+    # stdout carries only the result; diagnostics go to stderr
+    setup_logging(debug=args.debug, stream=sys.stderr)
+    if not args.debug:
+        logger.setLevel(logging.WARNING)
+
+    if args.branches:
+        unsupported = {
+            "--fetch": args.fetch,
+            "--commit-graph": args.commit_graph,
+            "--merge-strategy": args.merge_strategy,
+        }
+        if any(unsupported.values()):
+            parser.error(f"--branches cannot be combined with {', '.join(k for k, v in unsupported.items() if v)}")
+        return _branches_next_versions(args)
+
+    result = compute_next_version(
+        config_path=args.config,
+        merge_strategy=MergeStrategy(args.merge_strategy) if args.merge_strategy else None,
+        include_merges=args.include_merges,
+        fetch=args.fetch,
+        pre=args.pre,
+        build=args.build,
+        commit_graph=args.commit_graph,
+        backend=args.backend,
+    )
+    if args.json:
+        print(json.dumps(result))
+    elif result["next_version"]:
+        print(result["next_version"])
+
+    if result["next_version"] is None:
+        logger.warning("❌ No new commits found.")
+        return 2
+    return 0
+
+
+def _branches_next_versions(args: argparse.Namespace) -> int:
+    from gitag.backends import get_backend
+    from gitag.branches import next_versions
+    from gitag.version_manager import VersionManager
+
+    versioning = VersionManager(args.config)
+    try:
+        results = next_versions(
+            get_backend(args.backend or versioning.backend),
+            versioning,
+            args.branches,
+            include_merges=args.include_merges,
+            pre=args.pre,
+            build=args.build,
+        )
+    except subprocess.CalledProcessError as e:
+        logger.error(f"❌ gitag next-version failed: {(e.stderr or str(e)).strip()}")
+        return 1
+    if args.json:
+        print(json.dumps(results))
+    else:
+        width = max(len(r["ref"]) for r in results)
+        for r in results:
+            print(f"{r['ref']:<{width}}  {r['next_version'] or '-'}")
+    return 0 if any(r["next_version"] for r in results) else 2
+
+
+def clone_main(argv: list[str]) -> int:
+    from gitag.clone import DEFAULT_FILTER, clone_for_tagging
+
+    parser = argparse.ArgumentParser(
+        prog="gitag clone", description="Create a partial clone holding only what tagging needs (commits and tags)."
+    )
+    parser.add_argument("url", help="Repository to clone")
+    parser.add_argument("directory", nargs="?", help="Target directory (default: derived from the URL)")
+    parser.add_argument(
+        "--filter", default=DEFAULT_FILTER, help=f"Object filter, e.g. blob:none or tree:0 (default: {DEFAULT_FILTER})"
+    )
+    parser.add_argument("--branch", type=str, help="Branch to clone")
+    parser.add_argument("--depth", type=int, help="Shallow clone depth (gitag deepens until a tag is reachable)")
+    parser.add_argument(
+        "--checkout",
+        nargs="*",
+        default=["pyproject.toml"],
+        metavar="PATH",
+        help="Files to check out (default: pyproject.toml; pass no paths to check out nothing)",
+    )
+    parser.add_argument("--debug", action="store_true", help="Enable debug output")
+    args = parser.parse_args(argv)
+
+    setup_logging(debug=args.debug)
+
+    directory = args.directory or args.url.rstrip("/").rsplit("/", 1)[-1].removesuffix(".git")
+    try:
+        clone_for_tagging(
+            args.url,
+            directory,
+            filter_spec=args.filter,
+            branch=args.branch,
+            depth=args.depth,
+            checkout=tuple(args.checkout),
+        )
+    except subprocess.CalledProcessError as e:
+        logger.error(f"❌ gitag clone failed: {e}")
+        return 1
+    return 0
+
+
+def stats_main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="gitag stats", description="Summarize the whole history per release in a single streaming pass."
+    )
+    parser.add_argument("--rev", default="HEAD", help="Revision whose history is analysed (default: HEAD)")
+    parser.add_argument("--config", type=str, help="Path to pyproject.toml config")
+    parser.add_argument("--no-merges", dest="include_merges", action="store_false")
+    parser.add_argument("--top", type=int, default=10, help="Most frequent types/scopes to report (0 = all)")
+    parser.add_argument("--json", action="store_true", help="Print the statistics as JSON")
+    parser.add_argument("--backend", choices=BACKEND_CHOICES, help=BACKEND_HELP)
+    parser.add_argument("--debug", action="store_true", help="Enable debug output")
+    args = parser.parse_args(argv)
+
+    from gitag.backends import get_backend
+    from gitag.stats import collect_stats, format_stats
+    from gitag.version_manager import VersionManager
+
+    setup_logging(debug=args.debug, stream=sys.stderr)
+    if not args.debug:
+        logger.setLevel(logging.WARNING)
+
+    versioning = VersionManager(args.config)
+    try:
+        backend = get_backend(args.backend or versioning.backend)
+        stats = collect_stats(backend, versioning, rev=args.rev, include_merges=args.include_merges)
+    except subprocess.CalledProcessError as e:
+        logger.error(f"❌ gitag stats failed: {(e.stderr or str(e)).strip()}")
+        return 1
+
+    data = stats.to_dict(top=args.top or None)
+    print(json.dumps(data, indent=2) if args.json else format_stats(data))
+    return 0
+
+
+def replay_main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="gitag replay", description="Simulate the versions gitag would have released at each main-line merge."
+    )
+    parser.add_argument(
+        "--from", dest="since", help="Start after this ref; its version tag is the starting version (default: root)"
+    )
+    parser.add_argument("--rev", default="HEAD", help="Last revision to replay (default: HEAD)")
+    parser.add_argument("--start-version", help="Version at --from (default: its tag, else the default version)")
+    parser.add_argument("--every-commit", action="store_true", help="Release at every main-line commit, not merges")
+    parser.add_argument("--config", type=str, help="Path to pyproject.toml config")
+    parser.add_argument("--no-merges", dest="include_merges", action="store_false")
+    parser.add_argument("--tag", action="store_true", help="Create all replayed tags in one ref transaction")
+    parser.add_argument("--push", action="store_true", help="Push the created tags in one atomic push (with --tag)")
+    parser.add_argument("--json", action="store_true", help="Print the releases as JSON")
+    parser.add_argument("--backend", choices=BACKEND_CHOICES, help=BACKEND_HELP)
+    parser.add_argument("--debug", action="store_true", help="Enable debug output")
+    args = parser.parse_args(argv)
+    if args.push and not args.tag:
+        parser.error("--push requires --tag")
+
+    from gitag.backends import get_backend
+    from gitag.replay import Replay, format_release
+    from gitag.tag_transaction import TagTransaction
+    from gitag.version_manager import VersionManager
+
+    setup_logging(debug=args.debug, stream=sys.stderr)
+    if not args.debug:
+        logger.setLevel(logging.WARNING)
+
+    versioning = VersionManager(args.config)
+    replay = Replay(
+        get_backend(args.backend or versioning.backend),
+        versioning,
+        include_merges=args.include_merges,
+        every_commit=args.every_commit,
+    )
+    transaction = TagTransaction()
+    releases = []
+    try:
+        for release in replay.run(since=args.since, rev=args.rev, version=args.start_version):
+            releases.append(release.to_dict())
+            if not args.json:
+                print(format_release(release), flush=True)
+            transaction.add(release.version, target=release.sha)
+        if args.json:
+            print(json.dumps(releases, indent=2))
+        if args.tag:
+            transaction.commit()
+            print(f"🏷️ Created {len(transaction.tags)} tag(s).", file=sys.stderr)
+            if args.push:
+                transaction.push()
+    except ValueError as e:
+        logger.error(f"❌ gitag replay failed: {e}")
+        return 1
+    except subprocess.CalledProcessError as e:
+        logger.error(f"❌ gitag replay failed: {(e.stderr or str(e)).strip()}")
+        return 1
+    return 0
+
+
+def watch_main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="gitag watch", description="Print the pending next version and update it whenever HEAD or a ref changes."
+    )
+    parser.add_argument("--config", type=str, help="Path to pyproject.toml config")
+    parser.add_argument("--merge-strategy", choices=[e.value for e in MergeStrategy], default=None)
+    parser.add_argument("--no-merges", dest="include_merges", action="store_false")
+    parser.add_argument("--output", type=str, help="Write each result as JSON to this file instead of printing it")
+    parser.add_argument("--json", action="store_true", help="Print each result as one JSON line")
+    parser.add_argument("--poll", action="store_true", help="Poll refs instead of using inotify")
+    parser.add_argument("--interval", type=float, default=1.0, help="Polling interval in seconds (default: 1.0)")
+    parser.add_argument("--backend", choices=BACKEND_CHOICES, help=BACKEND_HELP)
+    parser.add_argument("--debug", action="store_true", help="Enable debug output")
+    args = parser.parse_args(argv)
+
+    from gitag.git_repo import GitRepo
+    from gitag.refs import find_git_dir
+    from gitag.version_manager import VersionManager
+    from gitag.watch import PendingVersion, create_watcher, watch, write_result
+
+    setup_logging(debug=args.debug, stream=sys.stderr)
+
+    git_dir = find_git_dir()
+    if git_dir is None:
+        logger.error("❌ gitag watch must run inside a git repository.")
+        return 1
+    versioning = VersionManager(args.config)
+    repo = GitRepo(
+        include_merges=args.include_merges,
+        merge_strategy=MergeStrategy(args.merge_strategy) if args.merge_strategy else versioning.merge_strategy,
+        backend=args.backend or versioning.backend,
+    )
+
+    def report(result: dict):
+        if args.output:
+            write_result(result, args.output)
+        elif args.json:
+            print(json.dumps(result), flush=True)
+        elif result.get("error"):
+            print(f"No pending version: {result['error']}", flush=True)
+        elif result["next_version"]:
+            since = result["base_tag"] or "the first commit"
+            summary = f"{result['bump']}, {result['commits']} commit(s) since {since}"
+            print(f"{result['next_version']} ({summary})", flush=True)
+        else:
+            print(f"No new commits since {result['base_tag']}", flush=True)
+
+    watcher = create_watcher(git_dir, polling=args.poll, interval=args.interval)
+    logger.info(f"👀 Watching {git_dir} ({watcher.name}); press Ctrl+C to stop.")
+    try:
+        watch(PendingVersion(repo, versioning), watcher, report)
+    except KeyboardInterrupt:
+        logger.info("👋 Stopped watching.")
+    finally:
+        watcher.close()
+    return 0
+
+
+COMMANDS = {
+    "batch": batch_main,
+    "clone": clone_main,
+    "replay": replay_main,
+    "stats": stats_main,
+    "serve": serve_main,
+    "watch": watch_main,
+    "next-version": next_version_main,
+}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in COMMANDS:
+        try:
+            return COMMANDS[argv[0]](argv[1:])
+        except Exception as e:  # Commands report expected git failures themselves; anything else ends here
+            message = (e.stderr or str(e)).strip() if isinstance(e, subprocess.CalledProcessError) else e
+            logger.error(f"❌ gitag {argv[0]} failed: {message}")
+            if "--debug" in argv:
+                raise
+            return 1
+
+    parser = argparse.ArgumentParser(description="Automatic git tagger using commit messages.")
+    _add_tagging_arguments(parser)
+    parser.add_argument("--since-tag", type=str, help="Compare commits since this tag")
     parser.add_argument("--ci", action="store_true", help="Enable CI detection mode")
+    parser.add_argument(
+        "--race-safe",
+        action="store_true",
+        help="Push with a lease and recompute the version if a concurrent run pushed a tag first",
+    )
+    parser.add_argument("--commit-graph", action="store_true", help=COMMIT_GRAPH_HELP)
+    parser.add_argument("--backend", choices=BACKEND_CHOICES, help=BACKEND_HELP)
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Hold commit subjects in one bytes buffer instead of a list of strings (very large ranges)",
+    )
+    parser.add_argument(
+        "--dedup-cherry-picks",
+        action="store_true",
+        help="Leave commits whose change is already in the range (same `git patch-id`) out of the changelog",
+    )
+    parser.add_argument(
+        "--cache",
+        metavar="PATH",
+        help="Reuse/store the computed result in this file (keyed by HEAD, tags and config) across pipeline steps",
+    )
+    parser.add_argument(
+        "--timings",
+        nargs="?",
+        const="-",
+        metavar="PATH",
+        help="Write per-phase and per-git-command timings as JSON to PATH (default: stderr)",
+    )
     args = parser.parse_args(argv)
 
+    from gitag.auto_tagger import GitAutoTagger  # Only the tagging command pays for the tagging stack
+
     setup_logging(debug=args.debug)
 
     if args.ci:
@@ -64,6 +469,7 @@ def main(argv=None):
             args.dry_run = True
             logger.info("ℹ️ Non-main branch – dry run fallback.")
 
+    timings = timing.Timings() if args.timings else None
     try:
         tagger = GitAutoTagger(
             debug=args.debug,
@@ -74,13 +480,23 @@ def main(argv=None):
             build=args.build,
             include_merges=args.include_merges,
             merge_strategy=MergeStrategy(args.merge_strategy or "auto"),
+            race_safe=args.race_safe,
+            cache_path=args.cache,
+            commit_graph=args.commit_graph,
+            backend=args.backend,
+            compact=args.compact,
+            dedup_cherry_picks=args.dedup_cherry_picks,
         )
-        tagger.run(dry_run=args.dry_run, since_tag=args.since_tag)
+        with timing.activate(timings):
+            tagger.run(dry_run=args.dry_run, since_tag=args.since_tag)
     except Exception as e:
         logger.error(f"❌ gitag failed: {e}")
         if args.debug:
             raise
         return 1
+    finally:
+        if timings:
+            timings.write(args.timings)
 
     return 0
 
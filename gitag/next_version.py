@@ -0,0 +1,79 @@
+import logging
+import os
+from contextlib import closing
+from typing import Optional
+
+from gitag.config import MergeStrategy
+from gitag.git_repo import GitRepo
+from gitag.refs import find_git_dir, read_tags, resolve_ref
+from gitag.tag_index import SemverIndex, needs_counter
+from gitag.version_manager import VersionManager
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_base_tag(repo: GitRepo, fetch: bool = False) -> Optional[str]:
+    """Latest tag for `repo`, answered from the git dir when possible and via `git describe` otherwise."""
+    git_dir = find_git_dir(repo.cwd)
+    if fetch or git_dir is None:
+        return repo.get_latest_tag(fetch=fetch, deepen=fetch) or None
+
+    tags = read_tags(git_dir)
+    if tags == {}:
+        logger.debug("No tags in repository.")
+        return None  # Skips describe and its fallback, which would both fail
+
+    head = resolve_ref(git_dir, "HEAD")
+    at_head = [name for name, sha in (tags or {}).items() if head and sha == head]
+    if len(at_head) == 1:
+        logger.debug(f"Latest tag (points at HEAD): {at_head[0]}")
+        return at_head[0]
+    return repo.get_latest_tag(fetch=False, deepen=False) or None
+
+
+def compute_next_version(
+    repo_path: Optional[str] = None,
+    config_path: Optional[str] = None,
+    merge_strategy: Optional[MergeStrategy] = None,
+    include_merges: bool = True,
+    fetch: bool = False,
+    pre: Optional[str] = None,
+    build: Optional[str] = None,
+    commit_graph: bool = False,
+    backend: Optional[str] = None,
+) -> dict:
+    """Next version, base tag and bump level for HEAD, without touching tags or the changelog.
+
+    Commit subjects are streamed and classification stops at the first major change,
+    so large ranges are only read as far as needed.
+    """
+    if config_path is None and repo_path:
+        config_path = os.path.join(repo_path, "pyproject.toml")
+    versioning = VersionManager(config_path)
+    repo = GitRepo(
+        include_merges=include_merges,
+        merge_strategy=merge_strategy or versioning.merge_strategy,
+        cwd=repo_path,
+        commit_graph=commit_graph,
+        backend=backend or versioning.backend,
+    )
+
+    base_tag = resolve_base_tag(repo, fetch=fetch)
+    with closing(repo.iter_commit_messages(since_tag=base_tag, raw=True)) as commits:
+        bump = versioning.highest_bump(commits)
+
+    next_version = None
+    if bump is not None:
+        pre_index = None
+        if needs_counter(pre):
+            git_dir = find_git_dir(repo.cwd)
+            tags = read_tags(git_dir) if git_dir else None
+            pre_index = SemverIndex(versioning, tags if tags is not None else repo.list_local_tags())
+        next_version = versioning.bump_version(
+            base_tag or versioning.get_default_version(), bump, pre=pre, build=build, pre_index=pre_index
+        )
+    return {
+        "next_version": next_version,
+        "base_tag": base_tag,
+        "bump": str(bump) if bump is not None else None,
+    }
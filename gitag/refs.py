@@ -0,0 +1,187 @@
+import os
+import zlib
+from pathlib import Path
+from typing import Optional
+
+
+def find_git_dir(path: Optional[str] = None) -> Optional[Path]:
+    """Locate the git directory for `path` (walking up), following `.git` files of worktrees/submodules."""
+    current = Path(path or os.getcwd()).resolve()
+    for candidate in (current, *current.parents):
+        dot_git = candidate / ".git"
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            content = dot_git.read_text().strip()
+            if content.startswith("gitdir:"):
+                git_dir = Path(content[len("gitdir:") :].strip())
+                return git_dir if git_dir.is_absolute() else (candidate / git_dir).resolve()
+        if (candidate / "HEAD").is_file() and (candidate / "refs").is_dir():
+            return candidate  # bare repository
+    return None
+
+
+def common_dir(git_dir: Path) -> Path:
+    """Worktrees keep refs in the main repository; `commondir` points there."""
+    pointer = git_dir / "commondir"
+    if pointer.is_file():
+        return (git_dir / pointer.read_text().strip()).resolve()
+    return git_dir
+
+
+def is_shallow(git_dir: Path) -> bool:
+    """Shallow clones record their cut-off commits in `shallow`."""
+    return (common_dir(git_dir) / "shallow").is_file()
+
+
+def refs_fingerprint(git_dir: Path) -> tuple:
+    """Cheap change detector over HEAD, loose refs and packed-refs (paths, inodes, sizes and mtimes).
+
+    Any ref update rewrites one of these files, so comparing fingerprints tells whether
+    cached results for the repository are still valid without running git.
+    """
+    refs_root = common_dir(git_dir)
+    entries = []
+    for path in (git_dir / "HEAD", refs_root / "packed-refs"):
+        try:
+            st = path.stat()
+            entries.append((str(path), st.st_ino, st.st_size, st.st_mtime_ns))
+        except FileNotFoundError:
+            entries.append((str(path), None, None, None))
+
+    for root, _, files in os.walk(refs_root / "refs"):
+        st = os.stat(root)
+        entries.append((root, st.st_ino, None, st.st_mtime_ns))
+        for name in files:
+            try:
+                st = os.stat(os.path.join(root, name))
+            except FileNotFoundError:  # ref deleted while walking
+                continue
+            entries.append((os.path.join(root, name), st.st_ino, st.st_size, st.st_mtime_ns))
+    return tuple(sorted(entries, key=lambda e: e[0]))
+
+
+def _packed_refs(refs_root: Path) -> dict[str, str]:
+    """Parse packed-refs into ref name -> SHA; peeled (`^`) lines replace the tag object SHA."""
+    refs: dict[str, str] = {}
+    try:
+        lines = (refs_root / "packed-refs").read_text().splitlines()
+    except FileNotFoundError:
+        return refs
+    last = None
+    for line in lines:
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("^"):
+            if last:
+                refs[last] = line[1:]
+            continue
+        sha, _, last = line.partition(" ")
+        refs[last] = sha
+    return refs
+
+
+def resolve_ref(git_dir: Path, name: str = "HEAD") -> Optional[str]:
+    """Resolve a (possibly symbolic) ref to its SHA by reading the git dir; None if it cannot be read natively."""
+    refs_root = common_dir(git_dir)
+    if (refs_root / "reftable").is_dir():
+        return None  # reftable repositories need git to read refs
+    packed = None
+    for _ in range(5):  # Symbolic ref chains are short; guard against loops
+        base = git_dir if name == "HEAD" else refs_root
+        try:
+            content = (base / name).read_text().strip()
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            if packed is None:
+                packed = _packed_refs(refs_root)
+            return packed.get(name)
+        if not content.startswith("ref:"):
+            return content
+        name = content[len("ref:") :].strip()
+    return None
+
+
+def read_tags(git_dir: Path) -> Optional[dict[str, str]]:
+    """Map tag name -> SHA from loose refs and packed-refs, without running git.
+
+    Packed annotated tags resolve to their commit; loose annotated tags keep the tag object SHA.
+    Returns None for reftable repositories, which have to be queried through git.
+    """
+    refs_root = common_dir(git_dir)
+    if (refs_root / "reftable").is_dir():
+        return None
+    tags = {
+        ref[len("refs/tags/") :]: sha for ref, sha in _packed_refs(refs_root).items() if ref.startswith("refs/tags/")
+    }
+    tags_root = refs_root / "refs" / "tags"
+    for root, _, files in os.walk(tags_root):
+        for name in files:
+            path = Path(root, name)
+            try:
+                tags[path.relative_to(tags_root).as_posix()] = path.read_text().strip()
+            except FileNotFoundError:  # tag deleted while walking
+                continue
+    return tags
+
+
+def read_config(git_dir: Path) -> dict[str, str]:
+    """Flatten the repository's `config` into `section[.subsection].key` -> value (last one wins).
+
+    Sections and keys are lower-cased like git does; subsections keep their case. Includes are not followed.
+    """
+    config: dict[str, str] = {}
+    try:
+        lines = (common_dir(git_dir) / "config").read_text().splitlines()
+    except FileNotFoundError:
+        return config
+    section = ""
+    for raw in lines:
+        line = raw.strip()
+        if not line or line[0] in "#;":
+            continue
+        if line.startswith("["):
+            header = line[1 : line.index("]")] if "]" in line else line[1:]
+            name, _, sub = header.partition(" ")
+            sub = sub.strip().strip('"')
+            section = f"{name.lower()}.{sub}" if sub else name.lower()
+            continue
+        key, sep, value = line.partition("=")
+        value = value.strip().strip('"') if sep else "true"
+        config[f"{section}.{key.strip().lower()}"] = value
+    return config
+
+
+def partial_clone_filter(git_dir: Path) -> Optional[str]:
+    """Object filter of a partial clone (e.g. "blob:none", "tree:0"), "" if unknown, None for full clones."""
+    config = read_config(git_dir)
+    promisors = [
+        key[: -len(".promisor")]
+        for key, value in config.items()
+        if key.startswith("remote.") and key.endswith(".promisor") and value.lower() in ("true", "yes", "on", "1")
+    ]
+    if "extensions.partialclone" in config:
+        promisors.insert(0, f"remote.{config['extensions.partialclone']}")
+    if not promisors:
+        return None
+    return config.get(f"{promisors[0]}.partialclonefilter", "")
+
+
+def read_loose_object(git_dir: Path, sha: str) -> Optional[tuple[str, bytes]]:
+    """Type and body of a loose object, or None if it is packed (or missing)."""
+    path = common_dir(git_dir) / "objects" / sha[:2] / sha[2:]
+    try:
+        raw = zlib.decompress(path.read_bytes())
+    except (FileNotFoundError, zlib.error):
+        return None
+    header, _, body = raw.partition(b"\0")
+    return header.split(b" ")[0].decode(), body
+
+
+def peel_tag(git_dir: Path, sha: str) -> str:
+    """Follow loose annotated tag objects to the object they point at; other SHAs are returned unchanged."""
+    for _ in range(10):  # Tags of tags are rare; bound the chain anyway
+        obj = read_loose_object(git_dir, sha)
+        if obj is None or obj[0] != "tag":
+            return sha
+        sha = obj[1].split(b"\n", 1)[0].removeprefix(b"object ").decode()
+    return sha
@@ -0,0 +1,66 @@
+import hashlib
+import logging
+from typing import Optional
+
+from gitag.config import BumpLevel
+from gitag.git_repo import GitRepo
+from gitag.refs import common_dir, find_git_dir
+from gitag.result_cache import ResultCache
+from gitag.utils.timings import phase
+from gitag.version_manager import VersionManager
+
+logger = logging.getLogger(__name__)
+
+MEMO_FILE = "gitag/merge-memo.json"
+MEMO_ENTRIES = 4096
+
+
+def merge_memo(repo: GitRepo) -> Optional[ResultCache]:
+    """Per-merge classification memo stored in the repository's (common) git dir, or None outside a repo."""
+    git_dir = find_git_dir(repo.cwd)
+    return ResultCache(str(common_dir(git_dir) / MEMO_FILE), max_entries=MEMO_ENTRIES) if git_dir else None
+
+
+class ReleaseWalk:
+    """Commits and bump level of a release, assembled merge by merge along the first-parent history.
+
+    Each merge contributes the commits of the branch it merged; their subjects and bump level are
+    memoized per merge commit SHA (and config), so a run only reads and classifies merges it has not
+    seen before. Commits made directly on the first-parent path count individually.
+    """
+
+    def __init__(self, repo: GitRepo, versioning: VersionManager, memo: Optional[ResultCache] = None):
+        self.repo = repo
+        self.versioning = versioning
+        self.memo = memo
+
+    def _memo_key(self, sha: str, config: str) -> str:
+        return hashlib.sha256(f"{sha}:{config}:{self.repo.include_merges}".encode()).hexdigest()
+
+    def run(self, since_tag: Optional[str]) -> tuple[list[str], Optional[BumpLevel]]:
+        chain = self.repo.first_parent_commits(since_tag)
+        config = ResultCache.config_digest(self.versioning.config_path)
+        keys = {c.sha: self._memo_key(c.sha, config) for c in chain if len(c.parents) > 1}
+        known = self.memo.get_many(list(keys.values())) if self.memo and keys else {}
+        logger.debug(f"First-parent walk: {len(chain)} commits, {len(keys)} merges, {len(known)} memoized.")
+
+        commits: list[str] = []
+        levels: list[BumpLevel] = []
+        fresh: dict[str, dict] = {}
+        with phase("release-walk"):
+            for commit in chain:
+                key = keys.get(commit.sha)
+                entry = known.get(key) if key else None
+                if entry is None:
+                    messages = self.repo.merged_commit_messages(commit)
+                    level = self.versioning.highest_bump(messages)
+                    entry = {"commits": messages, "bump": str(level) if level is not None else None}
+                    if key:
+                        fresh[key] = entry
+                commits.extend(entry["commits"])
+                if entry["bump"]:
+                    levels.append(BumpLevel[entry["bump"].upper()])
+
+        if self.memo:
+            self.memo.put_many(fresh)
+        return commits, min(levels, default=None)
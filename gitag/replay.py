@@ -0,0 +1,130 @@
+import logging
+import re
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Iterable, Iterator, Optional
+
+from gitag.backends import Commit, GitBackend
+from gitag.config import BumpLevel
+from gitag.utils.timings import phase
+from gitag.version_manager import VersionManager
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReplayedRelease:
+    sha: str
+    subject: str
+    version: str
+    bump: BumpLevel
+    commits: int  # Commits released with this version (merged branch plus direct commits since the last one)
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "bump": str(self.bump)}
+
+
+def start_version(backend: GitBackend, versioning: VersionManager, ref: Optional[str]) -> str:
+    """Version tagged on `ref` (the highest, if several), else the configured default version."""
+    if ref is None:
+        return versioning.get_default_version()
+    sha = backend.resolve(ref)
+    pattern = re.compile(versioning.pattern)
+    versions = {}
+    for name, target in backend.list_tags().items():
+        match = pattern.fullmatch(versioning.strip_prefix_suffix(name)) if target == sha else None
+        if match:
+            versions[name] = (int(match.group("major")), int(match.group("minor")), int(match.group("patch")))
+    if not versions:
+        logger.debug(f"No version tag on {ref}; replaying from {versioning.get_default_version()}.")
+        return versioning.get_default_version()
+    return max(versions, key=versions.get)
+
+
+@dataclass
+class _MainLineCommit:
+    sha: str
+    subject: str
+    is_merge: bool
+    commits: int = 0  # Commits first reached from this one: itself (unless a merge) and the branch it merges
+    level: Optional[BumpLevel] = None  # Highest bump among those commits
+
+
+class Replay:
+    """What gitag would have released at each merge on the main line of `rev`, oldest first.
+
+    History is read in one topologically ordered `walk_topo` of `rev` (excluding `since`), children
+    before parents, and folded as it streams: each commit is attributed to the oldest main-line commit
+    reaching it (as replaying the main line from its oldest commit would release it there), kept only
+    while it is on the walk's frontier. Memory grows with the main line and the branch width, never
+    with the size of the merged branches. Direct commits on the main line are carried into the next
+    release. With `every_commit`, each main-line commit is a release of its own.
+    """
+
+    def __init__(
+        self,
+        backend: GitBackend,
+        versioning: VersionManager,
+        include_merges: bool = True,
+        every_commit: bool = False,
+    ):
+        self.backend = backend
+        self.versioning = versioning
+        self.include_merges = include_merges
+        self.every_commit = every_commit
+
+    def _main_line(self, commits: Iterable[Commit], head: str) -> list[_MainLineCommit]:
+        """Main-line commits newest first, with the commits each one releases classified in one pass."""
+        main_line: list[_MainLineCommit] = []
+        owners: dict[str, int] = {}  # Commits not walked yet -> oldest main-line commit (index) reaching them
+        counted: deque = deque()
+
+        def subjects() -> Iterator[str]:
+            expected = head
+            for commit in commits:
+                owner = owners.pop(commit.sha, None)
+                is_merge = len(commit.parents) > 1
+                if commit.sha == expected:
+                    owner = len(main_line)
+                    main_line.append(_MainLineCommit(commit.sha, commit.subject, is_merge))
+                    expected = commit.parents[0] if commit.parents else None
+                    counts = not is_merge
+                else:
+                    counts = self.include_merges or not is_merge
+                for parent in commit.parents:
+                    owners[parent] = max(owners.get(parent, owner), owner)
+                if counts:
+                    counted.append(main_line[owner])
+                    yield commit.subject
+
+        for _, level in self.versioning.classify(subjects()):
+            entry = counted.popleft()
+            entry.commits += 1
+            if entry.level is None or level.value < entry.level.value:
+                entry.level = level
+        return main_line
+
+    def run(
+        self, since: Optional[str] = None, rev: str = "HEAD", version: Optional[str] = None
+    ) -> Iterator[ReplayedRelease]:
+        """Yield the simulated releases; `version` is the version at `since` (default: its tag)."""
+        version = version or start_version(self.backend, self.versioning, since)
+        with phase("replay-walk"):
+            commits = self.backend.walk_topo([rev], [since] if since else [])
+            main_line = self._main_line(commits, self.backend.resolve(rev))
+        logger.debug(f"Replaying {len(main_line)} main-line commits from {version}.")
+
+        pending, level = 0, None
+        for entry in reversed(main_line):
+            pending += entry.commits
+            if entry.level is not None and (level is None or entry.level.value < level.value):
+                level = entry.level
+            if not pending or not (entry.is_merge or self.every_commit):
+                continue
+            version = self.versioning.bump_version(version, level)
+            yield ReplayedRelease(entry.sha, entry.subject, version, level, pending)
+            pending, level = 0, None
+
+
+def format_release(release: ReplayedRelease) -> str:
+    return f"{release.version:<16} {release.sha[:12]}  {str(release.bump):<5}  {release.commits:>5}  {release.subject}"
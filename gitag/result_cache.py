@@ -0,0 +1,104 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from gitag.refs import find_git_dir, read_tags, resolve_ref
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS_PATH = Path(__file__).parent.parent / "default_pyproject.toml"
+
+
+def _file_digest(path: Optional[str]) -> str:
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest() if path else ""
+    except FileNotFoundError:
+        return ""
+
+
+class ResultCache:
+    """Computed results (base tag, next version, bump, commits) in a JSON file shared by pipeline steps.
+
+    Entries are keyed by HEAD SHA, a checksum over all tag refs, the config (and bundled defaults)
+    contents and the options that influence the result, so any change to those yields a miss.
+    """
+
+    MAX_ENTRIES = 32
+
+    def __init__(self, path: str, max_entries: int = MAX_ENTRIES):
+        self.path = Path(path)
+        self.max_entries = max_entries
+
+    @staticmethod
+    def config_digest(config_path: Optional[str]) -> str:
+        """Checksum over the user config and the bundled defaults (both shape classification)."""
+        return hashlib.sha256(f"{_file_digest(config_path)}:{_file_digest(str(DEFAULTS_PATH))}".encode()).hexdigest()
+
+    @staticmethod
+    def key(repo_path: Optional[str], config_path: Optional[str], **options) -> Optional[str]:
+        """Cache key for the repository's current state, or None if it cannot be read without git."""
+        git_dir = find_git_dir(repo_path)
+        if git_dir is None:
+            return None
+        head, tags = resolve_ref(git_dir, "HEAD"), read_tags(git_dir)
+        if head is None or tags is None:
+            return None
+
+        refs = hashlib.sha256("\n".join(f"{name} {sha}" for name, sha in sorted(tags.items())).encode()).hexdigest()
+        material = {
+            "head": head,
+            "refs": refs,
+            "config": ResultCache.config_digest(config_path),
+            "options": options,
+        }
+        return hashlib.sha256(json.dumps(material, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _load(self) -> dict:
+        try:
+            data = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable result cache {self.path}: {e}")
+            return {}
+        return data.get("entries", {}) if isinstance(data, dict) else {}
+
+    def get(self, key: Optional[str]) -> Optional[dict]:
+        if key is None:
+            return None
+        entry = self._load().get(key)
+        logger.debug(f"Result cache {'hit' if entry else 'miss'} for {key[:12]}")
+        return entry
+
+    def get_many(self, keys: list[str]) -> dict[str, dict]:
+        """Entries for those of `keys` that are cached, read with a single load."""
+        entries = self._load()
+        return {key: entries[key] for key in keys if key in entries}
+
+    def put(self, key: Optional[str], result: dict):
+        if key is not None:
+            self.put_many({key: result})
+
+    def put_many(self, results: dict[str, dict]):
+        if not results:
+            return
+        entries = self._load()
+        for key, result in results.items():
+            entries.pop(key, None)
+            entries[key] = result
+        entries = dict(list(entries.items())[-self.max_entries :])
+
+        # Write atomically so a concurrent reader never sees a partial file
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({"entries": entries}, f, default=list)  # CommitStore / CommitSection values
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
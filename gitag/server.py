@@ -0,0 +1,251 @@
+import json
+import logging
+import os
+import socketserver
+import subprocess
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Hashable, Optional
+from urllib.parse import parse_qs, urlparse
+
+from gitag.changelog_writer import ChangelogWriter
+from gitag.config import DEFAULT_LEVELS, BumpLevel, MergeStrategy
+from gitag.git_repo import GitRepo
+from gitag.refs import find_git_dir, refs_fingerprint
+from gitag.utils.git_cmd import run_git
+from gitag.version_manager import VersionManager
+
+logger = logging.getLogger(__name__)
+
+MAX_CONFIGS = 64
+MAX_RESULTS = 1024  # (repo, ref, config) results kept warm
+MAX_MEMO = 100_000  # Classified messages remembered per config
+
+
+class LRUCache:
+    """Thread-safe mapping of at most `maxsize` entries; the least recently used one is dropped first."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class VersionService:
+    """Answers next-version/changelog queries, keeping configs and per-repo results warm.
+
+    Results are cached per (git dir, ref, config) and reused until the repository's refs
+    fingerprint (HEAD, loose refs, packed-refs) changes. Commit classifications are memoized
+    per loaded config, so a new commit on top of a known range only classifies the new message.
+    Configs are identified by path and modification time, and every cache is a bounded LRU.
+    """
+
+    def __init__(
+        self,
+        config_path: Optional[str] = None,
+        include_merges: bool = True,
+        merge_strategy: Optional[MergeStrategy] = None,
+    ):
+        self.config_path = config_path
+        self.include_merges = include_merges
+        self.merge_strategy = merge_strategy
+        self._configs = LRUCache(MAX_CONFIGS)  # config path -> ((path, mtime), VersionManager)
+        self._levels = LRUCache(MAX_CONFIGS)  # (path, mtime) -> LRUCache of message -> BumpLevel
+        self._results = LRUCache(MAX_RESULTS)  # (git dir, ref, (path, mtime)) -> (refs fingerprint, result)
+
+    def _load_config(self, repo_path: str) -> tuple[tuple, VersionManager]:
+        config = self.config_path or os.path.join(repo_path, "pyproject.toml")
+        try:
+            key = (config, os.stat(config).st_mtime_ns)
+        except FileNotFoundError:
+            key = (config, None)
+
+        cached = self._configs.get(config)
+        if cached and cached[0] == key:
+            return cached
+        if cached:
+            self._levels.pop(cached[0])
+        loaded = (key, VersionManager(config))
+        self._configs.put(config, loaded)
+        return loaded
+
+    def _versioning(self, repo_path: str) -> VersionManager:
+        return self._load_config(repo_path)[1]
+
+    def _classify(self, config_key: tuple, versioning: VersionManager, commits: list[str]) -> list[BumpLevel]:
+        memo = self._levels.get(config_key)
+        if memo is None:
+            memo = LRUCache(MAX_MEMO)
+            self._levels.put(config_key, memo)
+        levels = [memo.get(msg) for msg in commits]
+        missing = [i for i, level in enumerate(levels) if level is None]
+        for i, (msg, level) in zip(missing, versioning.classify(commits[i] for i in missing)):
+            levels[i] = level
+            memo.put(msg, level)
+        return levels
+
+    @staticmethod
+    def _resolve(repo_path: str, ref: str) -> str:
+        """Commit SHA of `ref`; only the SHA reaches later git commands, so a ref cannot act as an option."""
+        try:
+            cmd = ["git", "rev-parse", "--verify", "--quiet", "--end-of-options", f"{ref}^{{commit}}"]
+            return run_git(cmd, cwd=repo_path).stdout.strip()
+        except subprocess.CalledProcessError:
+            raise ValueError(f"Unknown ref: {ref}") from None
+
+    def _compute(self, repo_path: str, ref: str, config_key: tuple, versioning: VersionManager) -> dict:
+        repo = GitRepo(
+            include_merges=self.include_merges,
+            merge_strategy=self.merge_strategy or versioning.merge_strategy,
+            cwd=repo_path,
+            rev=self._resolve(repo_path, ref),
+        )
+        base_tag = repo.get_latest_tag(fetch=False, deepen=False) or None
+        commits = repo.get_commit_messages(since_tag=base_tag)
+        levels = self._classify(config_key, versioning, commits)
+
+        categorized = {str(level): [] for level in DEFAULT_LEVELS}
+        for msg, level in zip(commits, levels):
+            categorized[str(level)].append(msg)
+
+        bump = min(levels, default=None)
+        next_version = None
+        if bump is not None:
+            next_version = versioning.bump_version(base_tag or versioning.get_default_version(), bump)
+        return {
+            "repo": repo_path,
+            "ref": ref,
+            "base_tag": base_tag,
+            "next_version": next_version,
+            "bump": str(bump) if bump is not None else None,
+            "commits": len(commits),
+            "categorized": categorized,
+        }
+
+    def query(self, repo_path: str, ref: str = "HEAD", changelog: bool = False) -> dict:
+        git_dir = find_git_dir(repo_path)
+        if git_dir is None:
+            raise ValueError(f"Not a git repository: {repo_path}")
+
+        if ref.startswith("-"):
+            raise ValueError(f"Invalid ref: {ref}")
+        config_key, versioning = self._load_config(repo_path)
+        key = (str(git_dir), ref, config_key)
+        fingerprint = refs_fingerprint(git_dir)
+
+        cached = self._results.get(key)
+        if cached and cached[0] == fingerprint:
+            result = cached[1]
+            logger.debug(f"Cache hit for {repo_path}@{ref}")
+        else:
+            result = self._compute(repo_path, ref, config_key, versioning)
+            self._results.put(key, (fingerprint, result))
+
+        payload = {k: v for k, v in result.items() if k != "categorized"}
+        if changelog:
+            entry = ""
+            if result["next_version"]:
+                entry = ChangelogWriter().generate_entry(result["next_version"], result["categorized"])
+            payload["changelog"] = entry
+        return payload
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    server_version = "gitag"
+
+    def _send(self, status: int, body: str, content_type: str = "application/json"):
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_json(self, status: int, payload: dict):
+        self._send(status, json.dumps(payload) + "\n")
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+        if url.path == "/health":
+            return self._send_json(200, {"status": "ok"})
+        if url.path not in ("/next-version", "/changelog"):
+            return self._send_json(404, {"error": f"Unknown endpoint: {url.path}"})
+        if "repo" not in params:
+            return self._send_json(400, {"error": "Missing 'repo' parameter"})
+
+        try:
+            payload = self.server.service.query(
+                params["repo"], params.get("ref", "HEAD"), changelog=url.path == "/changelog"
+            )
+        except ValueError as e:
+            return self._send_json(400, {"error": str(e)})
+        except SystemExit:
+            return self._send_json(400, {"error": f"git failed for {params['repo']}@{params.get('ref', 'HEAD')}"})
+
+        if params.get("format") == "text":
+            text = payload.get("changelog") if url.path == "/changelog" else payload["next_version"]
+            return self._send(200, f"{text or ''}\n", "text/plain; charset=utf-8")
+        return self._send_json(200, payload)
+
+    def address_string(self) -> str:
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def create_server(
+    service: VersionService, host: str = "127.0.0.1", port: int = 8765, socket_path: Optional[str] = None
+) -> socketserver.BaseServer:
+    if socket_path:
+        if Path(socket_path).exists():
+            os.unlink(socket_path)  # stale socket from a previous run
+        server = UnixHTTPServer(socket_path, _RequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), _RequestHandler)
+        server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def serve(service: VersionService, host: str = "127.0.0.1", port: int = 8765, socket_path: Optional[str] = None):
+    server = create_server(service, host=host, port=port, socket_path=socket_path)
+    where = socket_path or f"http://{host}:{server.server_address[1]}"
+    logger.info(f"🛰️ gitag serving version queries on {where}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("👋 Shutting down.")
+    finally:
+        server.server_close()
+        if socket_path and Path(socket_path).exists():
+            os.unlink(socket_path)
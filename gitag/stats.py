@@ -0,0 +1,153 @@
+import re
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, Optional
+
+from gitag.backends import Commit, GitBackend
+from gitag.config import BumpLevel
+from gitag.version_manager import VersionManager
+
+UNRELEASED = "(unreleased)"
+CONVENTIONAL_SUBJECT = re.compile(r"^(?P<type>[A-Za-z]+)(?:\((?P<scope>[^)]*)\))?!?:")
+
+
+@dataclass
+class ReleaseStats:
+    tag: str
+    time: Optional[int] = None  # Commit time of the tagged commit (None for unreleased work)
+    commits: int = 0
+    bumps: Counter = field(default_factory=Counter)
+
+    @property
+    def bump(self) -> Optional[BumpLevel]:
+        """Bump level the release's commits imply."""
+        return min(self.bumps, default=None)
+
+
+class HistoryStats:
+    """Bounded-memory aggregation over a topologically ordered, newest-first commit stream.
+
+    Only counters are kept: one `ReleaseStats` per tag plus type and scope frequencies, and the
+    release owning each commit on the walk's frontier, so memory grows with the number of releases,
+    distinct scopes and branch width, never with the number of commits. Each commit is attributed
+    to the oldest release that contains it (as with `prev_tag..tag` ranges); commits no tag reaches
+    are unreleased.
+    """
+
+    def __init__(self, versioning: VersionManager, tags: dict[str, str], include_merges: bool = True):
+        self.versioning = versioning
+        self.include_merges = include_merges
+        self.tags_by_commit: dict[str, list[str]] = {}
+        for name, sha in tags.items():
+            self.tags_by_commit.setdefault(sha, []).append(name)
+        self.releases: list[ReleaseStats] = []
+        self.unreleased: Optional[ReleaseStats] = None
+        self.owners: dict[str, ReleaseStats] = {}  # Commits not walked yet -> oldest release reaching them so far
+        self.types: Counter = Counter()
+        self.scopes: Counter = Counter()
+        self.commits = 0
+
+    def _release_of(self, commit: Commit) -> ReleaseStats:
+        """Release `commit` belongs to; all its children must have been seen already."""
+        owner = self.owners.pop(commit.sha, None)
+        names = self.tags_by_commit.get(commit.sha)
+        if names:
+            owner = ReleaseStats(tag=max(names), time=commit.time)
+            self.releases.append(owner)
+        elif owner is None:
+            if self.unreleased is None:
+                self.unreleased = ReleaseStats(tag=UNRELEASED)
+                self.releases.append(self.unreleased)
+            owner = self.unreleased
+        for parent in commit.parents:
+            current = self.owners.get(parent)
+            if current is None or _released_before(owner, current):
+                self.owners[parent] = owner
+        return owner
+
+    def _count(self, release: ReleaseStats, commit: Commit, level: BumpLevel):
+        release.commits += 1
+        release.bumps[level] += 1
+        match = CONVENTIONAL_SUBJECT.match(commit.subject)
+        self.types[match.group("type").lower() if match else "(none)"] += 1
+        if match and match.group("scope"):
+            self.scopes[match.group("scope")] += 1
+        self.commits += 1
+
+    def consume(self, commits: Iterable[Commit]) -> "HistoryStats":
+        """Add `commits` (children before parents), classified in one `VersionManager.classify` pass."""
+        counted: deque = deque()
+
+        def subjects() -> Iterator[str]:
+            for commit in commits:
+                release = self._release_of(commit)  # Merges still carry ownership to their parents
+                if self.include_merges or len(commit.parents) < 2:
+                    counted.append((release, commit))
+                    yield commit.subject
+
+        for _, level in self.versioning.classify(subjects()):
+            self._count(*counted.popleft(), level)
+        return self
+
+    def to_dict(self, top: Optional[int] = None) -> dict:
+        ordered = sorted(self.releases, key=lambda r: -r.time if r.time is not None else float("-inf"))
+        releases = []
+        for i, release in enumerate(ordered):
+            previous = ordered[i + 1].time if i + 1 < len(ordered) else None
+            releases.append(
+                {
+                    "tag": release.tag,
+                    "date": _date(release.time),
+                    "commits": release.commits,
+                    "bump": str(release.bump) if release.bump is not None else None,
+                    "bumps": {str(level): release.bumps.get(level, 0) for level in BumpLevel},
+                    "days_since_previous": (
+                        round((release.time - previous) / 86400, 2) if release.time and previous else None
+                    ),
+                }
+            )
+        return {
+            "commits": self.commits,
+            "releases": releases,
+            "types": dict(self.types.most_common(top)),
+            "scopes": dict(self.scopes.most_common(top)),
+        }
+
+
+def _date(timestamp: Optional[int]) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp, timezone.utc).date().isoformat() if timestamp else None
+
+
+def _released_before(release: ReleaseStats, other: ReleaseStats) -> bool:
+    if release.time is None:
+        return False  # Unreleased work never wins over a tag
+    return other.time is None or release.time < other.time
+
+
+def collect_stats(
+    backend: GitBackend, versioning: VersionManager, rev: str = "HEAD", include_merges: bool = True
+) -> HistoryStats:
+    """Walk the whole history of `rev` once and aggregate it per release."""
+    stats = HistoryStats(versioning, backend.list_tags(), include_merges=include_merges)
+    return stats.consume(backend.walk_topo([rev], []))
+
+
+def format_stats(data: dict) -> str:
+    width = max([len(r["tag"]) for r in data["releases"]] + [len("Release")])
+    lines = [
+        f"{'Release':<{width}}  Date        Commits  Major  Minor  Patch  Bump   Days",
+        "-" * (width + 56),
+    ]
+    for r in data["releases"]:
+        days = f"{r['days_since_previous']:>6.1f}" if r["days_since_previous"] is not None else f"{'-':>6}"
+        lines.append(
+            f"{r['tag']:<{width}}  {r['date'] or '-':<10}  {r['commits']:>7}  {r['bumps']['major']:>5}  "
+            f"{r['bumps']['minor']:>5}  {r['bumps']['patch']:>5}  {r['bump'] or '-':<5}  {days}"
+        )
+    lines.append("-" * (width + 56))
+    lines.append(f"{data['commits']} commits, {sum(1 for r in data['releases'] if r['tag'] != UNRELEASED)} releases")
+    for title, counts in (("Types", data["types"]), ("Scopes", data["scopes"])):
+        if counts:
+            lines.append(f"{title}: " + ", ".join(f"{name} {count}" for name, count in counts.items()))
+    return "\n".join(lines)
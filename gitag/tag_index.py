@@ -0,0 +1,52 @@
+import math
+import re
+from bisect import bisect_right, insort
+from typing import TYPE_CHECKING, Iterable, Optional
+
+if TYPE_CHECKING:
+    from gitag.version_manager import VersionManager
+
+NUMERIC_IDENTIFIER = re.compile(r"^(0|[1-9]\d*)$")
+
+
+def needs_counter(pre: Optional[str]) -> bool:
+    """True for a bare pre-release label such as `rc`, whose number gitag fills in (`rc.4`)."""
+    return bool(pre) and not NUMERIC_IDENTIFIER.match(pre.rsplit(".", 1)[-1])
+
+
+class SemverIndex:
+    """Sorted index of numbered pre-release tags, keyed (major, minor, patch, label, number).
+
+    Built once from the tag names; finding the highest `<label>.N` of a version is a bisect,
+    so repositories with tens of thousands of nightly tags are not scanned per lookup.
+    """
+
+    def __init__(self, versioning: "VersionManager", tags: Iterable[str] = ()):
+        self.versioning = versioning
+        self._pattern = re.compile(versioning.pattern)
+        self.keys: list[tuple] = sorted(filter(None, map(self._key, tags)))
+
+    def _key(self, tag: str) -> Optional[tuple]:
+        match = self._pattern.fullmatch(self.versioning.strip_prefix_suffix(tag))
+        if not match or not match.groupdict().get("prerelease"):
+            return None
+        label, _, number = match.group("prerelease").rpartition(".")
+        if not label or not NUMERIC_IDENTIFIER.match(number):
+            return None
+        return int(match.group("major")), int(match.group("minor")), int(match.group("patch")), label, int(number)
+
+    def add(self, tag: str):
+        key = self._key(tag)
+        if key:
+            insort(self.keys, key)
+
+    def latest_number(self, core: tuple[int, int, int], label: str) -> Optional[int]:
+        """Highest N among `<core>-<label>.N` tags, or None if there is none."""
+        i = bisect_right(self.keys, (*core, label, math.inf))
+        if i and self.keys[i - 1][:4] == (*core, label):
+            return self.keys[i - 1][4]
+        return None
+
+    def next_pre(self, core: tuple[int, int, int], label: str) -> str:
+        latest = self.latest_number(core, label)
+        return f"{label}.{1 if latest is None else latest + 1}"
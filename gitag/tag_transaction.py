@@ -0,0 +1,117 @@
+import logging
+import re
+import subprocess
+import time
+from typing import Optional
+
+from gitag.utils.git_cmd import run_git
+
+logger = logging.getLogger(__name__)
+
+# stderr fragments of `git push` failures worth retrying (network / server hiccups, not rejections)
+TRANSIENT_PUSH_ERRORS = re.compile(
+    r"could not resolve host|connection (reset|refused|timed out)|timed out|early eof|"
+    r"the remote end hung up unexpectedly|rpc failed|http (429|5\d\d)|returned error: (429|5\d\d)|"
+    r"temporary failure",
+    re.IGNORECASE,
+)
+
+# stderr fragments of a push rejected because the remote ref moved (lost race, stale lease)
+REJECTED_PUSH_ERRORS = re.compile(r"\[rejected\]|stale info|already exists", re.IGNORECASE)
+
+
+def is_push_rejection(error: subprocess.CalledProcessError) -> bool:
+    return bool(REJECTED_PUSH_ERRORS.search(error.stderr or ""))
+
+
+class TagTransaction:
+    """Create several tag refs atomically and push them in a single `git push --atomic`.
+
+    Lightweight tags are written through one `git update-ref --stdin` transaction, so either every
+    ref is created/moved or none is. Tags added with `force=True` are moved if they already exist
+    (e.g. floating `v1` / `v1.4` tags next to `v1.4.2`).
+    """
+
+    def __init__(self, cwd: Optional[str] = None, remote: str = "origin", retries: int = 3, backoff: float = 1.0):
+        self.cwd = cwd
+        self.remote = remote
+        self.retries = retries
+        self.backoff = backoff
+        self._tags: dict[str, tuple[str, bool]] = {}
+        self.resolved: dict[str, str] = {}
+
+    def add(self, tag: str, target: str = "HEAD", force: bool = False) -> "TagTransaction":
+        self._tags[tag] = (target, force)
+        return self
+
+    @property
+    def tags(self) -> list[str]:
+        return list(self._tags)
+
+    def _resolve_targets(self) -> dict[str, str]:
+        # One `cat-file --batch-check` resolves every target, peeling annotated tags to commits
+        targets = sorted({target for target, _ in self._tags.values()})
+        result = run_git(
+            ["git", "cat-file", "--batch-check=%(objectname) %(objecttype)"],
+            input="".join(f"{t}^{{commit}}\n" for t in targets),
+            cwd=self.cwd,
+        )
+        shas = {}
+        for target, line in zip(targets, result.stdout.splitlines()):
+            sha, _, kind = line.partition(" ")
+            if kind != "commit":
+                raise ValueError(f"Cannot resolve tag target '{target}' to a commit")
+            shas[target] = sha
+        return shas
+
+    def commit(self) -> dict[str, str]:
+        """Write all refs in one transaction; returns tag -> commit SHA."""
+        if not self._tags:
+            return {}
+
+        shas = self._resolve_targets()
+        lines = []
+        for tag, (target, force) in self._tags.items():
+            verb = "update" if force else "create"
+            lines.append(f"{verb} refs/tags/{tag} {shas[target]}")
+            self.resolved[tag] = shas[target]
+
+        run_git(["git", "update-ref", "--stdin"], input="\n".join(lines) + "\n", cwd=self.cwd)
+        logger.debug(f"🏷️ Created {len(lines)} tag ref(s) in one transaction: {', '.join(self._tags)}")
+        return dict(self.resolved)
+
+    def rollback(self):
+        """Delete the refs written by `commit` (e.g. after a rejected push)."""
+        if not self.resolved:
+            return
+        lines = [f"delete refs/tags/{tag} {sha}" for tag, sha in self.resolved.items()]
+        run_git(["git", "update-ref", "--stdin"], input="\n".join(lines) + "\n", cwd=self.cwd)
+        self.resolved = {}
+
+    def refspecs(self) -> list[str]:
+        return [f"{'+' if force else ''}refs/tags/{tag}" for tag, (_, force) in self._tags.items()]
+
+    def push(self, extra_args: Optional[list[str]] = None, lease: bool = False):
+        """Push all tags atomically, retrying transient failures with exponential backoff.
+
+        With `lease=True` every non-forced tag is pushed with `--force-with-lease=<ref>:`, i.e. only if
+        the remote does not have it yet; a concurrent writer makes the whole push fail as a rejection.
+        """
+        if not self._tags:
+            return
+
+        lease_args = [f"--force-with-lease=refs/tags/{tag}:" for tag, (_, force) in self._tags.items() if not force]
+        cmd = ["git", "push", "--atomic", *(lease_args if lease else []), *(extra_args or []), self.remote]
+        cmd += self.refspecs()
+        for attempt in range(self.retries + 1):
+            try:
+                run_git(cmd, cwd=self.cwd)
+                logger.debug(f"🚀 Pushed {len(self._tags)} tag(s) to {self.remote} atomically.")
+                return
+            except subprocess.CalledProcessError as e:
+                # Atomic rejections also report a hung-up remote, so rule them out first
+                if attempt >= self.retries or is_push_rejection(e) or not TRANSIENT_PUSH_ERRORS.search(e.stderr or ""):
+                    raise
+                delay = self.backoff * (2**attempt)
+                logger.warning(f"⚠️ Push failed transiently, retrying in {delay:.1f}s ({attempt + 1}/{self.retries})")
+                time.sleep(delay)
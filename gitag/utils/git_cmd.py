@@ -0,0 +1,119 @@
+import os
+import subprocess
+from typing import Optional, Union
+
+from gitag.utils.timings import timed_run
+
+# gitag only reads history and writes refs: it never needs the optional index refresh (and its
+# `index.lock`) that status-like commands take, a pager, an interactive credential prompt or fsmonitor.
+GIT_ENV = {
+    "GIT_OPTIONAL_LOCKS": "0",  # Same as `git --no-optional-locks`
+    "GIT_TERMINAL_PROMPT": "0",  # Fail instead of waiting for credentials on a terminal
+    "GIT_PAGER": "cat",
+    "PAGER": "cat",
+}
+GIT_CONFIG = {"core.fsmonitor": "false"}  # Same as `git -c core.fsmonitor=false`
+
+LOCAL_TIMEOUT = 120.0  # Seconds; history and ref queries
+NETWORK_TIMEOUT = 600.0  # Seconds; commands that talk to a remote
+# Environment overrides of the two timeouts; `0` disables it (large clones, huge `git log -p` ranges)
+LOCAL_TIMEOUT_ENV = "GITAG_LOCAL_TIMEOUT"
+NETWORK_TIMEOUT_ENV = "GITAG_NETWORK_TIMEOUT"
+NETWORK_COMMANDS = {"clone", "fetch", "ls-remote", "push"}
+
+
+class GitTimeout(subprocess.CalledProcessError):
+    """A git command killed after its timeout; a `CalledProcessError` so callers handle it like any failure."""
+
+    def __init__(self, cmd: list[str], timeout: float, stdout=None, stderr=None):
+        super().__init__(-9, cmd, decode(stdout), decode(stderr))
+        self.timeout = timeout
+
+    def __str__(self) -> str:
+        return f"Command '{self.cmd}' timed out after {self.timeout:g}s"
+
+
+def git_env(env: Optional[dict] = None) -> dict:
+    """`env` (default: the current environment) with gitag's git settings applied.
+
+    Config overrides go through `GIT_CONFIG_COUNT`/`GIT_CONFIG_KEY_n`/`GIT_CONFIG_VALUE_n`, appended after
+    any the caller already set, so argv stays exactly the git command being run.
+    """
+    result = {**(os.environ if env is None else env), **GIT_ENV}
+    try:
+        count = int(result.get("GIT_CONFIG_COUNT", 0))
+    except ValueError:
+        count = 0
+    for key, value in GIT_CONFIG.items():
+        result[f"GIT_CONFIG_KEY_{count}"] = key
+        result[f"GIT_CONFIG_VALUE_{count}"] = value
+        count += 1
+    result["GIT_CONFIG_COUNT"] = str(count)
+    return result
+
+
+def default_timeout(cmd: list[str]) -> Optional[float]:
+    """Seconds `cmd` may run before it is killed, or None for no limit.
+
+    Network commands default to `NETWORK_TIMEOUT` and everything else to `LOCAL_TIMEOUT`; the
+    `GITAG_NETWORK_TIMEOUT`/`GITAG_LOCAL_TIMEOUT` environment variables override them, `0` meaning no limit.
+    """
+    if len(cmd) > 1 and cmd[1] in NETWORK_COMMANDS:
+        name, default = NETWORK_TIMEOUT_ENV, NETWORK_TIMEOUT
+    else:
+        name, default = LOCAL_TIMEOUT_ENV, LOCAL_TIMEOUT
+    value = os.environ.get(name, "").strip()
+    if not value:
+        return default
+    try:
+        seconds = float(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number of seconds, got {value!r}") from None
+    if seconds < 0:
+        raise ValueError(f"{name} must not be negative, got {value!r}")
+    return seconds or None
+
+
+def decode(data: Union[bytes, str, None]) -> Optional[str]:
+    """Decode git output; commit messages are not guaranteed to be UTF-8, so undecodable bytes are replaced."""
+    if isinstance(data, bytes):
+        return data.decode("utf-8", errors="replace")
+    return data
+
+
+def run_git(
+    cmd: list[str],
+    cwd: Optional[str] = None,
+    env: Optional[dict] = None,
+    input: Union[bytes, str, None] = None,
+    capture: bool = True,
+    check: bool = True,
+    timeout: Optional[float] = None,
+    text: bool = True,
+) -> subprocess.CompletedProcess:
+    """Run one git command through `timed_run` with gitag's environment and a timeout.
+
+    Output is captured as bytes and only `stdout`/`stderr` of the result (or of a raised
+    `CalledProcessError`) are decoded; `text=False` leaves `stdout` as bytes for callers that
+    parse it themselves. With `capture=False` git writes to the terminal as usual.
+    """
+    if isinstance(input, str):
+        input = input.encode()
+    timeout = default_timeout(cmd) if timeout is None else timeout
+    try:
+        result = timed_run(
+            cmd, cwd=cwd, env=git_env(env), input=input, capture_output=capture, check=check, timeout=timeout
+        )
+    except subprocess.TimeoutExpired as e:
+        raise GitTimeout(cmd, timeout, e.output, e.stderr) from None
+    except subprocess.CalledProcessError as e:
+        e.output, e.stderr = decode(e.output), decode(e.stderr)
+        raise
+    if result is not None and capture:
+        result.stdout, result.stderr = decode(result.stdout) if text else result.stdout, decode(result.stderr)
+    return result
+
+
+def popen_git(cmd: list[str], cwd: Optional[str] = None, env: Optional[dict] = None, **kwargs) -> subprocess.Popen:
+    """Start a git command with gitag's environment; pipes are bytes, decode lines with `decode`."""
+    return subprocess.Popen(cmd, cwd=cwd, env=git_env(env), **kwargs)
@@ -2,9 +2,9 @@ import logging
 import sys
 
 
-def setup_logging(debug: bool = False):
-    """Set up clean and aligned logging for CLI output."""
-    handler = logging.StreamHandler(sys.stdout)
+def setup_logging(debug: bool = False, stream=None):
+    """Set up clean and aligned logging for CLI output (stdout unless another `stream` is given)."""
+    handler = logging.StreamHandler(stream or sys.stdout)
 
     formatter = logging.Formatter(fmt="%(levelname)-5s: %(message)s")
     handler.setFormatter(formatter)
@@ -0,0 +1,106 @@
+import json
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+_active: ContextVar[Optional["Timings"]] = ContextVar("gitag_timings", default=None)
+
+
+class Timings:
+    """Collects wall time per phase and every git subprocess (argv, duration, exit code) of a run."""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.phases: list[dict] = []
+        self.commands: list[dict] = []
+
+    def _offset(self, moment: float) -> float:
+        return round(moment - self.origin, 6)
+
+    def add_phase(self, name: str, start: float, end: float):
+        self.phases.append({"name": name, "start": self._offset(start), "duration": round(end - start, 6)})
+
+    def add_command(self, argv: list[str], start: float, end: float, returncode: Optional[int]):
+        self.commands.append(
+            {
+                "argv": [str(arg) for arg in argv],
+                "start": self._offset(start),
+                "duration": round(end - start, 6),
+                "returncode": returncode if isinstance(returncode, int) else None,
+            }
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "total": self._offset(time.perf_counter()),
+            "phases": self.phases,
+            "commands": self.commands,
+            "summary": {
+                "git_commands": len(self.commands),
+                "git_time": round(sum(c["duration"] for c in self.commands), 6),
+            },
+        }
+
+    def write(self, path: str = "-"):
+        """Write the report as JSON to `path`, or to stderr for "-"."""
+        report = json.dumps(self.to_dict(), indent=2) + "\n"
+        if path == "-":
+            sys.stderr.write(report)
+        else:
+            with open(path, "w") as f:
+                f.write(report)
+
+
+@contextmanager
+def activate(timings: Optional[Timings]):
+    token = _active.set(timings)
+    try:
+        yield timings
+    finally:
+        _active.reset(token)
+
+
+def current() -> Optional[Timings]:
+    return _active.get()
+
+
+@contextmanager
+def phase(name: str):
+    timings = _active.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings.add_phase(name, start, time.perf_counter())
+
+
+def record_phase(name: str, start: float):
+    """Record a phase that started at `start` (perf_counter) and ends now, e.g. a background fetch."""
+    timings = _active.get()
+    if timings is not None:
+        timings.add_phase(name, start, time.perf_counter())
+
+
+def record_command(argv: list[str], start: float, returncode: Optional[int]):
+    timings = _active.get()
+    if timings is not None:
+        timings.add_command(argv, start, time.perf_counter(), returncode)
+
+
+def timed_run(cmd: list[str], **kwargs):
+    """`subprocess.run` that reports the command to the active `Timings`, if any."""
+    start = time.perf_counter()
+    returncode = None
+    try:
+        result = subprocess.run(cmd, **kwargs)
+        returncode = getattr(result, "returncode", None)
+        return result
+    except subprocess.CalledProcessError as e:
+        returncode = e.returncode
+        raise
+    finally:
+        record_command(cmd, start, returncode)
@@ -1,14 +1,31 @@
 import logging
 import re
+import time
 import tomllib
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Callable, Iterable, Iterator, Mapping, Optional, Union
 
+from gitag.commit_store import CommitStore
 from gitag.config import DEFAULT_LEVELS, DEFAULT_VERSION_PATTERN, BumpLevel, MergeStrategy
-from gitag.config_validator import validate_config
+from gitag.config_validator import backtracking_risk, validate_config
+from gitag.describe import semver_key
+from gitag.tag_index import SemverIndex, needs_counter
 
 logger = logging.getLogger(__name__)
 
+MAX_SUBJECT_LENGTH = 1000
+MAX_BODY_LENGTH = 10000
+CLASSIFICATION_BUDGET = 30.0
+
+# Bytes where str and bytes regexes differ (`\s` and `str.strip` also cover \x1c-\x1f); such messages are decoded
+NEEDS_DECODING = re.compile(rb"[\x1c-\x1f\x80-\xff]")
+ASCII_WHITESPACE = frozenset(b" \t\n\r\x0b\x0c")
+NEWLINE = re.compile(rb"\n")
+
+
+class ClassificationBudgetExceeded(RuntimeError):
+    """Classifying the commits of one run took longer than `classification_budget`."""
+
 
 class VersionManager:
     def __init__(self, config_path: Optional[str] = None):
@@ -17,9 +34,13 @@ class VersionManager:
         self.suffix = ""
         self.patterns = {}
         self.merge_strategy = MergeStrategy.AUTO
+        self.backend = "subprocess"
+        self.max_subject_length = MAX_SUBJECT_LENGTH  # Text each pattern sees, so no message costs unbounded time
+        self.max_body_length = MAX_BODY_LENGTH
+        self.classification_budget = CLASSIFICATION_BUDGET  # Seconds per classification pass (0 = unlimited)
 
-        config_path = config_path or "pyproject.toml"
-        self.load_config_from_pyproject(config_path)
+        self.config_path = config_path or "pyproject.toml"
+        self.load_config_from_pyproject(self.config_path)
 
     def load_config_from_pyproject(self, config_path: str):
         config: dict = {}
@@ -66,6 +87,12 @@ class VersionManager:
 
         # Merge strategy
         self.merge_strategy = MergeStrategy(config.get("merge_strategy", "auto").lower())
+        self.backend = config.get("backend", "subprocess")
+
+        # Classification limits
+        self.max_subject_length = config.get("max_subject_length", MAX_SUBJECT_LENGTH)
+        self.max_body_length = config.get("max_body_length", MAX_BODY_LENGTH)
+        self.classification_budget = config.get("classification_budget", CLASSIFICATION_BUDGET)
 
         # Set bump strategy
         self.strategy = self.regex_bump_strategy
@@ -77,32 +104,128 @@ class VersionManager:
             for error in validation_errors:
                 logger.warning(f" - {error}")
 
-    def regex_bump_strategy(self, msg: str) -> BumpLevel:
-        msg = msg.strip()
-        # Check in the order MAJOR (0), MINOR (1), PATCH (2)
+    @property
+    def patterns(self) -> dict[str, list[str]]:
+        return self._config.get("patterns", {})
+
+    @patterns.setter
+    def patterns(self, value: dict[str, list[str]]):
+        self._config["patterns"] = value
+        self._compiled = self._compile_patterns(value)
+        self._compiled_raw = self._compile_raw(self._compiled)
+
+    @staticmethod
+    def _compile_patterns(patterns: dict[str, list[str]]) -> list[tuple[BumpLevel, list[re.Pattern]]]:
+        """Compile once per config, checking in the order MAJOR (0), MINOR (1), PATCH (2).
+
+        Invalid regexes are matched as plain text and patterns that can backtrack exponentially
+        are dropped; `validate_config` reports both once at load instead of on every commit.
+        """
+        compiled = []
         for level in sorted(BumpLevel, key=lambda lvl: lvl.value):
-            for pattern in self.patterns.get(level.name.lower(), []):
+            level_patterns = []
+            for pattern in patterns.get(level.name.lower(), []):
+                if not isinstance(pattern, str) or not pattern or backtracking_risk(pattern):
+                    continue
                 try:
                     # Case-sensitive regex match (inline (?i) still works)
-                    if re.search(pattern, msg):
-                        return level
-                except re.error as e:
-                    # Invalid regex → as simple substring check
-                    logger.error(f"❌ Invalid regex '{pattern}': {e}")
-                    if pattern and pattern in msg:
-                        return level
+                    level_patterns.append(re.compile(pattern))
+                except re.error:
+                    level_patterns.append(re.compile(re.escape(pattern)))
+            compiled.append((level, level_patterns))
+        return compiled
+
+    @staticmethod
+    def _compile_raw(compiled: list[tuple[BumpLevel, list[re.Pattern]]]) -> Optional[list]:
+        """Bytes twins of the compiled patterns, or None if a pattern is not plain ASCII (then bytes are decoded)."""
+        try:
+            return [(level, [re.compile(p.pattern.encode("ascii")) for p in patterns]) for level, patterns in compiled]
+        except (UnicodeEncodeError, re.error):
+            return None
+
+    def raw_bump_strategy(self, msg: Union[bytes, memoryview]) -> BumpLevel:
+        """`regex_bump_strategy` for a message as bytes, e.g. a view into git's output.
+
+        ASCII messages are matched by bytes patterns without being decoded; for them str and bytes
+        regexes agree, so the result is the same. Anything else is decoded and classified as text.
+        """
+        if self._compiled_raw is None or NEEDS_DECODING.search(msg):
+            return self.regex_bump_strategy(str(msg, "utf-8", "replace"))
+        view = memoryview(msg)
+        start, end = 0, len(view)
+        while start < end and view[start] in ASCII_WHITESPACE:
+            start += 1
+        while end > start and view[end - 1] in ASCII_WHITESPACE:
+            end -= 1
+        text = view[start:end]
+        newline = NEWLINE.search(text)
+        if newline:
+            subject, body = text[: newline.start()], text[newline.end() :]
+            text = bytes(subject[: self.max_subject_length]) + b"\n" + bytes(body[: self.max_body_length])
+        else:
+            text = text[: self.max_subject_length]
+        for level, patterns in self._compiled_raw:
+            for pattern in patterns:
+                if pattern.search(text):
+                    return level
+        return BumpLevel.PATCH
+
+    def regex_bump_strategy(self, msg: str) -> BumpLevel:
+        subject, newline, body = msg.strip().partition("\n")
+        text = subject[: self.max_subject_length] + newline + body[: self.max_body_length]
+        for level, patterns in self._compiled:
+            for pattern in patterns:
+                if pattern.search(text):
+                    return level
         # No pattern match → Patch
         return BumpLevel.PATCH
 
+    def classify(self, commits: Iterable[str]) -> Iterator[tuple[str, BumpLevel]]:
+        """Yield (message, level) pairs, enforcing the per-run `classification_budget`.
+
+        The budget is checked between messages, so it bounds a pass but cannot interrupt one slow
+        match; single matches are bounded by rejecting exponential patterns at load (`backtracking_risk`)
+        and by `max_subject_length`/`max_body_length`.
+        Messages may also be bytes or memoryviews; the default strategy then matches them undecoded.
+        """
+        spent, budget = 0.0, self.classification_budget
+        strategy = self.strategy
+        if strategy == self.regex_bump_strategy:
+            raw_strategy = self.raw_bump_strategy
+        else:
+            raw_strategy = lambda msg: strategy(str(msg, "utf-8", "replace"))  # noqa: E731
+        for count, msg in enumerate(commits, 1):
+            start = time.perf_counter()
+            level = strategy(msg) if isinstance(msg, str) else raw_strategy(msg)
+            spent += time.perf_counter() - start
+            if budget and spent > budget:
+                raise ClassificationBudgetExceeded(
+                    f"Classifying commits exceeded the {budget:g}s budget after {count} messages; "
+                    "simplify [tool.gitag.patterns] or raise `classification_budget`."
+                )
+            yield msg, level
+
     def determine_bump(self, commits: list[str]) -> BumpLevel:
+        if isinstance(commits, CommitStore):
+            best_level = commits.classify(self)
+            return BumpLevel.PATCH if best_level is None else best_level
         if not isinstance(commits, list) or not all(isinstance(c, str) for c in commits):
             raise TypeError("commits must be a list of strings")
 
-        best_level = BumpLevel.PATCH
-        for msg in commits:
-            result = self.strategy(msg)
-            if result.value < best_level.value:
+        best_level = self.highest_bump(commits)
+        return BumpLevel.PATCH if best_level is None else best_level
+
+    def highest_bump(self, commits: Iterable[str]) -> Optional[BumpLevel]:
+        """Highest bump level among `commits` (None if there are none).
+
+        Stops consuming `commits` at the first MAJOR, so streamed histories are only read as far as needed.
+        """
+        best_level = None
+        for _, result in self.classify(commits):
+            if best_level is None or result.value < best_level.value:
                 best_level = result
+                if best_level == BumpLevel.MAJOR:
+                    break
         return best_level
 
     def strip_prefix_suffix(self, version: str) -> str:
@@ -112,9 +235,29 @@ class VersionManager:
             version = version[: -len(self.suffix)]
         return version
 
+    def version_key(self, tag: str) -> Optional[tuple]:
+        """SemVer sort key of `tag`, or None if it does not match the version pattern."""
+        match = re.fullmatch(self.pattern, self.strip_prefix_suffix(tag))
+        if not match:
+            return None
+        core = ".".join(match.group(part) for part in ("major", "minor", "patch"))
+        pre = match.groupdict().get("prerelease")
+        return semver_key(f"{core}-{pre}" if pre else core)
+
     def bump_version(
-        self, current_version: str, level: BumpLevel, pre: Optional[str] = None, build: Optional[str] = None
+        self,
+        current_version: str,
+        level: BumpLevel,
+        pre: Optional[str] = None,
+        build: Optional[str] = None,
+        pre_index: Optional[SemverIndex] = None,
     ) -> str:
+        """Next version after `current_version`.
+
+        With `pre_index`, a bare `pre` label (e.g. `rc`) is numbered one past the highest existing
+        pre-release of the new version (`rc.1`, `rc.2`, ...). A pre-release `current_version` then
+        continues its series: its core version is unreleased, so only a bump beyond it moves it.
+        """
         if isinstance(level, str):
             try:
                 level = BumpLevel[level.upper()]
@@ -131,7 +274,15 @@ class VersionManager:
         minor = int(match.group("minor"))
         patch = int(match.group("patch"))
 
-        if level == BumpLevel.MAJOR:
+        counted = pre_index is not None and needs_counter(pre)
+        if counted and match.groupdict().get("prerelease"):
+            if level == BumpLevel.MAJOR and (minor or patch):
+                major += 1
+                minor = patch = 0
+            elif level == BumpLevel.MINOR and patch:
+                minor += 1
+                patch = 0
+        elif level == BumpLevel.MAJOR:
             major += 1
             minor = patch = 0
         elif level == BumpLevel.MINOR:
@@ -141,6 +292,8 @@ class VersionManager:
             patch += 1
 
         version = f"{major}.{minor}.{patch}"
+        if counted:
+            pre = pre_index.next_pre((major, minor, patch), pre)
         if pre:
             version += f"-{pre}"
         if build:
@@ -148,10 +301,20 @@ class VersionManager:
 
         return f"{self.prefix}{version}{self.suffix}"
 
-    def categorize_commits(self, commits: list[str]) -> dict[str, list[str]]:
+    def categorize_commits(
+        self, commits: list[str], duplicates: Optional[Mapping[str, int]] = None
+    ) -> dict[str, list[str]]:
+        """Changelog sections by level name; `duplicates` maps a subject to how many of its occurrences
+        to leave out (see `GitRepo.duplicate_subjects`)."""
+        if isinstance(commits, CommitStore) and not duplicates:
+            commits.classify(self)
+            return commits.categorized()  # Lazy sections over the store; nothing is copied
+        skip = dict(duplicates or {})
         categorized = {str(level): [] for level in DEFAULT_LEVELS}
-        for msg in commits:
-            level = self.strategy(msg)
+        for msg, level in self.classify(commits):
+            if skip.get(msg):
+                skip[msg] -= 1
+                continue
             categorized[str(level)].append(msg)
         return categorized
 
@@ -0,0 +1,275 @@
+import ctypes
+import ctypes.util
+import json
+import logging
+import os
+import select
+import struct
+import subprocess
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Optional
+
+from gitag.config import BumpLevel, MergeStrategy
+from gitag.git_repo import GitRepo
+from gitag.next_version import resolve_base_tag
+from gitag.refs import common_dir, refs_fingerprint
+from gitag.version_manager import VersionManager
+
+logger = logging.getLogger(__name__)
+
+NO_COMMITS = "no commits yet"
+
+# inotify(7) constants
+IN_MODIFY = 0x002
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+REF_EVENTS = IN_MODIFY | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+class PollingWatcher:
+    """Detects ref changes by comparing `refs_fingerprint` every `interval` seconds."""
+
+    name = "polling"
+
+    def __init__(self, git_dir: Path, interval: float = 1.0):
+        self.git_dir = git_dir
+        self.interval = interval
+        self._fingerprint = refs_fingerprint(git_dir)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until HEAD or a ref changes (True) or `timeout` seconds pass (False)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            fingerprint = refs_fingerprint(self.git_dir)
+            if fingerprint != self._fingerprint:
+                self._fingerprint = fingerprint
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(self.interval if deadline is None else max(min(self.interval, deadline - time.monotonic()), 0))
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify watches on the git dir (for HEAD, packed-refs) and every directory under refs/.
+
+    Loaded through ctypes, so no extra dependency is needed; `InotifyWatcher.available()` is False
+    elsewhere and `create_watcher` falls back to polling.
+    """
+
+    name = "inotify"
+
+    def __init__(self, git_dir: Path):
+        self.git_dir = git_dir
+        self.refs_root = common_dir(git_dir)
+        self._libc = _libc()
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: dict[int, Path] = {}
+        self._add(git_dir)
+        self._add(self.refs_root)
+        self._add_refs()
+
+    @staticmethod
+    def available() -> bool:
+        libc = _libc()
+        return libc is not None and hasattr(libc, "inotify_init1")
+
+    def _add(self, path: Path):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), REF_EVENTS)
+        if wd >= 0:
+            self._dirs[wd] = path
+
+    def _add_refs(self):
+        # New ref namespaces (refs/tags/release/...) create directories that need their own watch
+        for root, _, _ in os.walk(self.refs_root / "refs"):
+            if Path(root) not in self._dirs.values():
+                self._add(Path(root))
+
+    def _relevant(self, data: bytes) -> bool:
+        relevant, offset = False, 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, _, _, length = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size : offset + EVENT_HEADER.size + length].rstrip(b"\0").decode()
+            offset += EVENT_HEADER.size + length
+            directory = self._dirs.get(wd)
+            if directory in (self.git_dir, self.refs_root) and name not in ("HEAD", "packed-refs"):
+                continue  # index, objects/, FETCH_HEAD, ... do not change refs
+            relevant = True
+        return relevant
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if not ready:
+                return False
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            if self._relevant(data):
+                self._add_refs()
+                return True
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def _libc() -> Optional[ctypes.CDLL]:
+    try:
+        return ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    except OSError:
+        return None
+
+
+def create_watcher(git_dir: Path, polling: bool = False, interval: float = 1.0):
+    if not polling and InotifyWatcher.available():
+        try:
+            return InotifyWatcher(git_dir)
+        except OSError as e:
+            logger.debug(f"inotify unavailable ({e}); polling refs.")
+    return PollingWatcher(git_dir, interval=interval)
+
+
+class PendingVersion:
+    """Next version of a repository, kept up to date one ref change at a time.
+
+    When HEAD moves forward on top of the state already computed (same base tag, old HEAD an
+    ancestor of the new one), only the new commits are read and classified; bump levels are kept
+    as counts, so the result is updated without re-reading the range. Anything else (a new tag,
+    a reset, a branch switch, a merge that changes the range of `auto`/`merge_only`) recomputes.
+    """
+
+    def __init__(self, repo: GitRepo, versioning: VersionManager):
+        self.repo = repo
+        self.versioning = versioning
+        self.base_tag: Optional[str] = None
+        self.head: Optional[str] = None
+        self.incremental = False  # Whether the counted commits are the whole `base_tag..head` range
+        self.levels: Counter = Counter()
+        self.unborn = False  # `rev` had no commit at the last refresh
+
+    def reset(self):
+        """Forget the computed state, so the next refresh reads the whole range."""
+        self.base_tag, self.head, self.incremental, self.levels = None, None, False, Counter()
+
+    def failure(self, error: str) -> dict:
+        return {"next_version": None, "base_tag": None, "bump": None, "commits": 0, "head": None, "error": error}
+
+    def _new_commits(self, head: str, base_tag: Optional[str]) -> Optional[list[str]]:
+        """Subjects of commits added since the last update, or None if HEAD did not just move forward."""
+        if not (self.incremental and self.head and base_tag == self.base_tag):
+            return None
+        exclude = [self.head, base_tag] if base_tag else [self.head]
+        commits = list(self.repo.backend.walk([head], exclude))
+        if not any(self.head in commit.parents for commit in commits):
+            return None
+        return [c.subject for c in commits if self.repo.include_merges or len(c.parents) < 2]
+
+    def refresh(self) -> Optional[dict]:
+        """Recompute after a ref change; returns the new result, or None if HEAD and base tag are unchanged.
+
+        Git failures raise `CalledProcessError`; `watch` reports them and keeps going.
+        """
+        try:
+            head = self.repo.backend.resolve(self.repo.rev)
+        except subprocess.CalledProcessError:
+            head = None
+        if not head:  # Unborn branch: a fresh repository, `checkout --orphan` or a deleted branch
+            if self.unborn:
+                return None
+            self.reset()
+            self.unborn = True
+            return self.failure(NO_COMMITS)
+        self.unborn = False
+
+        base_tag = resolve_base_tag(self.repo)
+        if self.head is not None and (head, base_tag) == (self.head, self.base_tag):
+            return None
+
+        head_parents = self.repo.get_head_parents()
+        range_is_tag = self.repo.merge_strategy != MergeStrategy.FIRST_PARENT and not (
+            head_parents and len(head_parents) >= 2
+        )
+        new = self._new_commits(head, base_tag) if range_is_tag else None
+        if new is None:
+            logger.debug(f"Recomputing pending version for {base_tag or 'root'}..{head[:12]}.")
+            self.levels = Counter()
+            new = self.repo.get_commit_messages(since_tag=base_tag)
+        else:
+            logger.debug(f"{len(new)} new commit(s) on top of {self.head[:12]}.")
+        self.levels.update(level for _, level in self.versioning.classify(new))
+        self.base_tag, self.head, self.incremental = base_tag, head, range_is_tag
+        return self.result()
+
+    def result(self) -> dict:
+        bump: Optional[BumpLevel] = min(self.levels, default=None)
+        next_version = None
+        if bump is not None:
+            next_version = self.versioning.bump_version(self.base_tag or self.versioning.get_default_version(), bump)
+        return {
+            "next_version": next_version,
+            "base_tag": self.base_tag,
+            "bump": str(bump) if bump is not None else None,
+            "commits": sum(self.levels.values()),
+            "head": self.head,
+        }
+
+
+def write_result(result: dict, path: str):
+    """Replace `path` atomically, so dashboards never read a half-written file."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(json.dumps(result, indent=2) + "\n")
+    os.replace(tmp, path)
+
+
+def watch(
+    pending: PendingVersion,
+    watcher,
+    on_result: Callable[[dict], None],
+    debounce: float = 0.2,
+    updates: Optional[int] = None,
+):
+    """Report the pending version now and after every ref change, `updates` times (forever if None).
+
+    A failed refresh is reported as a result with an `error` and watching continues; the next
+    ref change recomputes from scratch.
+    """
+    on_result(_refresh(pending))
+    reported = 1
+    while updates is None or reported < updates:
+        if not watcher.wait():
+            continue
+        time.sleep(debounce)  # A commit or fetch touches several refs; settle before reading them
+        while watcher.wait(timeout=0):
+            pass
+        result = _refresh(pending)
+        if result is not None:
+            on_result(result)
+            reported += 1
+
+
+def _refresh(pending: PendingVersion) -> Optional[dict]:
+    try:
+        return pending.refresh()
+    except subprocess.CalledProcessError as e:
+        error = (e.stderr or "").strip() or str(e)
+    except SystemExit:  # GitRepo logs and exits when reading the log fails
+        error = "could not read commits"
+    pending.reset()
+    logger.warning(f"⚠️ git failed, still watching: {error}")
+    return pending.failure(f"git failed: {error}")
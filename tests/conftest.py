@@ -0,0 +1,63 @@
+import logging
+import os
+import subprocess
+from pathlib import Path
+from typing import Optional
+from unittest import mock
+
+import pytest
+
+
+def git(cwd, *args, env: Optional[dict] = None) -> str:
+    """Run git in `cwd`; returns its stripped stdout."""
+    return subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=True, env=env).stdout.strip()
+
+
+def commit(cwd, message: str, date: Optional[str] = None):
+    """Empty commit; `date` (ISO 8601) pins its author and committer dates."""
+    env = {**os.environ, "GIT_AUTHOR_DATE": date, "GIT_COMMITTER_DATE": date} if date else None
+    git(cwd, "commit", "-q", "--allow-empty", "-m", message, env=env)
+
+
+def init_repo(path: Path) -> Path:
+    """Empty repository at `path` on branch main, with a committer identity."""
+    path.mkdir()
+    git(path, "init", "-q", "-b", "main")
+    git(path, "config", "user.email", "test@example.com")
+    git(path, "config", "user.name", "Tester")
+    return path
+
+
+@pytest.fixture(autouse=True)
+def restore_logging():
+    # CLI commands reconfigure the "gitag" logger; keep other tests unaffected
+    gitag_logger = logging.getLogger("gitag")
+    level, handlers = gitag_logger.level, gitag_logger.handlers[:]
+    yield
+    gitag_logger.setLevel(level)
+    gitag_logger.handlers = handlers
+
+
+@pytest.fixture
+def no_background_fetch():
+    with mock.patch("gitag.git_repo.GitRepo.start_tag_fetch", return_value=None):
+        yield
+
+
+@pytest.fixture
+def merged_back(tmp_path):
+    """v1.1.0 is three commits past v1.0.0 on main; a later backport v1.0.1 is merged back, then one fix."""
+    path = init_repo(tmp_path / "merged-back")
+    commit(path, "feat: first", date="2024-01-01T12:00:00+00:00")
+    git(path, "tag", "v1.0.0")
+    git(path, "branch", "release/1.0")
+    for day in (2, 3, 4):
+        commit(path, f"feat: main {day}", date=f"2024-01-0{day}T12:00:00+00:00")
+    git(path, "tag", "v1.1.0")
+    git(path, "checkout", "-q", "release/1.0")
+    commit(path, "fix: backport", date="2024-01-05T12:00:00+00:00")
+    git(path, "tag", "v1.0.1")
+    git(path, "checkout", "-q", "main")
+    git(path, "merge", "-q", "--no-ff", "release/1.0", "-m", "Merge release/1.0")
+    commit(path, "fix: after merge")
+    return path
@@ -0,0 +1,120 @@
+import asyncio
+import os
+import subprocess
+from unittest import mock
+
+import pytest
+
+from gitag.async_git_repo import AsyncGitRepo
+from gitag.config import MergeStrategy
+
+
+def _commit(repo_path, name, message):
+    (repo_path / name).write_text(message)
+    subprocess.run(["git", "add", "."], cwd=repo_path, check=True)
+    subprocess.run(["git", "commit", "-q", "-m", message], cwd=repo_path, check=True)
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    repo_path = tmp_path / "repo"
+    repo_path.mkdir()
+    subprocess.run(["git", "init", "-q", "-b", "main"], cwd=repo_path, check=True)
+    subprocess.run(["git", "config", "user.email", "test@example.com"], cwd=repo_path, check=True)
+    subprocess.run(["git", "config", "user.name", "Tester"], cwd=repo_path, check=True)
+    return repo_path
+
+
+def test_latest_tag_and_commits(git_repo):
+    _commit(git_repo, "a.txt", "feat: first")
+    subprocess.run(["git", "tag", "v0.1.0"], cwd=git_repo, check=True)
+    _commit(git_repo, "b.txt", "fix: second")
+
+    repo = AsyncGitRepo(cwd=str(git_repo))
+    assert asyncio.run(repo.get_latest_tag()) == "v0.1.0"
+    assert asyncio.run(repo.get_commit_messages("v0.1.0")) == ["fix: second"]
+
+
+def test_merge_commit_uses_feature_range(git_repo):
+    _commit(git_repo, "a.txt", "chore: init")
+    subprocess.run(["git", "checkout", "-q", "-b", "feature"], cwd=git_repo, check=True)
+    _commit(git_repo, "b.txt", "feat: on branch")
+    subprocess.run(["git", "checkout", "-q", "main"], cwd=git_repo, check=True)
+    _commit(git_repo, "c.txt", "fix: on main")
+    subprocess.run(["git", "merge", "-q", "--no-edit", "feature"], cwd=git_repo, check=True)
+
+    repo = AsyncGitRepo(cwd=str(git_repo), merge_strategy=MergeStrategy.AUTO)
+    parents = asyncio.run(repo.get_head_parents())
+    assert len(parents) == 2
+    assert asyncio.run(repo.get_commit_messages(None, head_parents=parents)) == ["feat: on branch"]
+
+
+def test_get_head_parents_skipped_for_always():
+    repo = AsyncGitRepo(merge_strategy=MergeStrategy.ALWAYS)
+    assert asyncio.run(repo.get_head_parents()) is None
+
+
+def test_latest_tag_none_without_tags(git_repo):
+    repo = AsyncGitRepo(cwd=str(git_repo))
+    with mock.patch.object(repo, "_run", side_effect=subprocess.CalledProcessError(1, "git")):
+        assert asyncio.run(repo.get_latest_tag()) is None
+
+
+def test_latest_tag_fallback(git_repo):
+    async def fake_run(cmd):
+        if "describe" in cmd:
+            raise subprocess.CalledProcessError(128, cmd)
+        return "v9.9.9\n" if "tag" in cmd else ""
+
+    repo = AsyncGitRepo(cwd=str(git_repo))
+    with mock.patch.object(repo, "_run", side_effect=fake_run):
+        assert asyncio.run(repo.get_latest_tag()) == "v9.9.9"
+
+
+def test_create_tag_and_exists(git_repo):
+    _commit(git_repo, "a.txt", "feat: first")
+    repo = AsyncGitRepo(cwd=str(git_repo))
+
+    assert asyncio.run(repo.create_tag("v1.0.0", push=False)) is True
+    assert asyncio.run(repo.tag_exists("v1.0.0")) is True
+    assert asyncio.run(repo.create_tag("v1.0.0", push=False)) is False
+
+
+def test_create_tag_push_failure_raises(git_repo):
+    _commit(git_repo, "a.txt", "feat: first")
+    repo = AsyncGitRepo(cwd=str(git_repo))
+    with pytest.raises(subprocess.CalledProcessError):
+        asyncio.run(repo.create_tag("v1.0.0", push=True))  # no origin remote
+
+
+def test_tag_exists_outside_repo(tmp_path):
+    repo = AsyncGitRepo(cwd=str(tmp_path))
+    assert asyncio.run(repo.tag_exists("v1.0.0")) is False
+
+
+def test_get_commit_messages_raises_on_error(tmp_path, caplog):
+    caplog.set_level("DEBUG")
+    repo = AsyncGitRepo(debug=True, cwd=str(tmp_path), merge_strategy=MergeStrategy.ALWAYS)
+    with pytest.raises(subprocess.CalledProcessError):
+        asyncio.run(repo.get_commit_messages("v0.1.0"))
+    assert any("❌ Error" in msg for msg in caplog.messages)
+
+
+def test_configure_remote(monkeypatch):
+    monkeypatch.setenv("GH_TOKEN", "dummy-token")
+    monkeypatch.setenv("GITHUB_REPOSITORY", "user/repo")
+    repo = AsyncGitRepo()
+    with mock.patch.object(repo, "_run", new=mock.AsyncMock(return_value="")) as run:
+        asyncio.run(repo.configure_remote())
+    calls = [c[0][0] for c in run.call_args_list]
+    assert any("user.name" in c for c in calls)
+    assert any("set-url" in c for c in calls)
+
+
+def test_configure_remote_skips_without_token(monkeypatch):
+    monkeypatch.delenv("GH_TOKEN", raising=False)
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    repo = AsyncGitRepo()
+    with mock.patch.object(repo, "_run", new=mock.AsyncMock()) as run:
+        asyncio.run(repo.configure_remote())
+    run.assert_not_called()
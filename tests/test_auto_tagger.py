@@ -1,9 +1,16 @@
+import asyncio
+import subprocess
+import threading
 from unittest import mock
 
 import pytest
 
 from gitag.auto_tagger import GitAutoTagger
 
+from conftest import git, init_repo
+
+pytestmark = pytest.mark.usefixtures("no_background_fetch")
+
 
 def test_run_dry():
     tagger = GitAutoTagger(debug=True)
@@ -52,6 +59,21 @@ def test_run_with_changelog_written():
     tagger.changelog_writer.write.assert_called_once_with(tag="v1.0.1", categorized_commits={"feat": ["feat: x"]})
 
 
+def test_run_changelog_leaves_out_cherry_picks():
+    tagger = GitAutoTagger(changelog=True, dedup_cherry_picks=True)
+    tagger.repo.get_latest_tag = mock.Mock(return_value="v1.0.0")
+    tagger.repo.get_commit_messages = mock.Mock(return_value=["fix: a", "feat: b", "fix: a"])
+    tagger.repo.duplicate_subjects = mock.Mock(return_value={"fix: a": 1})
+    tagger.versioning.bump_version = mock.Mock(return_value="v1.1.0")
+    tagger.changelog_writer.write = mock.Mock()
+
+    tagger.run(dry_run=True)
+    tagger.repo.duplicate_subjects.assert_called_once_with("v1.0.0")
+    tagger.changelog_writer.write.assert_called_once_with(
+        tag="v1.1.0", categorized_commits={"major": [], "minor": ["feat: b"], "patch": ["fix: a"]}
+    )
+
+
 def test_run_creates_tag_and_prints_success(caplog):
     tagger = GitAutoTagger(debug=True)
     tagger.repo.get_latest_tag = mock.Mock(return_value="v1.0.0")
@@ -91,3 +113,243 @@ def test_run_without_previous_tag_uses_default(caplog):
         tagger.run()
         assert "No previous tag found" in caplog.text
         assert tagger.versioning.get_default_version.called
+
+
+def test_repo_path_and_shared_versioning(tmp_path):
+    shared = GitAutoTagger(debug=True).versioning
+    tagger = GitAutoTagger(repo_path=str(tmp_path), versioning=shared)
+    assert tagger.versioning is shared
+    assert tagger.repo.cwd == str(tmp_path)
+    assert tagger.changelog_writer.path == str(tmp_path / "CHANGELOG.md")
+
+
+def test_run_returns_new_tag():
+    tagger = GitAutoTagger(debug=True)
+    tagger.repo.get_latest_tag = mock.Mock(return_value="v1.0.0")
+    tagger.repo.get_commit_messages = mock.Mock(return_value=["fix: a"])
+    tagger.repo.create_tag = mock.Mock(return_value=True)
+    assert tagger.run() == "v1.0.1"
+    assert tagger.run(dry_run=True) == "v1.0.1"
+
+
+def _async_tagger(**kwargs):
+    tagger = GitAutoTagger(debug=True, **kwargs)
+    tagger.async_repo.get_latest_tag = mock.AsyncMock(return_value="v1.0.0")
+    tagger.async_repo.get_head_parents = mock.AsyncMock(return_value=["abc"])
+    tagger.async_repo.get_commit_messages = mock.AsyncMock(return_value=["feat: x"])
+    tagger.async_repo.create_tag = mock.AsyncMock(return_value=True)
+    return tagger
+
+
+def test_arun_creates_tag(caplog):
+    tagger = _async_tagger()
+    with caplog.at_level("INFO"):
+        assert asyncio.run(tagger.arun()) == "v1.1.0"
+    tagger.async_repo.get_commit_messages.assert_awaited_once_with(since_tag="v1.0.0", head_parents=["abc"])
+    tagger.async_repo.create_tag.assert_awaited_once_with("v1.1.0", False)
+    assert "Tag v1.1.0 created" in caplog.text
+
+
+def test_arun_dry_run_writes_changelog():
+    tagger = _async_tagger(changelog=True)
+    tagger.changelog_writer.write = mock.Mock()
+    assert asyncio.run(tagger.arun(dry_run=True, since_tag="v1.0.0")) == "v1.1.0"
+    tagger.async_repo.get_latest_tag.assert_not_awaited()
+    tagger.async_repo.create_tag.assert_not_awaited()
+    tagger.changelog_writer.write.assert_called_once()
+
+
+def test_arun_lists_tags_and_dedups_off_the_event_loop():
+    tagger = _async_tagger(changelog=True, pre="rc", dedup_cherry_picks=True)
+    tagger.changelog_writer.write = mock.Mock()
+    threads = []
+    tagger.repo.list_local_tags = mock.Mock(side_effect=lambda: threads.append(threading.current_thread()) or {})
+    tagger.repo.duplicate_subjects = mock.Mock(side_effect=lambda base: threads.append(threading.current_thread()))
+
+    assert asyncio.run(tagger.arun(dry_run=True)) == "v1.1.0-rc.1"
+    assert len(threads) == 2 and threading.main_thread() not in threads
+
+
+def test_arun_without_tag_or_commits(caplog):
+    tagger = _async_tagger()
+    tagger.async_repo.get_latest_tag = mock.AsyncMock(return_value=None)
+    tagger.async_repo.get_commit_messages = mock.AsyncMock(return_value=[])
+    with caplog.at_level("INFO"):
+        assert asyncio.run(tagger.arun()) is None
+    assert "No previous tag found" in caplog.text
+    assert "No new commits found" in caplog.text
+
+
+def test_arun_tag_already_exists(caplog):
+    tagger = _async_tagger()
+    tagger.async_repo.create_tag = mock.AsyncMock(return_value=False)
+    with caplog.at_level("INFO"):
+        asyncio.run(tagger.arun())
+    assert "already exists" in caplog.text
+
+
+def test_run_recomputes_when_fetch_brings_newer_tag(caplog):
+    tagger = GitAutoTagger(debug=True)
+    tagger.repo.start_tag_fetch = mock.Mock(return_value="proc")
+    tagger.repo.finish_tag_fetch = mock.Mock(return_value=True)
+    tagger.repo.get_latest_tag = mock.Mock(side_effect=["v1.0.0", "v1.1.0"])
+    tagger.repo.get_commit_messages = mock.Mock(side_effect=[["feat: x", "fix: y"], ["fix: y"]])
+    tagger.repo.create_tag = mock.Mock(return_value=True)
+
+    assert tagger.run(dry_run=True) == "v1.1.1"
+    tagger.repo.get_latest_tag.assert_called_with(fetch=False)
+    tagger.repo.finish_tag_fetch.assert_called_once_with("proc")
+    assert tagger.repo.get_commit_messages.call_args_list == [
+        mock.call(since_tag="v1.0.0"),
+        mock.call(since_tag="v1.1.0"),
+    ]
+
+
+def test_run_waits_for_fetch_before_resolving_base_of_shallow_clone():
+    tagger = GitAutoTagger(debug=True)
+    calls = mock.Mock()
+    tagger.repo.is_shallow = mock.Mock(return_value=True)
+    tagger.repo.start_tag_fetch = calls.start
+    tagger.repo.finish_tag_fetch = calls.finish
+    tagger.repo.get_latest_tag = calls.latest
+    calls.start.return_value, calls.latest.return_value = "proc", "v1.0.0"
+    tagger.repo.get_commit_messages = mock.Mock(return_value=["fix: x"])
+
+    assert tagger.run(dry_run=True) == "v1.0.1"
+    assert calls.mock_calls == [mock.call.start(), mock.call.finish("proc"), mock.call.latest(fetch=False)]
+
+
+def test_run_keeps_speculative_result_when_base_unchanged():
+    tagger = GitAutoTagger(debug=True)
+    tagger.repo.finish_tag_fetch = mock.Mock(return_value=True)
+    tagger.repo.get_latest_tag = mock.Mock(return_value="v1.0.0")
+    tagger.repo.get_commit_messages = mock.Mock(return_value=["feat: x"])
+
+    assert tagger.run(dry_run=True) == "v1.1.0"
+    tagger.repo.get_commit_messages.assert_called_once_with(since_tag="v1.0.0")
+
+
+def test_run_with_since_tag_skips_fetch():
+    tagger = GitAutoTagger(debug=True)
+    tagger.repo.get_latest_tag = mock.Mock()
+    tagger.repo.get_commit_messages = mock.Mock(return_value=["fix: x"])
+
+    assert tagger.run(dry_run=True, since_tag="v2.0.0") == "v2.0.1"
+    tagger.repo.start_tag_fetch.assert_not_called()
+    tagger.repo.get_latest_tag.assert_not_called()
+
+
+def _commit(cwd, message):
+    (cwd / f"{abs(hash(message))}.txt").write_text(message)
+    git(cwd, "add", ".")
+    git(cwd, "commit", "-q", "-m", message)
+
+
+@pytest.fixture
+def racing_clones(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    remote = tmp_path / "remote.git"
+    git(tmp_path, "init", "-q", "--bare", str(remote))
+    seed = init_repo(tmp_path / "seed")
+    _commit(seed, "feat: first")
+    git(seed, "tag", "v1.0.0")
+    _commit(seed, "fix: second")
+    git(seed, "push", "-q", "--tags", str(remote), "HEAD:refs/heads/main")
+
+    clones = []
+    for name in ("a", "b"):
+        git(tmp_path, "clone", "-q", "-b", "main", str(remote), name)
+        git(tmp_path / name, "config", "user.email", "test@example.com")
+        git(tmp_path / name, "config", "user.name", "Tester")
+        clones.append(tmp_path / name)
+    return remote, clones
+
+
+def test_race_safe_skips_when_head_already_released(racing_clones):
+    remote, (a, b) = racing_clones
+    assert GitAutoTagger(repo_path=str(a), push=True).run() == "v1.0.1"
+
+    assert GitAutoTagger(repo_path=str(b), push=True, race_safe=True).run() is None
+    assert sorted(git(remote, "tag").split()) == ["v1.0.0", "v1.0.1"]
+
+
+def test_race_safe_recomputes_on_newer_remote_tag(racing_clones):
+    remote, (a, b) = racing_clones
+    _commit(b, "feat: third")
+    git(b, "push", "-q", "origin", "main")
+    assert GitAutoTagger(repo_path=str(a), push=True).run() == "v1.0.1"
+
+    tagger = GitAutoTagger(repo_path=str(b), push=True, race_safe=True, changelog=True)
+    tagger.repo.start_tag_fetch = mock.Mock(return_value=None)
+    assert tagger.run() == "v1.1.0"
+    assert git(remote, "rev-parse", "v1.1.0") == git(b, "rev-parse", "HEAD")
+    assert "## v1.1.0" in (b / "CHANGELOG.md").read_text()
+
+
+def test_race_safe_retries_after_lease_rejection(racing_clones):
+    remote, (a, b) = racing_clones
+    _commit(b, "fix: third")
+    git(b, "push", "-q", "origin", "main")
+    assert GitAutoTagger(repo_path=str(a), push=True).run() == "v1.0.1"
+
+    tagger = GitAutoTagger(repo_path=str(b), push=True, race_safe=True)
+    real_list = tagger.repo.list_remote_tags
+    # First ls-remote is stale: the competing tag lands between our check and our push
+    tagger.repo.list_remote_tags = mock.Mock(side_effect=[{"v1.0.0": git(b, "rev-parse", "v1.0.0")}, real_list()])
+    tagger.repo.get_latest_tag = mock.Mock(side_effect=["v1.0.0", "v1.0.1"])
+
+    assert tagger.run() == "v1.0.2"
+    assert sorted(git(remote, "tag").split()) == ["v1.0.0", "v1.0.1", "v1.0.2"]
+    assert sorted(git(b, "tag").split()) == ["v1.0.0", "v1.0.1", "v1.0.2"]
+
+
+def test_race_safe_exits_on_non_race_push_failure():
+    tagger = GitAutoTagger(debug=True, push=True, race_safe=True)
+    tagger.repo.get_latest_tag = mock.Mock(return_value="v1.0.0")
+    tagger.repo.get_commit_messages = mock.Mock(return_value=["fix: a"])
+    tagger.repo.list_remote_tags = mock.Mock(return_value={})
+    tagger.repo.list_local_tags = mock.Mock(return_value={})
+    tagger.repo.tag_exists = mock.Mock(return_value=False)
+    transaction = tagger.repo.tag_transaction = mock.Mock()
+    transaction.return_value.add.return_value.push.side_effect = subprocess.CalledProcessError(
+        128, "git push", stderr="remote: Permission denied"
+    )
+
+    with pytest.raises(SystemExit):
+        tagger.run()
+    transaction.return_value.add.return_value.rollback.assert_called_once()
+
+
+def test_race_safe_gives_up_after_max_attempts():
+    tagger = GitAutoTagger(debug=True, push=True, race_safe=True, max_attempts=2)
+    tagger.repo.get_latest_tag = mock.Mock(return_value="v1.0.0")
+    tagger.repo.get_commit_messages = mock.Mock(return_value=["fix: a"])
+    tagger.repo.list_remote_tags = mock.Mock(return_value={})
+    tagger.repo.list_local_tags = mock.Mock(return_value={})
+    tagger.repo.tag_exists = mock.Mock(return_value=False)
+    transaction = tagger.repo.tag_transaction = mock.Mock()
+    transaction.return_value.add.return_value.push.side_effect = subprocess.CalledProcessError(
+        1, "git push", stderr="! [rejected] v1.0.1 -> v1.0.1 (stale info)"
+    )
+
+    with pytest.raises(SystemExit):
+        tagger.run()
+    assert transaction.return_value.add.return_value.push.call_count == 2
+
+
+def test_race_safe_existing_tag_and_empty_recompute(caplog):
+    tagger = GitAutoTagger(debug=True, push=True, race_safe=True)
+    tagger.repo.get_latest_tag = mock.Mock(side_effect=["v1.0.0", "v1.0.0"])
+    tagger.repo.get_commit_messages = mock.Mock(return_value=["fix: a"])
+    tagger.repo.list_remote_tags = mock.Mock(return_value={"v1.0.1": "abc"})
+    tagger.repo.list_local_tags = mock.Mock(return_value={"v1.0.1": "abc"})
+    with caplog.at_level("INFO"):
+        assert tagger.run() == "v1.0.1"
+    assert "already exists" in caplog.text
+
+    tagger.repo.get_latest_tag = mock.Mock(side_effect=["v1.0.0", "v1.0.1"])
+    tagger.repo.get_commit_messages = mock.Mock(side_effect=[["fix: a"], []])
+    tagger.repo.list_local_tags = mock.Mock(return_value={})
+    tagger.repo.fetch_tag_refs = mock.Mock()
+    tagger.repo.tags_containing_head = mock.Mock(return_value=[])
+    assert tagger.run() is None
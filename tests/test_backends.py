@@ -0,0 +1,136 @@
+import io
+import subprocess
+
+import pytest
+
+from gitag.backends import BACKENDS, GitBackend, GitError, SubprocessBackend, available_backends, get_backend
+from gitag.backends.subprocess_backend import nul_records
+from gitag.config import BACKEND_NAMES, MergeStrategy
+from gitag.git_repo import GitRepo
+
+from conftest import commit, git, init_repo
+
+
+@pytest.fixture(params=BACKEND_NAMES)
+def backend_name(request):
+    if request.param != "subprocess":
+        pytest.importorskip(request.param)
+    return request.param
+
+
+@pytest.fixture
+def repo(tmp_path):
+    path = init_repo(tmp_path / "repo")
+    commit(path, "feat: first")
+    git(path, "tag", "-a", "v1.0.0", "-m", "release")
+    commit(path, "fix: second\n\nbody text")
+    git(path, "checkout", "-q", "-b", "feature")
+    commit(path, "feat: on feature")
+    git(path, "checkout", "-q", "main")
+    git(path, "merge", "-q", "--no-ff", "feature", "-m", "Merge branch 'feature'")
+    return path
+
+
+def test_read_operations(repo, backend_name):
+    backend = get_backend(backend_name, cwd=str(repo))
+    head = git(repo, "rev-parse", "HEAD")
+    assert backend.resolve("HEAD") == head
+    assert backend.list_tags() == {"v1.0.0": git(repo, "rev-parse", "v1.0.0^{commit}")}
+    assert backend.describe("HEAD") == "v1.0.0"
+    assert backend.parents("HEAD") == git(repo, "rev-parse", "HEAD^1", "HEAD^2").split()
+    assert backend.tag_exists("v1.0.0") and not backend.tag_exists("v9.9.9")
+
+    assert sorted(backend.log("v1.0.0..HEAD", include_merges=False)) == ["feat: on feature", "fix: second"]
+    assert backend.log("v1.0.0..HEAD", include_merges=True)[0] == "Merge branch 'feature'"
+    assert [c.sha for c in backend.walk(["HEAD"], ["v1.0.0"])][0] == head
+
+
+def test_create_tag(repo, backend_name):
+    backend = get_backend(backend_name, cwd=str(repo))
+    backend.create_tag("v1.1.0")
+    assert git(repo, "rev-parse", "v1.1.0") == git(repo, "rev-parse", "HEAD")
+    with pytest.raises(subprocess.CalledProcessError):
+        backend.create_tag("v1.1.0")
+
+
+def test_errors_are_called_process_errors(repo, backend_name):
+    backend = get_backend(backend_name, cwd=str(repo))
+    with pytest.raises(subprocess.CalledProcessError):
+        backend.resolve("no-such-ref")
+    git(repo, "tag", "-d", "v1.0.0")
+    with pytest.raises(subprocess.CalledProcessError):
+        backend.describe("HEAD")
+
+
+def test_git_repo_with_backend(repo, backend_name):
+    git_repo = GitRepo(cwd=str(repo), merge_strategy=MergeStrategy.AUTO, backend=backend_name)
+    assert git_repo.backend.name == backend_name
+    assert git_repo.get_latest_tag(fetch=False) == "v1.0.0"
+    assert git_repo.get_commit_messages("v1.0.0") == ["feat: on feature"]  # feature side of the merge
+    assert list(git_repo.iter_commit_messages("v1.0.0")) == ["feat: on feature"]
+    assert git_repo.create_tag("v1.1.0", push=False) is True
+    assert git_repo.list_local_tags()["v1.1.0"] == git(repo, "rev-parse", "HEAD")
+
+
+def test_get_backend_selection(repo):
+    assert isinstance(get_backend(cwd=str(repo)), SubprocessBackend)
+    assert "subprocess" in available_backends()
+    assert get_backend("auto", cwd=str(repo)).name == available_backends()[0]
+    with pytest.raises(ValueError, match="Unknown git backend"):
+        get_backend("libgit3")
+    assert tuple(BACKENDS) == BACKEND_NAMES
+
+
+def test_git_error_formatting():
+    error = GitError("no tag reachable from HEAD", "describe")
+    assert isinstance(error, subprocess.CalledProcessError)
+    assert str(error) == "describe: no tag reachable from HEAD"
+
+
+def test_first_parent(repo, backend_name):
+    backend = get_backend(backend_name, cwd=str(repo))
+    chain = list(backend.first_parent(["HEAD"], ["v1.0.0"]))
+    assert [c.subject for c in chain] == ["Merge branch 'feature'", "fix: second"]
+    assert len(chain[0].parents) == 2
+
+
+def test_nul_records_split_across_chunks(monkeypatch):
+    monkeypatch.setattr("gitag.backends.subprocess_backend.STREAM_CHUNK", 4)
+    records = nul_records(io.BufferedReader(io.BytesIO(b"fix: a\0feat: bb\0\0x\0tail")))
+    assert [bytes(r) for r in records] == [b"fix: a", b"feat: bb", b"", b"x", b"tail"]
+
+
+def test_raw_log_matches_text_log(repo, backend_name):
+    backend = get_backend(backend_name, cwd=str(repo))
+    raw = [bytes(subject).decode() for subject in backend.iter_log_raw("v1.0.0..HEAD", include_merges=True)]
+    assert raw == backend.log("v1.0.0..HEAD", include_merges=True)
+
+
+@pytest.mark.parametrize("native", [True, False])
+def test_walk_topo_yields_children_first(repo, backend_name, native):
+    backend = get_backend(backend_name, cwd=str(repo))
+    walk_topo = backend.walk_topo if native else lambda *args: GitBackend.walk_topo(backend, *args)  # Buffered default
+    seen = set()
+    commits = list(walk_topo(["HEAD"], []))
+    for c in reversed(commits):  # Oldest first: every parent must already be seen
+        assert all(parent in seen for parent in c.parents)
+        seen.add(c.sha)
+    assert {c.sha for c in commits} == {c.sha for c in backend.walk(["HEAD"], [])}
+
+
+def test_describe_matches_git_after_merge_back(merged_back, backend_name):
+    backend = get_backend(backend_name, cwd=str(merged_back))
+    assert backend.describe("HEAD") == git(merged_back, "describe", "--tags", "--abbrev=0") == "v1.1.0"
+    assert backend.describe("release/1.0") == "v1.0.1"
+
+
+def test_describe_prefers_highest_version_on_one_commit(merged_back, backend_name):
+    git(merged_back, "tag", "v1.9.0")
+    git(merged_back, "tag", "v1.10.0")
+    assert get_backend(backend_name, cwd=str(merged_back)).describe("HEAD") == "v1.10.0"
+
+
+def test_default_describe_matches_git(merged_back):
+    backend = get_backend(cwd=str(merged_back))
+    for rev in ("HEAD", "HEAD^", "HEAD^^2", "main~2", "v1.0.0"):
+        assert GitBackend.describe(backend, rev) == backend.describe(rev)
@@ -0,0 +1,105 @@
+import json
+import subprocess
+
+import pytest
+
+from gitag import main as main_module
+from gitag.batch import BatchResult, format_report, read_repo_list, run_batch, write_report
+
+
+def _make_repo(path, messages, tag=None):
+    path.mkdir()
+    subprocess.run(["git", "init", "-q"], cwd=path, check=True)
+    subprocess.run(["git", "config", "user.email", "test@example.com"], cwd=path, check=True)
+    subprocess.run(["git", "config", "user.name", "Tester"], cwd=path, check=True)
+    for i, msg in enumerate(messages):
+        (path / f"file{i}.txt").write_text(msg)
+        subprocess.run(["git", "add", "."], cwd=path, check=True)
+        subprocess.run(["git", "commit", "-q", "-m", msg], cwd=path, check=True)
+        if tag and i == 0:
+            subprocess.run(["git", "tag", tag], cwd=path, check=True)
+    return path
+
+
+@pytest.fixture
+def repos(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    a = _make_repo(tmp_path / "a", ["feat: first", "fix: second"], tag="v1.0.0")
+    b = _make_repo(tmp_path / "b", ["feat: only"])
+    return a, b
+
+
+def test_read_repo_list_skips_comments_and_blanks(tmp_path):
+    listing = tmp_path / "repos.txt"
+    listing.write_text("# nightly\n/srv/a\n\n  /srv/b  \n")
+    assert read_repo_list(str(listing)) == ["/srv/a", "/srv/b"]
+
+
+def test_run_batch_tags_each_repo(repos):
+    a, b = repos
+    results = run_batch([str(a), str(b)], jobs=2)
+
+    assert [r.repo for r in results] == [str(a), str(b)]
+    assert all(r.ok for r in results)
+    assert results[0].tag == "v1.0.1"
+    assert results[1].tag == "v0.1.0"
+    tags = subprocess.run(["git", "tag"], cwd=a, capture_output=True, text=True, check=True).stdout.split()
+    assert "v1.0.1" in tags
+
+
+def test_run_batch_dry_run_creates_no_tags(repos):
+    a, _ = repos
+    results = run_batch([str(a)], jobs=1, dry_run=True)
+    assert results[0].tag == "v1.0.1"
+    tags = subprocess.run(["git", "tag"], cwd=a, capture_output=True, text=True, check=True).stdout.split()
+    assert tags == ["v1.0.0"]
+
+
+def test_run_batch_reports_missing_repo(tmp_path):
+    results = run_batch([str(tmp_path / "missing")], jobs=1)
+    assert results[0].exit_code == 1
+    assert "not found" in results[0].error
+
+
+def test_run_batch_captures_git_exit(repos, tmp_path):
+    not_a_repo = tmp_path / "plain"
+    not_a_repo.mkdir()
+    results = run_batch([str(not_a_repo)], jobs=1, dry_run=True)
+    assert results[0].exit_code == 1
+    assert results[0].error == "git command failed"
+
+
+def test_format_and_write_report(tmp_path):
+    results = [
+        BatchResult(repo="a", exit_code=0, duration=0.5, tag="v1.0.1"),
+        BatchResult(repo="b", exit_code=1, duration=0.1, error="boom"),
+        BatchResult(repo="c", exit_code=0, duration=0.2),
+    ]
+    report = format_report(results)
+    assert "v1.0.1" in report
+    assert "boom" in report
+    assert "no new commits" in report
+    assert "3 repositories, 1 failed" in report
+
+    out = tmp_path / "report.json"
+    write_report(results, str(out))
+    data = json.loads(out.read_text())
+    assert data[1] == {"repo": "b", "exit_code": 1, "duration": 0.1, "tag": None, "error": "boom"}
+
+
+def test_batch_command(repos, tmp_path):
+    a, b = repos
+    listing = tmp_path / "repos.txt"
+    listing.write_text(f"{a}\n{b}\n")
+    report = tmp_path / "report.json"
+
+    result = main_module.main(["batch", "--repos", str(listing), "--jobs", "2", "--dry-run", "--report", str(report)])
+
+    assert result == 0
+    assert [r["tag"] for r in json.loads(report.read_text())] == ["v1.0.1", "v0.1.0"]
+
+
+def test_batch_command_fails_if_any_repo_fails(tmp_path):
+    listing = tmp_path / "repos.txt"
+    listing.write_text(f"{tmp_path / 'missing'}\n")
+    assert main_module.main(["batch", "--repos", str(listing)]) == 1
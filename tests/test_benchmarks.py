@@ -0,0 +1,66 @@
+import pytest
+
+from benchmarks.run import bench_repo, compare
+from benchmarks.synth_repo import RepoSpec, cached_repo, generate, parse_mix
+from gitag.backends import available_backends
+
+from conftest import git
+
+
+def test_generate_linear_history(tmp_path):
+    spec = RepoSpec(commits=50, tags=4, tail=10)
+    generate(tmp_path / "repo", spec)
+    repo = tmp_path / "repo"
+
+    assert git(repo, "rev-list", "--count", "HEAD") == "50"
+    assert len(git(repo, "tag").split()) == 4
+    latest = git(repo, "describe", "--tags", "--abbrev=0")
+    assert latest == "v0.4.0"
+    assert git(repo, "rev-list", "--count", f"{latest}..HEAD") == "10"
+
+
+def test_generate_with_merges(tmp_path):
+    spec = RepoSpec(commits=60, tags=2, tail=10, merge_every=5, branch_length=2)
+    repo = generate(tmp_path / "repo", spec)
+
+    assert git(repo, "rev-list", "--count", "HEAD") == "60"
+    assert int(git(repo, "rev-list", "--count", "--merges", "HEAD")) > 0
+    assert git(repo, "branch", "--format=%(refname:short)") == "main"
+
+
+def test_cached_repo_reuses_build(tmp_path):
+    spec = RepoSpec(commits=5, tags=1, tail=1)
+    first = cached_repo(tmp_path, spec)
+    head = git(first, "rev-parse", "HEAD")
+    assert cached_repo(tmp_path, spec) == first
+    assert git(first, "rev-parse", "HEAD") == head
+
+
+def test_parse_mix_rejects_unknown_kind():
+    assert parse_mix("feat=3,fix=1") == {"feat": 3, "fix": 1}
+    with pytest.raises(ValueError):
+        parse_mix("refactor=1")
+
+
+def test_compare_flags_regressions_above_threshold():
+    baseline = {"results": {"s": {"metrics": {"a": {"min": 0.10}, "b": {"min": 0.10}, "tiny": {"min": 0.0001}}}}}
+    current = {"results": {"s": {"metrics": {"a": {"min": 0.20}, "b": {"min": 0.11}, "tiny": {"min": 0.001}}}}}
+
+    regressions = compare(current, baseline, threshold=1.25, floor=0.002)
+
+    assert [r["metric"] for r in regressions] == ["a"]
+    assert regressions[0]["ratio"] == 2.0
+
+
+def test_compare_ignores_unknown_scenarios():
+    current = {"results": {"new": {"metrics": {"a": {"min": 1.0}}}}}
+    assert compare(current, {"results": {}}, threshold=1.1, floor=0) == []
+
+
+def test_bench_repo_backends_agree(tmp_path):
+    repo = generate(tmp_path / "repo", RepoSpec(commits=30, tags=2, tail=5))
+    counts = {
+        backend: bench_repo(repo, repeat=1, workdir=tmp_path, backend=backend)["commits_in_tail"]
+        for backend in available_backends()
+    }
+    assert len(set(counts.values())) == 1
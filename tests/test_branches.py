@@ -0,0 +1,101 @@
+import json
+from unittest import mock
+
+import pytest
+
+from gitag import main as main_module
+from gitag.backends import get_backend
+from gitag.branches import next_versions
+from gitag.version_manager import VersionManager
+
+from conftest import commit, git, init_repo
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """main and release/1.0 diverge after v1.0.0; release is merged back into main once."""
+    path = init_repo(tmp_path / "repo")
+    commit(path, "feat: first")
+    git(path, "tag", "v1.0.0")
+    git(path, "branch", "release/1.0")
+    commit(path, "feat: next feature")
+    git(path, "tag", "v1.1.0")
+    commit(path, "feat!: breaking")
+
+    git(path, "checkout", "-q", "release/1.0")
+    commit(path, "fix: backport")
+    git(path, "tag", "v1.0.1")
+    commit(path, "fix: second backport")
+    git(path, "checkout", "-q", "main")
+    git(path, "merge", "-q", "--no-ff", "release/1.0", "-m", "Merge release/1.0")
+    git(path, "checkout", "-q", "release/1.0")
+    commit(path, "fix: after merge-back")
+    git(path, "checkout", "-q", "main")
+    return path
+
+
+def test_next_versions_for_several_branches(repo, tmp_path):
+    versioning = VersionManager(str(tmp_path / "missing.toml"))
+    results = next_versions(get_backend(cwd=str(repo)), versioning, ["main", "release/1.0"])
+    assert [(r["ref"], r["base_tag"], r["next_version"], r["commits"]) for r in results] == [
+        ("main", "v1.1.0", "v2.0.0", 4),  # breaking change, merge commit and both backports
+        ("release/1.0", "v1.0.1", "v1.0.2", 2),
+    ]
+    no_merges = next_versions(get_backend(cwd=str(repo)), versioning, ["main"], include_merges=False)
+    assert no_merges[0]["commits"] == 3
+
+
+def test_base_is_highest_version_not_nearest_tag(repo, tmp_path):
+    git(repo, "checkout", "-q", "release/1.0")
+    commit(repo, "fix: third backport")
+    git(repo, "tag", "v1.0.2")
+    git(repo, "checkout", "-q", "main")
+    git(repo, "merge", "-q", "--no-ff", "release/1.0", "-m", "Merge release/1.0 again")
+    assert git(repo, "describe", "--tags", "--abbrev=0") == "v1.0.2"  # Nearer than v1.1.0 by describe depth
+
+    versioning = VersionManager(str(tmp_path / "missing.toml"))
+    [result] = next_versions(get_backend(cwd=str(repo)), versioning, ["main"])
+    assert (result["base_tag"], result["next_version"]) == ("v1.1.0", "v2.0.0")
+
+
+def test_shared_history_is_classified_once(repo, tmp_path):
+    git(repo, "branch", "copy", "main")
+    versioning = VersionManager(str(tmp_path / "missing.toml"))
+    strategy = versioning.strategy = mock.Mock(wraps=versioning.strategy)
+    with mock.patch.object(versioning, "classify", wraps=versioning.classify) as classify:
+        results = next_versions(get_backend(cwd=str(repo)), versioning, ["main", "copy", "release/1.0"])
+    assert [r["commits"] for r in results] == [4, 4, 2]
+    classify.assert_called_once()  # One pass, under the classification budget
+    assert strategy.call_count == 5  # main's 4 plus the one release-only commit
+
+
+def test_branch_without_tags_counts_from_root(repo, tmp_path):
+    git(repo, "checkout", "-q", "--orphan", "fresh")
+    commit(repo, "feat: unrelated")
+    versioning = VersionManager(str(tmp_path / "missing.toml"))
+    (fresh,) = next_versions(get_backend(cwd=str(repo)), versioning, ["fresh"])
+    assert (fresh["base_tag"], fresh["next_version"], fresh["commits"]) == (None, "v0.1.0", 1)
+
+
+def test_next_version_command_with_branches(repo, monkeypatch, capsys):
+    monkeypatch.chdir(repo)
+    assert main_module.main(["next-version", "--branches", "main", "release/1.0", "--json"]) == 0
+    assert [r["next_version"] for r in json.loads(capsys.readouterr().out)] == ["v2.0.0", "v1.0.2"]
+    assert main_module.main(["next-version", "--branches", "v1.1.0"]) == 2
+    assert capsys.readouterr().out.split() == ["v1.1.0", "-"]
+
+
+def test_branches_apply_pre_and_build(repo, monkeypatch, capsys):
+    monkeypatch.chdir(repo)
+    git(repo, "tag", "v1.0.2-rc.1", "main^1")  # Numbering counts it though release/1.0 does not contain it
+    assert main_module.main(["next-version", "--branches", "main", "release/1.0", "--pre", "rc", "--build", "7"]) == 0
+    assert capsys.readouterr().out.split() == ["main", "v2.0.0-rc.1+7", "release/1.0", "v1.0.2-rc.2+7"]
+
+
+@pytest.mark.parametrize("flag", [["--fetch"], ["--commit-graph"], ["--merge-strategy", "auto"]])
+def test_branches_reject_unsupported_options(repo, monkeypatch, capsys, flag):
+    monkeypatch.chdir(repo)
+    with pytest.raises(SystemExit) as excinfo:
+        main_module.main(["next-version", "--branches", "main", *flag])
+    assert excinfo.value.code == 2
+    assert f"--branches cannot be combined with {flag[0]}" in capsys.readouterr().err
@@ -26,6 +26,13 @@ def test_write_changelog_default(tmp_path):
     assert "- BREAKING CHANGE: removed endpoint" in content
 
 
+def test_generate_entry_without_writing(tmp_path):
+    writer = ChangelogWriter(path=tmp_path / "CHANGELOG.md", include_date=False)
+    entry = writer.generate_entry("v1.2.3", {str(BumpLevel.MINOR): ["feat: something new"]})
+    assert entry == "## v1.2.3\n\n### Minor Changes\n\n- feat: something new"
+    assert not (tmp_path / "CHANGELOG.md").exists()
+
+
 def test_write_changelog_with_date(tmp_path):
     path = tmp_path / "CHANGELOG.md"
     writer = ChangelogWriter(path=path, include_date=True)
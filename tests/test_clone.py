@@ -0,0 +1,71 @@
+import pytest
+
+from gitag import main as main_module
+from gitag.config import MergeStrategy
+from gitag.git_repo import GitRepo
+from gitag.refs import find_git_dir, partial_clone_filter, read_config
+
+from conftest import git, init_repo
+
+
+@pytest.fixture
+def origin(tmp_path):
+    path = init_repo(tmp_path / "origin")
+    git(path, "config", "uploadpack.allowFilter", "true")
+    (path / "pyproject.toml").write_text('[tool.gitag]\nprefix = "v"\n')
+    (path / "big.bin").write_text("x" * 10000)
+    git(path, "add", ".")
+    git(path, "commit", "-q", "-m", "feat: initial")
+    git(path, "tag", "v1.0.0")
+    git(path, "commit", "-q", "--allow-empty", "-m", "fix: later")
+    return path
+
+
+def _object_types(path):
+    out = git(path, "cat-file", "--batch-all-objects", "--batch-check=%(objecttype)")
+    return sorted(set(out.split()))
+
+
+@pytest.mark.parametrize("filter_spec", ["blob:none", "tree:0"])
+def test_clone_command_creates_partial_clone(origin, tmp_path, filter_spec):
+    target = tmp_path / "clone"
+    assert main_module.main(["clone", origin.as_uri(), str(target), "--filter", filter_spec]) == 0
+
+    assert sorted(p.name for p in target.iterdir()) == [".git", "pyproject.toml"]
+    assert partial_clone_filter(find_git_dir(target)) == filter_spec
+    assert "v1.0.0" in git(target, "tag")
+
+    repo = GitRepo(cwd=str(target), merge_strategy=MergeStrategy.ALWAYS)
+    assert repo.env["GIT_NO_LAZY_FETCH"] == "1"
+    assert repo.get_latest_tag(fetch=False) == "v1.0.0"
+    assert repo.get_commit_messages(since_tag="v1.0.0") == ["fix: later"]
+    objects = git(target, "cat-file", "--batch-all-objects", "--batch-check=%(objecttype) %(objectsize)")
+    assert "blob 10000" not in objects.splitlines()  # big.bin was never downloaded
+
+
+def test_clone_without_checkout(origin, tmp_path):
+    target = tmp_path / "bare-ish"
+    assert main_module.main(["clone", origin.as_uri(), str(target), "--checkout"]) == 0
+    assert [p.name for p in target.iterdir()] == [".git"]
+    assert "blob" not in _object_types(target)
+
+
+def test_clone_failure_returns_error(tmp_path):
+    assert main_module.main(["clone", str(tmp_path / "missing"), str(tmp_path / "x")]) == 1
+
+
+def test_full_clone_has_no_filter(origin):
+    assert partial_clone_filter(find_git_dir(origin)) is None
+    assert GitRepo(cwd=str(origin)).env is None
+
+
+def test_read_config_sections(tmp_path):
+    git_dir = tmp_path / ".git"
+    git_dir.mkdir()
+    (git_dir / "config").write_text(
+        '[core]\n\tbare = false\n[remote "Origin"]\n\tpromisor\n\tpartialCloneFilter = "blob:none"\n# comment\n'
+    )
+    config = read_config(git_dir)
+    assert config["core.bare"] == "false"
+    assert config["remote.Origin.promisor"] == "true"
+    assert partial_clone_filter(git_dir) == "blob:none"
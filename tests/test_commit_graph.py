@@ -0,0 +1,137 @@
+import pytest
+
+from gitag.commit_graph import CommitGraph
+from gitag.config import MergeStrategy
+from gitag.git_repo import GitRepo
+from gitag.refs import find_git_dir
+from gitag.utils import timings as timing
+
+from conftest import commit, git, init_repo
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """main: c1 (v1.0.0) - c2 - octopus(c2, a, b) - c3 (annotated v1.1.0) - merge(c3, feature) - c4"""
+    path = init_repo(tmp_path / "repo")
+    commit(path, "feat: one")
+    git(path, "tag", "v1.0.0")
+    commit(path, "fix: two")
+    for branch in ("a", "b"):
+        git(path, "checkout", "-q", "-b", branch, "main")
+        commit(path, f"feat: {branch}")
+    git(path, "checkout", "-q", "main")
+    git(path, "merge", "-q", "--no-ff", "-m", "octopus", "a", "b")
+    commit(path, "fix: three")
+    git(path, "tag", "-a", "v1.1.0", "-m", "release")
+    git(path, "checkout", "-q", "-b", "feature", "main")
+    commit(path, "feat: feature")
+    git(path, "checkout", "-q", "main")
+    commit(path, "fix: main")
+    git(path, "merge", "-q", "--no-ff", "-m", "Merge feature", "feature")
+    return path
+
+
+def test_reader_matches_git(repo):
+    git(repo, "commit-graph", "write", "--reachable")
+    graph = CommitGraph.load(find_git_dir(repo))
+    assert len(graph) == int(git(repo, "rev-list", "--all", "--count"))
+
+    for line in git(repo, "rev-list", "--all", "--parents").splitlines():
+        sha, *parents = line.split()
+        pos = graph.position(sha)
+        assert graph.sha(pos) == sha
+        assert [graph.sha(p) for p in graph.parents(pos)] == parents
+        assert graph.commit_time(pos) == int(git(repo, "log", "-1", "--format=%ct", sha))
+        assert all(graph.generation(pos) > graph.generation(p) for p in graph.parents(pos))
+
+    head = graph.position(git(repo, "rev-parse", "HEAD"))
+    octopus = graph.position(git(repo, "rev-parse", "HEAD^1~1^{/octopus}"))
+    assert len(graph.parents(octopus)) == 3
+    assert graph.is_ancestor(octopus, head)
+    assert not graph.is_ancestor(head, octopus)
+    assert graph.position("0" * 40) is None
+
+
+def test_reader_handles_split_chain(repo):
+    git(repo, "commit-graph", "write", "--reachable", "--split")
+    commit(repo, "fix: later")
+    git(repo, "commit-graph", "write", "--reachable", "--split=no-merge")
+    git_dir = find_git_dir(repo)
+    assert not (git_dir / "objects" / "info" / "commit-graph").exists()
+
+    graph = CommitGraph.load(git_dir)
+    assert len(graph.layers) == 2
+    head = graph.position(git(repo, "rev-parse", "HEAD"))
+    assert [graph.sha(p) for p in graph.parents(head)] == [git(repo, "rev-parse", "HEAD~1")]
+
+
+def test_load_without_graph(repo):
+    assert CommitGraph.load(find_git_dir(repo)) is None
+
+
+def test_git_repo_uses_and_writes_commit_graph(repo):
+    repo_ = GitRepo(cwd=str(repo), commit_graph=True, merge_strategy=MergeStrategy.AUTO)
+    recorder = timing.Timings()
+    with timing.activate(recorder):
+        assert repo_.get_latest_tag(fetch=False) == "v1.1.0"
+        assert repo_.get_head_parents() == git(repo, "rev-list", "--parents", "-n", "1", "HEAD").split()[1:]
+
+    commands = [c["argv"][1] for c in recorder.commands]
+    assert commands == ["commit-graph"]  # Written once; describe and rev-list answered in-process
+    assert "graph-walk" in [p["name"] for p in recorder.phases]
+
+
+def test_git_repo_refreshes_stale_graph(repo):
+    git(repo, "commit-graph", "write", "--reachable")
+    commit(repo, "fix: newer")
+    git(repo, "tag", "v1.2.0")
+    commit(repo, "fix: newest")
+
+    repo_ = GitRepo(cwd=str(repo), commit_graph=True)
+    assert repo_.get_latest_tag(fetch=False) == "v1.2.0"
+    assert (find_git_dir(repo) / "objects" / "info" / "commit-graphs" / "commit-graph-chain").exists()
+
+
+def test_ambiguous_tags_fall_back_to_describe(repo):
+    git(repo, "tag", "v1.1.0-lightweight", "v1.1.0^{commit}")
+    repo_ = GitRepo(cwd=str(repo), commit_graph=True)
+    assert repo_._describe_from_graph() is None
+    assert repo_.get_latest_tag(fetch=False) == git(repo, "describe", "--tags", "--abbrev=0")
+
+
+def test_commit_graph_disabled_by_default(repo):
+    GitRepo(cwd=str(repo)).get_latest_tag(fetch=False)
+    assert CommitGraph.load(find_git_dir(repo)) is None
+
+
+def test_packed_tag_objects_do_not_rewrite_graph(repo):
+    git(repo, "tag", "tree-tag", "HEAD^{tree}")  # Not a commit: never in the graph
+    git(repo, "repack", "-adq")  # Annotated tag object of v1.1.0 is packed, its ref stays loose
+    git(repo, "commit-graph", "write", "--reachable")
+
+    for _ in range(2):
+        recorder = timing.Timings()
+        with timing.activate(recorder):
+            assert GitRepo(cwd=str(repo), commit_graph=True).get_latest_tag(fetch=False) == "v1.1.0"
+        assert [c["argv"][1] for c in recorder.commands] == ["for-each-ref"]  # Peeled by git, no graph rewrite
+
+
+def test_commit_graph_describe_matches_git_after_merge_back(merged_back):
+    assert git(merged_back, "describe", "--tags", "--abbrev=0") == "v1.1.0"
+    repo_ = GitRepo(cwd=str(merged_back), commit_graph=True)
+    assert repo_._describe_from_graph() == "v1.1.0"  # Nearest by depth, not the newer backport tag
+    assert repo_.get_latest_tag(fetch=False) == "v1.1.0"
+
+
+def test_commit_graph_describe_leaves_ties_to_git(merged_back):
+    git(merged_back, "tag", "v1.0.2", "release/1.0")
+    git(merged_back, "tag", "-d", "v1.0.1")
+    git(merged_back, "checkout", "-q", "-b", "other", "v1.0.0")
+    commit(merged_back, "fix: other")
+    git(merged_back, "tag", "v1.0.3")
+    git(merged_back, "checkout", "-q", "main")
+    git(merged_back, "tag", "-d", "v1.1.0")
+    git(merged_back, "merge", "-q", "--no-ff", "other", "-m", "Merge other")
+    repo_ = GitRepo(cwd=str(merged_back), commit_graph=True)
+    assert repo_._describe_from_graph() is None  # v1.0.2 and v1.0.3 are equally far
+    assert repo_.get_latest_tag(fetch=False) == git(merged_back, "describe", "--tags", "--abbrev=0")
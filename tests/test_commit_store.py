@@ -0,0 +1,79 @@
+import json
+from unittest import mock
+
+import pytest
+
+from gitag.auto_tagger import GitAutoTagger
+from gitag.commit_store import CommitStore
+from gitag.config import BumpLevel
+from gitag.git_repo import GitRepo
+from gitag.version_manager import VersionManager
+
+from conftest import git, init_repo
+
+pytestmark = pytest.mark.usefixtures("no_background_fetch")
+
+
+@pytest.fixture
+def repo(tmp_path):
+    path = init_repo(tmp_path / "repo")
+    (path / "pyproject.toml").write_text('[tool.gitag]\nprefix = "v"\n')
+    git(path, "add", ".")
+    git(path, "commit", "-q", "-m", "feat: first")
+    git(path, "tag", "v1.0.0")
+    for message in ("feat: second", "fix: third", "docs: fourth"):
+        git(path, "commit", "-q", "--allow-empty", "-m", message)
+    return path
+
+
+def test_store_indexes_output_without_copying():
+    output = b"fix: a\0feat: b\0caf\xe9\0"
+    store = CommitStore.from_output(output)
+    assert store.data is output
+    assert len(store) == 3
+    assert list(store) == ["fix: a", "feat: b", "caf�"]
+    assert store[-2] == "feat: b"
+    assert bytes(store.raw(0)) == b"fix: a"
+    assert list(CommitStore.from_output(b"fix: a\0feat: b")) == ["fix: a", "feat: b"]
+    assert len(CommitStore.from_output(b"")) == 0
+
+
+def test_sections_are_lazy_views(tmp_path):
+    versioning = VersionManager(str(tmp_path / "missing.toml"))
+    store = CommitStore.from_messages(["fix: a", "feat: b", "chore: c"])
+    assert versioning.determine_bump(store) == BumpLevel.MINOR
+    with mock.patch.object(versioning, "classify") as classify:
+        categorized = versioning.categorize_commits(store)  # Reuses the levels column
+    classify.assert_not_called()
+    assert {name: list(section) for name, section in categorized.items()} == {
+        "major": [],
+        "minor": ["feat: b"],
+        "patch": ["fix: a", "chore: c"],
+    }
+    assert not categorized["major"] and len(categorized["patch"]) == 2
+    assert store.levels.tolist() == [2, 1, 2]
+
+
+def test_compact_repo_returns_store(repo):
+    plain = GitRepo(cwd=str(repo)).get_commit_messages("v1.0.0")
+    compact = GitRepo(cwd=str(repo), compact=True).get_commit_messages("v1.0.0")
+    assert isinstance(compact, CommitStore)
+    assert list(compact) == plain == ["docs: fourth", "fix: third", "feat: second"]
+
+
+def test_compact_run_writes_changelog_and_cache(repo, tmp_path):
+    cache = tmp_path / "cache.json"
+    tagger = GitAutoTagger(
+        repo_path=str(repo),
+        config_path=str(repo / "pyproject.toml"),
+        changelog=True,
+        compact=True,
+        cache_path=str(cache),
+    )
+    assert tagger.run(dry_run=True) == "v1.1.0"
+    changelog = (repo / "CHANGELOG.md").read_text()
+    assert "### Minor Changes\n\n- feat: second" in changelog
+    assert "- docs: fourth\n- fix: third" in changelog
+    (entry,) = json.loads(cache.read_text())["entries"].values()
+    assert entry["commits"] == ["docs: fourth", "fix: third", "feat: second"]
+    assert entry["categorized"]["minor"] == ["feat: second"]
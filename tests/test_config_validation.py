@@ -2,6 +2,8 @@ from pathlib import Path
 
 import pytest
 
+from gitag.config import BumpLevel
+from gitag.config_validator import backtracking_risk
 from gitag.version_manager import VersionManager
 
 
@@ -71,3 +73,67 @@ version_pattern = 123
     with caplog.at_level("WARNING"):
         VersionManager(config_path=str(pyproject))
     assert "version_pattern must be a string" in caplog.text
+
+
+def test_config_validation_warns_unknown_backend(tmp_path, caplog):
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text(
+        """
+[tool.gitag]
+backend = "libgit3"
+"""
+    )
+    with caplog.at_level("WARNING"):
+        manager = VersionManager(config_path=str(pyproject))
+    assert "backend must be one of" in caplog.text
+    assert manager.backend == "libgit3"
+
+
+def test_pattern_problems_reported_once_at_load(tmp_path, caplog):
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text(
+        r"""
+[tool.gitag.patterns]
+major = ["(\\w+\\s?)+!$", "(?>\\w+\\s?)+!$"]
+minor = ["???", "feat.*:.*"]
+"""
+    )
+    with caplog.at_level("WARNING"):
+        vm = VersionManager(config_path=str(pyproject))
+    assert "patterns['major'] '(\\w+\\s?)+!$' ignored: nested unbounded quantifiers" in caplog.text
+    assert "'???' is not a valid regex" in caplog.text
+    assert "several unbounded wildcards" in caplog.text
+    assert "'(?>" not in caplog.text
+
+    caplog.clear()
+    assert vm.determine_bump(["word " * 5000 + "?"]) == BumpLevel.PATCH  # Returns instead of backtracking
+    assert vm.determine_bump(["breaking!"]) == BumpLevel.MAJOR
+    assert vm.determine_bump(["what??? no"]) == BumpLevel.MINOR
+    assert caplog.text == ""
+
+
+@pytest.mark.parametrize("pattern", [r"(a|aa)*b", r"(?:x|xy)+z", r"(a|a?)+!", r"(a|.)+!"])
+def test_overlapping_alternation_under_repeat_is_risky(pattern):
+    assert "overlapping alternatives" in backtracking_risk(pattern)
+
+
+@pytest.mark.parametrize("pattern", [r"(feat|fix)*", r"(?:fix|feat)+x", r"(a|b)+", r"(?>a|aa)*b", r"^feat(\(.*\))?:"])
+def test_distinct_alternation_under_repeat_is_allowed(pattern):
+    assert backtracking_risk(pattern) is None
+
+
+def test_config_validation_warns_invalid_limits(tmp_path, caplog):
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text(
+        """
+[tool.gitag]
+max_subject_length = 0
+max_body_length = "long"
+classification_budget = -1
+"""
+    )
+    with caplog.at_level("WARNING"):
+        VersionManager(config_path=str(pyproject))
+    assert "max_subject_length must be a positive integer" in caplog.text
+    assert "max_body_length must be a positive integer" in caplog.text
+    assert "classification_budget must be a non-negative number" in caplog.text
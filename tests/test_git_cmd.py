@@ -0,0 +1,89 @@
+import subprocess
+from unittest import mock
+
+import pytest
+
+from gitag.backends import SubprocessBackend
+from gitag.utils import timings as timing
+from gitag.utils.git_cmd import LOCAL_TIMEOUT, NETWORK_TIMEOUT, GitTimeout, decode, default_timeout, git_env, run_git
+
+
+def test_git_env_disables_locks_prompts_pager_and_fsmonitor():
+    env = git_env({"PATH": "/bin"})
+    assert env["PATH"] == "/bin"
+    assert env["GIT_OPTIONAL_LOCKS"] == "0"
+    assert env["GIT_TERMINAL_PROMPT"] == "0"
+    assert env["GIT_PAGER"] == "cat"
+    assert (env["GIT_CONFIG_COUNT"], env["GIT_CONFIG_KEY_0"], env["GIT_CONFIG_VALUE_0"]) == (
+        "1",
+        "core.fsmonitor",
+        "false",
+    )
+
+
+def test_git_env_appends_to_existing_config_overrides():
+    env = git_env({"GIT_CONFIG_COUNT": "1", "GIT_CONFIG_KEY_0": "user.name", "GIT_CONFIG_VALUE_0": "x"})
+    assert env["GIT_CONFIG_KEY_0"] == "user.name"
+    assert (env["GIT_CONFIG_COUNT"], env["GIT_CONFIG_KEY_1"]) == ("2", "core.fsmonitor")
+
+
+def test_git_sees_the_settings(tmp_path):
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    assert run_git(["git", "config", "core.fsmonitor"], cwd=str(tmp_path)).stdout.strip() == "false"
+
+
+def test_network_commands_get_the_longer_timeout():
+    assert default_timeout(["git", "fetch", "--tags"]) == NETWORK_TIMEOUT
+    assert default_timeout(["git", "log"]) == LOCAL_TIMEOUT
+
+
+def test_timeouts_are_configurable_from_the_environment(monkeypatch):
+    monkeypatch.setenv("GITAG_NETWORK_TIMEOUT", "0")
+    monkeypatch.setenv("GITAG_LOCAL_TIMEOUT", "30")
+    assert default_timeout(["git", "clone", "url"]) is None
+    assert default_timeout(["git", "log"]) == 30.0
+    monkeypatch.setenv("GITAG_LOCAL_TIMEOUT", "soon")
+    with pytest.raises(ValueError, match="GITAG_LOCAL_TIMEOUT"):
+        default_timeout(["git", "log"])
+
+
+def test_disabled_timeout_is_not_passed_to_git(monkeypatch):
+    monkeypatch.setenv("GITAG_LOCAL_TIMEOUT", "0")
+    with mock.patch("gitag.utils.git_cmd.timed_run") as run:
+        run_git(["git", "log"])
+    assert run.call_args.kwargs["timeout"] is None
+
+
+def test_timeout_is_a_called_process_error_and_recorded():
+    recorder = timing.Timings()
+    expired = subprocess.TimeoutExpired(["git", "fetch"], 0.5, stderr=b"remote: Counting")
+    with timing.activate(recorder), mock.patch("subprocess.run", side_effect=expired):
+        with pytest.raises(subprocess.CalledProcessError) as info:
+            run_git(["git", "fetch"], timeout=0.5)
+    assert isinstance(info.value, GitTimeout)
+    assert str(info.value) == "Command '['git', 'fetch']' timed out after 0.5s"
+    assert info.value.stderr == "remote: Counting"
+    assert recorder.commands[0]["argv"] == ["git", "fetch"]
+
+
+def test_failure_output_is_decoded(tmp_path):
+    with pytest.raises(subprocess.CalledProcessError) as info:
+        run_git(["git", "rev-parse", "--verify", "no-such-ref"], cwd=str(tmp_path))
+    assert isinstance(info.value.stderr, str)
+
+
+def test_undecodable_commit_messages_are_replaced(tmp_path):
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    message = "fix: caf\xe9".encode("latin-1")
+    subprocess.run(
+        ["git", "-c", "user.name=T", "-c", "user.email=t@example.com", "commit", "-q", "--allow-empty", "-F", "-"],
+        input=message,
+        cwd=tmp_path,
+        capture_output=True,  # git warns that the message is not UTF-8
+        check=True,
+    )
+    backend = SubprocessBackend(cwd=str(tmp_path))
+    # Depending on the git version the subject is re-encoded from latin-1 or passed through as raw bytes
+    assert [c.subject for c in backend.walk(["HEAD"], [])][0] in ("fix: café", "fix: caf\ufffd")
+    assert backend.log("HEAD", include_merges=True)[0] in ("fix: café", "fix: caf\ufffd")
+    assert decode(message) == "fix: caf\ufffd"
@@ -329,3 +329,165 @@ def test_get_commit_messages_exit_without_debug(caplog):
         assert any("❌ Error" in msg for msg in caplog.messages)
         assert all("Command '['git', 'log']'" not in msg for msg in caplog.messages)
         exit_mock.assert_called_once_with(1)
+
+
+def test_background_tag_fetch_success():
+    with mock.patch("subprocess.Popen") as popen:
+        popen.return_value.communicate.return_value = ("", "")
+        popen.return_value.returncode = 0
+        repo = GitRepo(cwd="/tmp")
+        proc = repo.start_tag_fetch()
+        assert popen.call_args[0][0] == ["git", "fetch", "--tags"]
+        assert popen.call_args[1]["cwd"] == "/tmp"
+        assert repo.finish_tag_fetch(proc) is True
+
+
+def test_background_tag_fetch_failure(caplog):
+    caplog.set_level("DEBUG")
+    with mock.patch("subprocess.Popen") as popen:
+        popen.return_value.communicate.return_value = ("", "fatal: 'origin' does not appear to be a git repository")
+        popen.return_value.returncode = 128
+        repo = GitRepo()
+        assert repo.finish_tag_fetch(repo.start_tag_fetch()) is False
+    assert any("Tag fetch failed" in msg for msg in caplog.messages)
+
+
+def test_background_tag_fetch_cannot_start():
+    with mock.patch("subprocess.Popen", side_effect=FileNotFoundError("git")):
+        repo = GitRepo()
+        proc = repo.start_tag_fetch()
+        assert proc is None
+        assert repo.finish_tag_fetch(proc) is False
+
+
+def test_get_latest_tag_without_fetch():
+    with mock.patch("subprocess.run") as mocked:
+        mocked.return_value = mock.Mock(stdout="v1.2.3\n", returncode=0)
+        repo = GitRepo()
+        assert repo.get_latest_tag(fetch=False) == "v1.2.3"
+        assert mocked.call_count == 1
+        assert "describe" in mocked.call_args[0][0]
+
+
+def test_list_remote_tags_prefers_peeled_sha():
+    with mock.patch("subprocess.run") as mocked:
+        mocked.return_value = mock.Mock(
+            stdout="aaa\trefs/tags/v1.0.0\nbbb\trefs/tags/v1.1.0\nccc\trefs/tags/v1.1.0^{}\n", returncode=0
+        )
+        assert GitRepo().list_remote_tags() == {"v1.0.0": "aaa", "v1.1.0": "ccc"}
+        assert mocked.call_args[0][0] == ["git", "ls-remote", "--tags", "origin"]
+
+
+def test_list_local_tags_and_containing_head(fresh_git_repo):
+    subprocess.run(["git", "commit", "-q", "--allow-empty", "-m", "feat: one"], check=True)
+    subprocess.run(["git", "tag", "v1.0.0"], check=True)
+    subprocess.run(["git", "tag", "-a", "v1.0.1", "-m", "annotated"], check=True)
+    head = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True).stdout.strip()
+
+    repo = GitRepo()
+    assert repo.list_local_tags() == {"v1.0.0": head, "v1.0.1": head}
+    assert repo.tags_containing_head(["v1.0.1"]) == ["v1.0.1"]
+
+
+def test_iter_commit_messages_streams_and_stops_early(fresh_git_repo):
+    for msg in ["feat: one", "fix: two", "fix: three"]:
+        subprocess.run(["git", "commit", "-q", "--allow-empty", "-m", msg], check=True)
+    repo = GitRepo(merge_strategy=MergeStrategy.ALWAYS)
+
+    assert list(repo.iter_commit_messages(since_tag=None)) == ["fix: three", "fix: two", "feat: one"]
+
+    stream = repo.iter_commit_messages(since_tag=None)
+    assert next(stream) == "fix: three"
+    stream.close()  # Stops git log without reading the rest
+
+
+def test_iter_commit_messages_exits_on_bad_range(fresh_git_repo):
+    subprocess.run(["git", "commit", "-q", "--allow-empty", "-m", "feat: one"], check=True)
+    repo = GitRepo(merge_strategy=MergeStrategy.ALWAYS)
+    with pytest.raises(SystemExit):
+        list(repo.iter_commit_messages(since_tag="v9.9.9"))
+
+
+@pytest.fixture
+def shallow_clone(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    subprocess.run(["git", "init", "-q", "-b", "main"], cwd=src, check=True)
+    subprocess.run(["git", "config", "user.email", "test@example.com"], cwd=src, check=True)
+    subprocess.run(["git", "config", "user.name", "Tester"], cwd=src, check=True)
+    for i in range(1, 121):
+        subprocess.run(["git", "commit", "-q", "--allow-empty", "-m", f"fix: {i}"], cwd=src, check=True)
+        if i in (20, 60):
+            subprocess.run(["git", "tag", f"v1.{i}.0"], cwd=src, check=True)
+    clone = tmp_path / "clone"
+    subprocess.run(["git", "clone", "-q", "--depth", "1", "--no-tags", src.as_uri(), str(clone)], check=True)
+    return clone
+
+
+def test_get_latest_tag_deepens_shallow_clone(shallow_clone):
+    from gitag.utils import timings as timing
+
+    repo = GitRepo(cwd=str(shallow_clone), deepen_step=10)
+    assert repo.is_shallow()
+
+    recorder = timing.Timings()
+    with timing.activate(recorder):
+        assert repo.get_latest_tag(fetch=False) == "v1.60.0"
+
+    deepens = [c["argv"][-1] for c in recorder.commands if c["argv"][1] == "fetch"]
+    assert deepens == ["--deepen=10", "--deepen=20", "--deepen=40"]  # 1 + 70 commits reach the tag 60 back
+    assert repo.is_shallow()  # Older history was never downloaded
+
+
+def test_get_latest_tag_without_deepen(shallow_clone):
+    repo = GitRepo(cwd=str(shallow_clone))
+    assert repo.get_latest_tag(fetch=False, deepen=False) == ""
+    assert repo.is_shallow()
+
+
+@pytest.fixture
+def cherry_picked_repo(tmp_path):
+    """A fix made on main is cherry-picked onto a release branch that is merged back afterwards."""
+    path = tmp_path / "picked"
+    path.mkdir()
+
+    def git(*args):
+        return subprocess.run(["git", *args], cwd=path, capture_output=True, text=True, check=True).stdout.strip()
+
+    git("init", "-q", "-b", "main")
+    git("config", "user.email", "test@example.com")
+    git("config", "user.name", "Tester")
+    (path / "a.txt").write_text("a\n")
+    git("add", ".")
+    git("commit", "-q", "-m", "feat: first")
+    git("tag", "v1.0.0")
+    git("branch", "release")
+    (path / "b.txt").write_text("fixed\n")
+    git("add", ".")
+    git("commit", "-q", "-m", "fix: bug")
+    fix = git("rev-parse", "HEAD")
+    git("checkout", "-q", "release")
+    (path / "c.txt").write_text("c\n")
+    git("add", ".")
+    git("commit", "-q", "-m", "fix: release only")
+    git("cherry-pick", fix)
+    git("checkout", "-q", "main")
+    git("merge", "-q", "--no-ff", "release", "-m", "Merge release")
+    return path
+
+
+def test_duplicate_subjects_from_one_patch_id_batch(cherry_picked_repo):
+    repo = GitRepo(cwd=str(cherry_picked_repo), merge_strategy=MergeStrategy.ALWAYS)
+    assert repo.get_commit_messages("v1.0.0").count("fix: bug") == 2
+    with mock.patch("gitag.utils.git_cmd.subprocess.Popen", wraps=subprocess.Popen) as popen:
+        assert repo.duplicate_subjects("v1.0.0") == {"fix: bug": 1}
+    assert [call.args[0][1] for call in popen.call_args_list] == ["log", "patch-id", "log"]
+
+    assert GitRepo(cwd=str(cherry_picked_repo)).duplicate_subjects("v1.0.0") == {}  # auto: release side only
+
+
+def test_duplicate_subjects_skipped_for_partial_clone(cherry_picked_repo, caplog):
+    repo = GitRepo(cwd=str(cherry_picked_repo), merge_strategy=MergeStrategy.ALWAYS)
+    with mock.patch("gitag.git_repo.partial_clone_filter", return_value="blob:none"):
+        assert repo.duplicate_subjects("v1.0.0") == {}
+    assert "cherry-pick detection needs file contents" in caplog.text
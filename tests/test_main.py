@@ -6,8 +6,10 @@ import pytest
 from gitag import main as main_module
 from gitag.main import detect_ci_context
 
+from conftest import commit, init_repo
 
-@mock.patch("gitag.main.GitAutoTagger")
+
+@mock.patch("gitag.auto_tagger.GitAutoTagger")
 def test_main_dry_run(mock_tagger):
     result = main_module.main(["--dry-run", "--no-merges", "--merge-strategy", "always"])
     assert result == 0
@@ -15,7 +17,7 @@ def test_main_dry_run(mock_tagger):
     mock_tagger.return_value.run.assert_called_once_with(dry_run=True, since_tag=None)
 
 
-@mock.patch("gitag.main.GitAutoTagger")
+@mock.patch("gitag.auto_tagger.GitAutoTagger")
 @mock.patch.dict(
     "os.environ",
     {"GITHUB_ACTIONS": "true", "GITHUB_EVENT_NAME": "pull_request", "GITHUB_REF": "refs/heads/feature-branch"},
@@ -30,7 +32,7 @@ def test_main_ci_detection_pr(mock_tagger):
     assert kwargs["debug"] is False
 
 
-@mock.patch("gitag.main.GitAutoTagger")
+@mock.patch("gitag.auto_tagger.GitAutoTagger")
 @mock.patch.dict("os.environ", {"GITHUB_ACTIONS": "true", "GITHUB_EVENT_NAME": "push", "GITHUB_REF": "refs/heads/main"})
 def test_main_ci_main_branch_enables_push(mock_tagger):
     result = main_module.main(["--ci"])
@@ -71,12 +73,12 @@ def test_detect_unknown_ci():
 
 def test_main_entrypoint(monkeypatch):
     monkeypatch.setattr("sys.argv", ["prog", "--dry-run"])
-    with mock.patch("gitag.main.GitAutoTagger") as mock_tagger:
+    with mock.patch("gitag.auto_tagger.GitAutoTagger") as mock_tagger:
         mock_tagger.return_value.run.return_value = None
         assert main_module.main() == 0
 
 
-@mock.patch("gitag.main.GitAutoTagger")
+@mock.patch("gitag.auto_tagger.GitAutoTagger")
 @mock.patch.dict("os.environ", {"GITHUB_ACTIONS": "true", "GITHUB_EVENT_NAME": "push", "GITHUB_REF": "refs/heads/dev"})
 def test_main_ci_non_main_branch_enables_dry_run(mock_tagger, caplog):
     caplog.set_level("INFO")
@@ -89,13 +91,19 @@ def test_main_ci_non_main_branch_enables_dry_run(mock_tagger, caplog):
 
 def test_main_as_entrypoint(monkeypatch):
     monkeypatch.setattr("sys.argv", ["prog", "--dry-run", "--no-merges"])
-    with mock.patch("gitag.main.GitAutoTagger") as mock_tagger:
+    with mock.patch("gitag.auto_tagger.GitAutoTagger") as mock_tagger:
         mock_tagger.return_value.run.return_value = None
         result = main_module.main()
         assert result == 0
 
 
-@mock.patch("gitag.main.GitAutoTagger")
+def test_help_lists_every_merge_strategy(capsys):
+    with pytest.raises(SystemExit):
+        main_module.main(["--help"])
+    assert "include: auto, always, merge_only, first_parent" in " ".join(capsys.readouterr().out.split())
+
+
+@mock.patch("gitag.auto_tagger.GitAutoTagger")
 def test_main_debug_logging_enabled(mock_tagger, caplog):
     caplog.set_level("DEBUG")
     result = main_module.main(["--dry-run", "--debug"])
@@ -103,15 +111,27 @@ def test_main_debug_logging_enabled(mock_tagger, caplog):
     assert "🔧 Debug logging enabled." in caplog.text
 
 
-@mock.patch("gitag.main.GitAutoTagger.run", side_effect=RuntimeError("boom"))
+@mock.patch("gitag.auto_tagger.GitAutoTagger.run", side_effect=RuntimeError("boom"))
 def test_main_debug_raises_exception(mock_run):
     with pytest.raises(RuntimeError, match="boom"):
         main_module.main(["--dry-run", "--debug"])
 
 
-@mock.patch("gitag.main.GitAutoTagger.run", side_effect=RuntimeError("boom"))
+@mock.patch("gitag.auto_tagger.GitAutoTagger.run", side_effect=RuntimeError("boom"))
 def test_main_exception_without_debug(mock_run, caplog):
     caplog.set_level("ERROR")
     result = main_module.main(["--dry-run"])  # kein --debug
     assert result == 1
     assert "❌ gitag failed: boom" in caplog.text
+
+
+@pytest.mark.parametrize("command", [["stats"], ["replay"], ["watch"], ["next-version", "--branches", "main"]])
+def test_subcommand_failures_return_1(command, tmp_path, monkeypatch, caplog):
+    path = init_repo(tmp_path / "repo")
+    commit(path, "feat: first")
+    (path / "pyproject.toml").write_text('[tool.gitag]\nbackend = "libgit3"\n')
+    monkeypatch.chdir(path)
+    assert main_module.main(command) == 1
+    assert f"gitag {command[0]} failed: Unknown git backend" in caplog.text
+    with pytest.raises(ValueError):
+        main_module.main([*command, "--debug"])
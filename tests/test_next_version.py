@@ -0,0 +1,83 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from gitag import main as main_module
+from gitag.next_version import compute_next_version
+from gitag.refs import find_git_dir, read_tags, resolve_ref
+
+from conftest import commit, git, init_repo
+
+
+@pytest.fixture
+def repo(tmp_path):
+    path = init_repo(tmp_path / "repo")
+    commit(path, "feat: first")
+    git(path, "tag", "v1.0.0")
+    commit(path, "feat: second")
+    return path
+
+
+def test_read_tags_and_resolve_ref(repo):
+    git_dir = find_git_dir(repo)
+    git(repo, "tag", "-a", "v1.1.0", "-m", "annotated")
+
+    tags = read_tags(git_dir)
+    assert tags["v1.0.0"] == git(repo, "rev-parse", "HEAD~1")
+    assert tags["v1.1.0"] == git(repo, "rev-parse", "v1.1.0")  # loose annotated: tag object
+    assert resolve_ref(git_dir, "HEAD") == git(repo, "rev-parse", "HEAD")
+
+    git(repo, "pack-refs", "--all")
+    tags = read_tags(git_dir)
+    assert tags["v1.1.0"] == git(repo, "rev-parse", "HEAD")  # packed annotated: peeled
+    assert resolve_ref(git_dir, "HEAD") == git(repo, "rev-parse", "HEAD")
+    assert resolve_ref(git_dir, "refs/heads/missing") is None
+
+
+def test_compute_next_version(repo):
+    result = compute_next_version(repo_path=str(repo))
+    assert result == {"next_version": "v1.1.0", "base_tag": "v1.0.0", "bump": "minor"}
+
+
+def test_compute_next_version_without_tags(tmp_path):
+    path = init_repo(tmp_path / "untagged")
+    commit(path, "fix: only")
+
+    result = compute_next_version(repo_path=str(path), pre="rc.1")
+    assert result == {"next_version": "v0.0.1-rc.1", "base_tag": None, "bump": "patch"}
+
+
+def test_compute_next_version_when_head_is_tagged(repo):
+    git(repo, "tag", "v1.1.0")
+    result = compute_next_version(repo_path=str(repo))
+    assert result == {"next_version": None, "base_tag": "v1.1.0", "bump": None}
+
+
+def test_next_version_command(repo, monkeypatch, capsys):
+    monkeypatch.chdir(repo)
+    assert main_module.main(["next-version"]) == 0
+    assert capsys.readouterr().out == "v1.1.0\n"
+
+    assert main_module.main(["next-version", "--json"]) == 0
+    assert json.loads(capsys.readouterr().out) == {"next_version": "v1.1.0", "base_tag": "v1.0.0", "bump": "minor"}
+
+    git(repo, "tag", "v1.1.0")
+    assert main_module.main(["next-version"]) == 2
+    assert capsys.readouterr().out == ""
+
+
+def test_next_version_skips_changelog_import(repo):
+    code = (
+        "import sys; from gitag.main import main; main(['next-version']); "
+        "print(*(m in sys.modules for m in ('gitag.changelog_writer', 'asyncio', 'gitag.auto_tagger', "
+        "'gitag.result_cache', 'gitag.tag_transaction')))"
+    )
+    env = {**os.environ, "PYTHONPATH": str(Path(main_module.__file__).parents[1])}
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=repo, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    assert out.splitlines()[-1] == "False False False False False"
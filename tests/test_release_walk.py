@@ -0,0 +1,84 @@
+from unittest import mock
+
+import pytest
+
+from gitag.auto_tagger import GitAutoTagger
+from gitag.config import BumpLevel, MergeStrategy
+from gitag.git_repo import GitRepo
+from gitag.release_walk import ReleaseWalk, merge_memo
+from gitag.version_manager import VersionManager
+
+from conftest import commit, git, init_repo
+
+pytestmark = pytest.mark.usefixtures("no_background_fetch")
+
+
+def _merge_branch(cwd, name, *messages):
+    git(cwd, "checkout", "-q", "-b", name)
+    for message in messages:
+        commit(cwd, message)
+    git(cwd, "checkout", "-q", "main")
+    git(cwd, "merge", "-q", "--no-ff", name, "-m", f"Merge branch '{name}'")
+
+
+@pytest.fixture
+def repo(tmp_path):
+    path = init_repo(tmp_path / "repo")
+    (path / "pyproject.toml").write_text('[tool.gitag]\nprefix = "v"\n')
+    git(path, "add", ".")
+    git(path, "commit", "-q", "-m", "feat: first")
+    git(path, "tag", "v1.0.0")
+    _merge_branch(path, "feature", "feat: new api", "fix: api typo")
+    commit(path, "docs: direct on main")
+    _merge_branch(path, "bugfix", "fix: crash")
+    return path
+
+
+def _walk(repo):
+    git_repo = GitRepo(cwd=str(repo), merge_strategy=MergeStrategy.FIRST_PARENT)
+    return ReleaseWalk(git_repo, VersionManager(str(repo / "pyproject.toml")), merge_memo(git_repo))
+
+
+def test_first_parent_covers_all_merges(repo):
+    latest_only = GitRepo(cwd=str(repo), merge_strategy=MergeStrategy.AUTO).get_commit_messages("v1.0.0")
+    assert latest_only == ["fix: crash"]
+
+    commits, bump = _walk(repo).run("v1.0.0")
+    assert commits == ["fix: crash", "docs: direct on main", "fix: api typo", "feat: new api"]
+    assert bump == BumpLevel.MINOR
+
+    git_repo = GitRepo(cwd=str(repo), merge_strategy=MergeStrategy.FIRST_PARENT)
+    assert git_repo.get_commit_messages("v1.0.0") == commits
+    assert list(git_repo.iter_commit_messages("v1.0.0")) == commits
+
+
+def test_merges_are_classified_once(repo):
+    _walk(repo).run("v1.0.0")
+    _merge_branch(repo, "breaking", "feat!: drop python 3.10")
+
+    walk = _walk(repo)
+    with mock.patch.object(walk.repo, "merged_commit_messages", wraps=walk.repo.merged_commit_messages) as merged:
+        commits, bump = walk.run("v1.0.0")
+    # Only the new merge and the direct commit are read; the two known merges come from the memo
+    assert [call.args[0].subject for call in merged.call_args_list] == [
+        "Merge branch 'breaking'",
+        "docs: direct on main",
+    ]
+    assert commits[0] == "feat!: drop python 3.10"
+    assert bump == BumpLevel.MAJOR
+
+
+def test_memo_invalidated_by_config_change(repo):
+    _walk(repo).run("v1.0.0")
+    (repo / "pyproject.toml").write_text('[tool.gitag]\nprefix = "v"\n[tool.gitag.patterns]\nmajor = ["^fix"]\n')
+    _, bump = _walk(repo).run("v1.0.0")
+    assert bump == BumpLevel.MAJOR
+
+
+def test_tagger_with_first_parent_strategy(repo):
+    tagger = GitAutoTagger(
+        repo_path=str(repo), config_path=str(repo / "pyproject.toml"), merge_strategy=MergeStrategy.FIRST_PARENT
+    )
+    assert tagger.run(dry_run=True) == "v1.1.0"
+    assert (repo / ".git" / "gitag" / "merge-memo.json").is_file()
+    assert git(repo, "status", "--porcelain") == ""
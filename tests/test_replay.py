@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+from gitag import main as main_module
+from gitag.backends import get_backend
+from gitag.config import BumpLevel
+from gitag.replay import Replay
+from gitag.version_manager import VersionManager
+
+from conftest import commit, git, init_repo
+
+
+def _merge_branch(cwd, name, *messages):
+    git(cwd, "checkout", "-q", "-b", name)
+    for message in messages:
+        commit(cwd, message)
+    git(cwd, "checkout", "-q", "main")
+    git(cwd, "merge", "-q", "--no-ff", name, "-m", f"Merge branch '{name}'")
+
+
+@pytest.fixture
+def repo(tmp_path):
+    path = init_repo(tmp_path / "repo")
+    (path / "pyproject.toml").write_text('[tool.gitag]\nprefix = "v"\n')
+    git(path, "add", ".")
+    git(path, "commit", "-q", "-m", "chore: init")
+    git(path, "tag", "v1.0.0")
+    _merge_branch(path, "feature", "feat: new api", "fix: api typo")
+    commit(path, "docs: direct on main")
+    _merge_branch(path, "bugfix", "fix: crash")
+    _merge_branch(path, "breaking", "feat!: drop python 3.8")
+    commit(path, "chore: unreleased")
+    return path
+
+
+def _replay(repo, **kwargs):
+    return Replay(get_backend(cwd=str(repo)), VersionManager(str(repo / "pyproject.toml")), **kwargs)
+
+
+def test_replay_releases_at_each_merge(repo):
+    releases = list(_replay(repo).run(since="v1.0.0"))
+    assert [(r.version, r.bump, r.commits) for r in releases] == [
+        ("v1.1.0", BumpLevel.MINOR, 2),
+        ("v1.1.1", BumpLevel.PATCH, 2),  # The direct docs commit is released with the next merge
+        ("v2.0.0", BumpLevel.MAJOR, 1),
+    ]
+    assert releases[-1].subject == "Merge branch 'breaking'"
+    assert releases[-1].sha == git(repo, "rev-parse", "HEAD^")
+
+
+def test_replay_from_root_and_every_commit(repo):
+    assert [r.version for r in _replay(repo).run()][-1] == "v1.0.0"
+    every = [r.version for r in _replay(repo, every_commit=True).run(since="v1.0.0", version="v3.0.0")]
+    assert every == ["v3.1.0", "v3.1.1", "v3.1.2", "v4.0.0", "v4.0.1"]
+
+
+def test_replay_releases_each_branch_commit_once(repo):
+    base = git(repo, "rev-parse", "HEAD")
+    git(repo, "checkout", "-q", "-b", "topic")
+    commit(repo, "fix: first half")
+    git(repo, "checkout", "-q", "-b", "nested")
+    commit(repo, "feat: nested")
+    git(repo, "checkout", "-q", "topic")
+    git(repo, "merge", "-q", "--no-ff", "nested", "-m", "Merge branch 'nested' into topic")
+    git(repo, "checkout", "-q", "main")
+    git(repo, "merge", "-q", "--no-ff", "topic", "-m", "Merge branch 'topic'")
+    git(repo, "checkout", "-q", "topic")
+    commit(repo, "fix: second half")
+    git(repo, "checkout", "-q", "main")
+    git(repo, "merge", "-q", "--no-ff", "topic", "-m", "Merge branch 'topic' again")
+
+    releases = [(r.version, r.bump, r.commits) for r in _replay(repo).run(since=base, version="v2.0.0")]
+    assert releases == [("v2.1.0", BumpLevel.MINOR, 3), ("v2.1.1", BumpLevel.PATCH, 1)]
+    releases = [r.commits for r in _replay(repo, include_merges=False).run(since=base, version="v2.0.0")]
+    assert releases == [2, 1]
+
+
+def test_replay_command_creates_tags_in_one_transaction(repo, monkeypatch, capsys):
+    monkeypatch.chdir(repo)
+    assert main_module.main(["replay", "--from", "v1.0.0", "--json", "--tag"]) == 0
+    captured = capsys.readouterr()
+    data = json.loads(captured.out)
+    assert "Created 3 tag(s)." in captured.err
+    assert [r["version"] for r in data] == ["v1.1.0", "v1.1.1", "v2.0.0"]
+    assert git(repo, "rev-parse", "v2.0.0^{commit}") == git(repo, "rev-parse", "HEAD^")
+
+    assert main_module.main(["replay", "--from", "v1.0.0", "--tag"]) == 1  # Tags exist: nothing is written
+    assert git(repo, "tag").split() == ["v1.0.0", "v1.1.0", "v1.1.1", "v2.0.0"]
+
+
+def test_replay_command_rejects_push_without_tag(repo, monkeypatch, capsys):
+    monkeypatch.chdir(repo)
+    with pytest.raises(SystemExit) as info:
+        main_module.main(["replay", "--push"])
+    assert info.value.code == 2
+    assert "--push requires --tag" in capsys.readouterr().err
@@ -0,0 +1,104 @@
+from unittest import mock
+
+import pytest
+
+from gitag import main as main_module
+from gitag.auto_tagger import GitAutoTagger
+from gitag.result_cache import ResultCache
+
+from conftest import git, init_repo
+
+pytestmark = pytest.mark.usefixtures("no_background_fetch")
+
+
+@pytest.fixture
+def repo(tmp_path):
+    path = init_repo(tmp_path / "repo")
+    (path / "pyproject.toml").write_text('[tool.gitag]\nprefix = "v"\n')
+    git(path, "add", ".")
+    git(path, "commit", "-q", "-m", "feat: first")
+    git(path, "tag", "v1.0.0")
+    git(path, "commit", "-q", "--allow-empty", "-m", "feat: second")
+    git(path, "commit", "-q", "--allow-empty", "-m", "fix: third")
+    return path
+
+
+def _tagger(repo, cache, **kwargs):
+    return GitAutoTagger(repo_path=str(repo), config_path=str(repo / "pyproject.toml"), cache_path=str(cache), **kwargs)
+
+
+def test_key_tracks_head_tags_config_and_options(repo):
+    config = str(repo / "pyproject.toml")
+    key = ResultCache.key(str(repo), config, pre=None)
+
+    assert ResultCache.key(str(repo), config, pre=None) == key
+    assert ResultCache.key(str(repo), config, pre="rc.1") != key
+
+    git(repo, "tag", "other", "HEAD~1")
+    tagged = ResultCache.key(str(repo), config, pre=None)
+    assert tagged != key
+
+    (repo / "pyproject.toml").write_text('[tool.gitag]\nprefix = ""\n')
+    assert ResultCache.key(str(repo), config, pre=None) != tagged
+
+    git(repo, "commit", "-q", "--allow-empty", "-m", "fix: more")
+    assert ResultCache.key(str(repo), config, pre=None) not in (key, tagged)
+
+
+def test_key_outside_repository(tmp_path):
+    assert ResultCache.key(str(tmp_path), None) is None
+
+
+def test_run_stores_and_reuses_result(repo, tmp_path):
+    cache = tmp_path / "cache" / "gitag.json"
+    assert _tagger(repo, cache).run(dry_run=True) == "v1.1.0"
+
+    entry = next(iter(ResultCache(str(cache))._load().values()))
+    assert entry["base_tag"] == "v1.0.0"
+    assert entry["bump"] == "minor"
+    assert entry["commits"] == ["fix: third", "feat: second"]
+    assert entry["categorized"]["minor"] == ["feat: second"]
+
+    tagger = _tagger(repo, cache, changelog=True)
+    tagger.repo.get_commit_messages = mock.Mock(side_effect=AssertionError("history must not be read"))
+    tagger.repo.get_latest_tag = mock.Mock(side_effect=AssertionError("history must not be read"))
+    tagger.changelog_writer.write = mock.Mock()
+    assert tagger.run(dry_run=True) == "v1.1.0"
+    tagger.changelog_writer.write.assert_called_once_with(tag="v1.1.0", categorized_commits=entry["categorized"])
+
+
+def test_run_recomputes_after_new_commit(repo, tmp_path):
+    cache = tmp_path / "gitag.json"
+    assert _tagger(repo, cache).run(dry_run=True) == "v1.1.0"
+    git(repo, "commit", "-q", "--allow-empty", "-m", "feat!: breaking")
+    assert _tagger(repo, cache).run(dry_run=True) == "v2.0.0"
+    assert len(ResultCache(str(cache))._load()) == 2
+
+
+def test_cached_run_with_every_commit_deduplicated(repo, tmp_path):
+    tagger = _tagger(repo, tmp_path / "gitag.json", dedup_cherry_picks=True)
+    tagger.repo.duplicate_subjects = mock.Mock(return_value={"feat: second": 1, "fix: third": 1})
+    assert tagger.run(dry_run=True) == "v1.0.1"
+
+
+def test_cached_no_commits(repo, tmp_path):
+    cache = tmp_path / "gitag.json"
+    git(repo, "tag", "v1.1.0")
+    assert _tagger(repo, cache).run(dry_run=True) is None
+    assert _tagger(repo, cache).run(dry_run=True) is None
+
+
+def test_corrupt_cache_is_ignored(repo, tmp_path, caplog):
+    cache = tmp_path / "gitag.json"
+    cache.write_text("{not json")
+    with caplog.at_level("WARNING"):
+        assert _tagger(repo, cache).run(dry_run=True) == "v1.1.0"
+    assert "Ignoring unreadable result cache" in caplog.text
+    assert ResultCache(str(cache))._load()
+
+
+def test_cache_option(repo, tmp_path, monkeypatch):
+    monkeypatch.chdir(repo)
+    cache = tmp_path / "gitag.json"
+    assert main_module.main(["--dry-run", "--cache", str(cache)]) == 0
+    assert cache.exists()
@@ -0,0 +1,218 @@
+import json
+import os
+import socket
+import threading
+import urllib.request
+from unittest import mock
+
+import pytest
+
+from gitag import main as main_module
+from gitag.config import MergeStrategy
+from gitag.git_repo import GitRepo
+from gitag.refs import find_git_dir, refs_fingerprint
+from gitag.server import LRUCache, VersionService, create_server
+
+from conftest import commit, git, init_repo
+
+
+@pytest.fixture
+def repo(tmp_path):
+    path = init_repo(tmp_path / "repo")
+    commit(path, "feat: first")
+    git(path, "tag", "v1.0.0")
+    commit(path, "fix: second")
+    return path
+
+
+def test_find_git_dir_and_worktree(repo, tmp_path):
+    (repo / "sub").mkdir()
+    assert find_git_dir(str(repo / "sub")) == repo / ".git"
+    git(repo, "worktree", "add", "-q", str(tmp_path / "wt"))
+    wt_git_dir = find_git_dir(str(tmp_path / "wt"))
+    assert wt_git_dir.parent == repo / ".git" / "worktrees"
+    assert find_git_dir(str(tmp_path)) is None
+
+
+def test_fingerprint_changes_with_refs(repo):
+    git_dir = find_git_dir(str(repo))
+    before = refs_fingerprint(git_dir)
+    assert refs_fingerprint(git_dir) == before
+    git(repo, "tag", "v1.0.1")
+    assert refs_fingerprint(git_dir) != before
+
+
+def test_query_next_version_and_changelog(repo):
+    service = VersionService()
+    result = service.query(str(repo))
+    assert result == {
+        "repo": str(repo),
+        "ref": "HEAD",
+        "base_tag": "v1.0.0",
+        "next_version": "v1.0.1",
+        "bump": "patch",
+        "commits": 1,
+    }
+    entry = service.query(str(repo), changelog=True)["changelog"]
+    assert entry.startswith("## v1.0.1")
+    assert "- fix: second" in entry
+
+
+def test_query_at_other_ref(repo):
+    git(repo, "checkout", "-q", "-b", "feature")
+    commit(repo, "feat: on feature")
+    git(repo, "checkout", "-q", "main")
+    result = VersionService().query(str(repo), ref="feature")
+    assert result["next_version"] == "v1.1.0"
+    assert result["commits"] == 2
+
+
+def test_query_is_cached_until_refs_change(repo):
+    service = VersionService()
+    with mock.patch.object(service, "_compute", wraps=service._compute) as compute:
+        service.query(str(repo))
+        service.query(str(repo), changelog=True)
+        assert compute.call_count == 1
+
+        commit(repo, "feat: third")
+        assert service.query(str(repo))["next_version"] == "v1.1.0"
+        assert compute.call_count == 2
+
+
+def test_classifications_are_memoized(repo):
+    service = VersionService()
+    service.query(str(repo))
+    versioning = service._versioning(str(repo))
+    commit(repo, "feat: third")
+    original = versioning.strategy
+    versioning.strategy = strategy = mock.Mock(wraps=original)
+    try:
+        service.query(str(repo))
+    finally:
+        versioning.strategy = original
+    strategy.assert_called_once_with("feat: third")
+
+
+def test_config_reloaded_when_changed(repo):
+    service = VersionService()
+    first = service._versioning(str(repo))
+    assert service._versioning(str(repo)) is first
+    (repo / "pyproject.toml").write_text('[tool.gitag]\nprefix = "release-"\n')
+    assert service._versioning(str(repo)) is not first
+    assert service.query(str(repo))["next_version"] == "release-1.0.1"
+
+
+def test_query_rejects_non_repo(tmp_path):
+    with pytest.raises(ValueError, match="Not a git repository"):
+        VersionService().query(str(tmp_path))
+
+
+def test_query_without_new_commits(repo):
+    git(repo, "tag", "v1.0.1")
+    result = VersionService().query(str(repo), changelog=True)
+    assert result["next_version"] is None
+    assert result["changelog"] == ""
+
+
+@pytest.fixture
+def http_server():
+    server = create_server(VersionService(), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _get(url):
+    try:
+        with urllib.request.urlopen(url) as response:
+            return response.status, response.read().decode()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read().decode()
+
+
+def test_http_endpoints(repo, http_server):
+    assert _get(f"{http_server}/health") == (200, '{"status": "ok"}\n')
+
+    status, body = _get(f"{http_server}/next-version?repo={repo}")
+    assert status == 200
+    assert json.loads(body)["next_version"] == "v1.0.1"
+
+    assert _get(f"{http_server}/next-version?repo={repo}&format=text") == (200, "v1.0.1\n")
+    status, body = _get(f"{http_server}/changelog?repo={repo}&format=text")
+    assert body.startswith("## v1.0.1")
+
+
+def test_http_errors(repo, tmp_path, http_server):
+    assert _get(f"{http_server}/nope")[0] == 404
+    assert _get(f"{http_server}/next-version")[0] == 400
+    assert _get(f"{http_server}/next-version?repo={tmp_path / 'missing'}")[0] == 400
+    status, body = _get(f"{http_server}/next-version?repo={repo}&ref=no-such-branch")
+    assert status == 400
+    assert "Unknown ref" in body
+
+
+@pytest.mark.parametrize("strategy", [MergeStrategy.ALWAYS, MergeStrategy.AUTO])
+def test_ref_cannot_inject_git_options(repo, tmp_path, strategy):
+    target = tmp_path / "written"
+    target.write_text("keep")
+    service = VersionService(merge_strategy=strategy)
+    with pytest.raises(ValueError, match="Invalid ref"):
+        service.query(str(repo), ref=f"--output={target}")
+    git(repo, "branch", "topic")
+    with mock.patch("gitag.server.GitRepo", wraps=GitRepo) as git_repo:
+        assert service.query(str(repo), ref="topic")["ref"] == "topic"
+    assert git_repo.call_args.kwargs["rev"] == git(repo, "rev-parse", "topic")
+    assert target.read_text() == "keep"
+
+
+def test_lru_cache_is_bounded():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # Now most recently used
+    cache.put("c", 3)
+    assert (cache.get("a"), cache.get("b"), cache.get("c"), len(cache)) == (1, None, 3, 2)
+
+
+def test_caches_keyed_by_config_path_and_mtime(repo):
+    service = VersionService()
+    service.query(str(repo))
+    config = str(repo / "pyproject.toml")
+    old_key, _ = service._load_config(str(repo))
+    assert old_key == (config, None)  # No config file yet
+    (repo / "pyproject.toml").write_text('[tool.gitag]\nprefix = "v"\n')
+    new_key, _ = service._load_config(str(repo))
+    assert new_key == (config, os.stat(config).st_mtime_ns)
+    assert service._levels.get(old_key) is None  # Memo of the replaced config is dropped
+    service.query(str(repo))
+    assert len(service._results) == 2
+
+
+def test_unix_socket_server(repo, tmp_path):
+    socket_path = str(tmp_path / "gitag.sock")
+    (tmp_path / "gitag.sock").write_text("stale")
+    server = create_server(VersionService(), socket_path=socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(socket_path)
+            client.sendall(f"GET /next-version?repo={repo}&format=text HTTP/1.0\r\n\r\n".encode())
+            response = b""
+            while chunk := client.recv(4096):
+                response += chunk
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert response.startswith(b"HTTP/1.0 200")
+    assert response.endswith(b"\r\n\r\nv1.0.1\n")
+
+
+def test_serve_command(tmp_path):
+    with mock.patch("gitag.server.serve") as serve:
+        assert main_module.main(["serve", "--socket", str(tmp_path / "s.sock"), "--merge-strategy", "always"]) == 0
+    service = serve.call_args[0][0]
+    assert service.merge_strategy == "always"
+    assert serve.call_args[1]["socket_path"] == str(tmp_path / "s.sock")
@@ -0,0 +1,103 @@
+import itertools
+import json
+import os
+from unittest import mock
+
+import pytest
+
+from gitag import main as main_module
+from gitag.backends import get_backend
+from gitag.stats import UNRELEASED, collect_stats, format_stats
+from gitag.version_manager import VersionManager
+
+from conftest import commit, git, init_repo
+
+
+def _commit(cwd, message, day):
+    commit(cwd, message, date=f"2024-01-{day:02d}T12:00:00+00:00")
+
+
+@pytest.fixture
+def repo(tmp_path):
+    path = init_repo(tmp_path / "repo")
+    _commit(path, "feat(core): first", 1)
+    _commit(path, "fix: typo", 2)
+    git(path, "tag", "v1.0.0")
+    _commit(path, "feat(api)!: new api", 5)
+    git(path, "tag", "-a", "v2.0.0", "-m", "release")
+    _commit(path, "fix(api): crash", 6)
+    _commit(path, "update readme", 7)
+    return path
+
+
+def test_collect_stats_per_release(repo, tmp_path):
+    versioning = VersionManager(str(tmp_path / "missing.toml"))
+    data = collect_stats(get_backend(cwd=str(repo)), versioning).to_dict()
+
+    assert data["commits"] == 5
+    assert [(r["tag"], r["commits"], r["bump"]) for r in data["releases"]] == [
+        (UNRELEASED, 2, "patch"),
+        ("v2.0.0", 1, "major"),
+        ("v1.0.0", 2, "minor"),
+    ]
+    v2, v1 = data["releases"][1:]
+    assert v2["date"] == "2024-01-05" and v2["days_since_previous"] == 3.0
+    assert v1["days_since_previous"] is None
+    assert v1["bumps"] == {"major": 0, "minor": 1, "patch": 1}
+    assert data["types"] == {"fix": 2, "feat": 2, "(none)": 1}
+    assert data["scopes"] == {"api": 2, "core": 1}
+
+
+def test_format_stats(repo, tmp_path):
+    data = collect_stats(get_backend(cwd=str(repo)), VersionManager(str(tmp_path / "missing.toml"))).to_dict(top=1)
+    text = format_stats(data)
+    assert "v2.0.0" in text and "2024-01-05" in text
+    assert "5 commits, 2 releases" in text
+    assert "Scopes: api 2" in text
+
+
+def test_stats_command_json(repo, monkeypatch, capsys):
+    monkeypatch.chdir(repo)
+    assert main_module.main(["stats", "--json", "--top", "0"]) == 0
+    data = json.loads(capsys.readouterr().out)
+    assert data["releases"][0]["tag"] == UNRELEASED
+
+
+def test_stats_command_bad_rev(repo, monkeypatch):
+    monkeypatch.chdir(repo)
+    assert main_module.main(["stats", "--rev", "no-such-branch"]) == 1
+
+
+def test_stats_command_reports_exceeded_budget(repo, monkeypatch, caplog):
+    monkeypatch.chdir(repo)
+    (repo / "pyproject.toml").write_text("[tool.gitag]\nclassification_budget = 0.000001\n")
+    with mock.patch("time.perf_counter", side_effect=itertools.count()):  # Every message takes 1s
+        assert main_module.main(["stats"]) == 1
+    assert "exceeded the 1e-06s budget" in caplog.text
+
+
+def test_commits_belong_to_the_first_release_containing_them(tmp_path):
+    path = init_repo(tmp_path / "branched")
+    _commit(path, "feat: first", 1)
+    git(path, "tag", "v0.1.0")
+    git(path, "branch", "maint")
+    _commit(path, "feat: only in v0.2.0", 3)  # Older than v0.1.1, but not part of it
+    git(path, "checkout", "-q", "maint")
+    _commit(path, "fix: backport", 4)
+    git(path, "tag", "v0.1.1")
+    git(path, "checkout", "-q", "main")
+    date = "2024-01-05T12:00:00+00:00"
+    env = {**os.environ, "GIT_AUTHOR_DATE": date, "GIT_COMMITTER_DATE": date}
+    git(path, "merge", "-q", "--no-ff", "maint", "-m", "Merge maint", env=env)
+    git(path, "tag", "v0.2.0")
+
+    data = collect_stats(get_backend(cwd=str(path)), VersionManager(str(tmp_path / "missing.toml"))).to_dict()
+    assert [(r["tag"], r["commits"], r["bump"]) for r in data["releases"]] == [
+        ("v0.2.0", 2, "minor"),
+        ("v0.1.1", 1, "patch"),
+        ("v0.1.0", 1, "minor"),
+    ]
+    no_merges = collect_stats(
+        get_backend(cwd=str(path)), VersionManager(str(tmp_path / "missing.toml")), include_merges=False
+    ).to_dict()
+    assert [r["commits"] for r in no_merges["releases"]] == [1, 1, 1]
@@ -0,0 +1,74 @@
+import subprocess
+
+import pytest
+
+from gitag.config import BumpLevel
+from gitag.next_version import compute_next_version
+from gitag.tag_index import SemverIndex, needs_counter
+from gitag.version_manager import VersionManager
+
+
+@pytest.fixture
+def versioning(tmp_path):
+    config = tmp_path / "pyproject.toml"
+    config.write_text('[tool.gitag]\nprefix = "v"\n')
+    return VersionManager(str(config))
+
+
+@pytest.mark.parametrize(
+    "pre, expected",
+    [("rc", True), ("nightly", True), ("rc1", True), ("rc.1", False), ("alpha.0", False), (None, False)],
+)
+def test_needs_counter(pre, expected):
+    assert needs_counter(pre) is expected
+
+
+def test_latest_number_uses_numeric_order(versioning):
+    tags = ["v1.2.0", "v1.2.0-rc.2", "v1.2.0-rc.10", "v1.2.0-rc.9", "v1.2.0-beta.40", "v1.3.0-rc.7", "v1.2.0-rc"]
+    index = SemverIndex(versioning, tags)
+    assert index.latest_number((1, 2, 0), "rc") == 10
+    assert index.latest_number((1, 2, 0), "beta") == 40
+    assert index.latest_number((1, 1, 0), "rc") is None
+    assert index.next_pre((1, 3, 0), "rc") == "rc.8"
+    assert index.next_pre((2, 0, 0), "rc") == "rc.1"
+
+    index.add("v1.3.0-rc.8")
+    assert index.next_pre((1, 3, 0), "rc") == "rc.9"
+
+
+def test_bump_version_numbers_bare_label(versioning):
+    index = SemverIndex(versioning, [f"v1.3.0-nightly.{n}" for n in range(1, 20001)])
+    assert versioning.bump_version("v1.2.5", BumpLevel.MINOR, pre="nightly", pre_index=index) == "v1.3.0-nightly.20001"
+    assert versioning.bump_version("v1.2.5", BumpLevel.MINOR, pre="nightly.3", pre_index=index) == "v1.3.0-nightly.3"
+    assert versioning.bump_version("v1.2.5", BumpLevel.MINOR, pre="rc", build="7", pre_index=index) == "v1.3.0-rc.1+7"
+    assert versioning.bump_version("v1.2.5", BumpLevel.MINOR, pre="rc") == "v1.3.0-rc"  # No index: label as given
+
+
+def test_bump_continues_pre_release_series(versioning):
+    index = SemverIndex(versioning, ["v1.0.1-rc.1", "v1.0.1-rc.2"])
+    assert versioning.bump_version("v1.0.1-rc.2", BumpLevel.PATCH, pre="rc", pre_index=index) == "v1.0.1-rc.3"
+    assert versioning.bump_version("v1.0.1-rc.2", BumpLevel.MINOR, pre="rc", pre_index=index) == "v1.1.0-rc.1"
+    assert versioning.bump_version("v1.1.0-rc.2", BumpLevel.MINOR, pre="rc", pre_index=index) == "v1.1.0-rc.1"
+    assert versioning.bump_version("v2.0.0-rc.1", BumpLevel.MAJOR, pre="rc", pre_index=index) == "v2.0.0-rc.1"
+    assert versioning.bump_version("v1.0.1-rc.2", BumpLevel.PATCH) == "v1.0.2"  # Unchanged without a counter
+
+
+def test_compute_next_version_increments_rc(tmp_path):
+    path = tmp_path / "repo"
+    path.mkdir()
+
+    def git(*args):
+        subprocess.run(["git", *args], cwd=path, capture_output=True, check=True)
+
+    git("init", "-q", "-b", "main")
+    git("config", "user.email", "test@example.com")
+    git("config", "user.name", "Tester")
+    git("commit", "-q", "--allow-empty", "-m", "feat: first")
+    git("tag", "v1.0.0")
+    git("commit", "-q", "--allow-empty", "-m", "fix: second")
+    git("tag", "v1.0.1-rc.1")
+    git("commit", "-q", "--allow-empty", "-m", "fix: third")
+
+    config = str(tmp_path / "none.toml")
+    assert compute_next_version(repo_path=str(path), pre="rc", config_path=config)["next_version"] == "v1.0.1-rc.2"
+    assert compute_next_version(repo_path=str(path), pre="beta", config_path=config)["next_version"] == "v1.0.1-beta.1"
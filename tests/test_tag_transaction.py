@@ -0,0 +1,120 @@
+import subprocess
+from unittest import mock
+
+import pytest
+
+from gitag.git_repo import GitRepo
+from gitag.tag_transaction import TagTransaction, is_push_rejection
+
+from conftest import git, init_repo
+
+
+@pytest.fixture
+def repo_with_remote(tmp_path):
+    remote = tmp_path / "remote.git"
+    subprocess.run(["git", "init", "-q", "--bare", str(remote)], check=True)
+    work = init_repo(tmp_path / "work")
+    git(work, "remote", "add", "origin", str(remote))
+    (work / "a.txt").write_text("a")
+    git(work, "add", ".")
+    git(work, "commit", "-q", "-m", "feat: first")
+    return work, remote
+
+
+def test_commit_creates_and_moves_tags(repo_with_remote):
+    work, _ = repo_with_remote
+    first = git(work, "rev-parse", "HEAD")
+    git(work, "tag", "v1")
+    (work / "b.txt").write_text("b")
+    git(work, "add", ".")
+    git(work, "commit", "-q", "-m", "fix: second")
+    head = git(work, "rev-parse", "HEAD")
+
+    tx = GitRepo(cwd=str(work)).tag_transaction()
+    tx.add("v1.0.1").add("v1", force=True).add("v1.0.0", target=first)
+    assert tx.commit() == {"v1.0.1": head, "v1": head, "v1.0.0": first}
+    assert git(work, "rev-parse", "v1") == head
+    assert git(work, "rev-parse", "v1.0.0") == first
+
+
+def test_commit_is_atomic(repo_with_remote):
+    work, _ = repo_with_remote
+    git(work, "tag", "v1.0.0")
+
+    tx = TagTransaction(cwd=str(work)).add("v1.0.1").add("v1.0.0")  # v1.0.0 exists, not forced
+    with pytest.raises(subprocess.CalledProcessError):
+        tx.commit()
+    assert git(work, "tag") == "v1.0.0"
+
+
+def test_push_is_single_atomic_push(repo_with_remote):
+    work, remote = repo_with_remote
+    tx = TagTransaction(cwd=str(work)).add("v1.0.0").add("v1", force=True)
+    tx.commit()
+    tx.push()
+    assert sorted(git(remote, "tag").split()) == ["v1", "v1.0.0"]
+
+
+def test_empty_transaction_is_noop():
+    with mock.patch("subprocess.run") as mocked:
+        tx = TagTransaction()
+        assert tx.commit() == {}
+        tx.push()
+        mocked.assert_not_called()
+
+
+def test_refspecs_mark_forced_tags():
+    tx = TagTransaction().add("v1.4.2").add("v1.4", force=True)
+    assert tx.tags == ["v1.4.2", "v1.4"]
+    assert tx.refspecs() == ["refs/tags/v1.4.2", "+refs/tags/v1.4"]
+
+
+def test_push_retries_transient_failures():
+    transient = subprocess.CalledProcessError(128, "git push", stderr="fatal: unable to access: Could not resolve host")
+    with mock.patch("subprocess.run", side_effect=[transient, transient, None]) as mocked:
+        with mock.patch("time.sleep") as sleep:
+            TagTransaction(retries=3, backoff=0.5).add("v1.0.0").push()
+    assert mocked.call_count == 3
+    assert [c[0][0] for c in sleep.call_args_list] == [0.5, 1.0]
+    cmd = mocked.call_args[0][0]
+    assert cmd[:3] == ["git", "push", "--atomic"]
+
+
+def test_push_does_not_retry_rejections():
+    rejected = subprocess.CalledProcessError(1, "git push", stderr="! [rejected] v1.0.0 -> v1.0.0 (already exists)")
+    with mock.patch("subprocess.run", side_effect=rejected) as mocked, mock.patch("time.sleep"):
+        with pytest.raises(subprocess.CalledProcessError):
+            TagTransaction().add("v1.0.0").push()
+    assert mocked.call_count == 1
+
+
+def test_push_gives_up_after_retries():
+    transient = subprocess.CalledProcessError(128, "git push", stderr="error: RPC failed; HTTP 503")
+    with mock.patch("subprocess.run", side_effect=transient) as mocked, mock.patch("time.sleep"):
+        with pytest.raises(subprocess.CalledProcessError):
+            TagTransaction(retries=2).add("v1.0.0").push()
+    assert mocked.call_count == 3
+
+
+def test_commit_rejects_unknown_target(repo_with_remote):
+    work, _ = repo_with_remote
+    with pytest.raises(ValueError, match="no-such-ref"):
+        TagTransaction(cwd=str(work)).add("v1.0.0", target="no-such-ref").commit()
+
+
+def test_lease_push_rejected_then_rollback(repo_with_remote):
+    work, remote = repo_with_remote
+    git(work, "tag", "v1.0.0")
+    git(work, "push", "-q", "origin", "v1.0.0")
+    git(work, "tag", "-d", "v1.0.0")
+    git(work, "commit", "-q", "--allow-empty", "-m", "fix: other")
+
+    tx = TagTransaction(cwd=str(work)).add("v1.0.0")
+    tx.commit()
+    with pytest.raises(subprocess.CalledProcessError) as excinfo:
+        tx.push(lease=True)
+    assert is_push_rejection(excinfo.value)
+
+    tx.rollback()
+    assert git(work, "tag") == ""
+    tx.rollback()  # nothing left to roll back
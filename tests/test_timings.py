@@ -0,0 +1,71 @@
+import json
+import subprocess
+from unittest import mock
+
+import pytest
+
+from gitag import main as main_module
+from gitag.utils import timings as timing
+
+
+def test_phase_and_commands_recorded_only_when_active():
+    with timing.phase("ignored"):
+        pass
+    timing.record_command(["git", "status"], 0.0, 0)
+
+    recorder = timing.Timings()
+    with timing.activate(recorder):
+        with timing.phase("log"):
+            timing.timed_run(["git", "--version"], capture_output=True)
+        with pytest.raises(subprocess.CalledProcessError):
+            timing.timed_run(["git", "no-such-command"], capture_output=True, check=True)
+    assert timing.current() is None
+
+    report = recorder.to_dict()
+    assert [p["name"] for p in report["phases"]] == ["log"]
+    assert [c["argv"][1] for c in report["commands"]] == ["--version", "no-such-command"]
+    assert report["commands"][0]["returncode"] == 0
+    assert report["commands"][1]["returncode"] == 1
+    assert report["summary"]["git_commands"] == 2
+
+
+def test_write_to_file_and_stderr(tmp_path, capsys):
+    recorder = timing.Timings()
+    recorder.add_command(["git", "log"], recorder.origin, recorder.origin + 0.5, mock.Mock())
+    recorder.write(str(tmp_path / "t.json"))
+    data = json.loads((tmp_path / "t.json").read_text())
+    assert data["commands"][0] == {"argv": ["git", "log"], "start": 0.0, "duration": 0.5, "returncode": None}
+
+    recorder.write()
+    assert json.loads(capsys.readouterr().err)["summary"]["git_time"] == 0.5
+
+
+@pytest.fixture
+def tagged_repo(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for args in (["init", "-q"], ["config", "user.email", "t@example.com"], ["config", "user.name", "T"]):
+        subprocess.run(["git", *args], check=True)
+    subprocess.run(["git", "commit", "-q", "--allow-empty", "-m", "feat: one"], check=True)
+    subprocess.run(["git", "tag", "v1.0.0"], check=True)
+    subprocess.run(["git", "commit", "-q", "--allow-empty", "-m", "fix: two"], check=True)
+    return tmp_path
+
+
+def test_cli_timings_report(tagged_repo):
+    out = tagged_repo / "timings.json"
+    assert main_module.main(["--changelog", "--timings", str(out)]) == 0
+
+    report = json.loads(out.read_text())
+    phases = {p["name"] for p in report["phases"]}
+    assert {"fetch", "fetch-wait", "latest-tag", "merge-detection", "log", "classify", "changelog", "tag"} <= phases
+    argvs = [c["argv"][:2] for c in report["commands"]]
+    assert ["git", "fetch"] in argvs
+    assert ["git", "describe"] in argvs
+    assert ["git", "log"] in argvs
+    assert report["summary"]["git_commands"] == len(report["commands"])
+
+
+def test_cli_timings_written_on_failure(tagged_repo, capsys):
+    with mock.patch("gitag.auto_tagger.GitAutoTagger.run", side_effect=RuntimeError("boom")):
+        assert main_module.main(["--timings"]) == 1
+    assert "phases" in json.loads(capsys.readouterr().err)
@@ -2,8 +2,9 @@ from pathlib import Path
 
 import pytest
 
+from gitag.commit_store import CommitStore
 from gitag.config import BumpLevel
-from gitag.version_manager import VersionManager
+from gitag.version_manager import ClassificationBudgetExceeded, VersionManager
 
 
 @pytest.fixture(autouse=True)
@@ -50,6 +51,21 @@ def test_pattern_strategy_detection():
     assert vm.determine_bump(["feat: new", "BREAKING CHANGE: boom"]) == BumpLevel.MAJOR
 
 
+def test_highest_bump_stops_at_major():
+    vm = create_vm()
+    consumed = []
+
+    def stream():
+        for msg in ["fix: a", "feat: b", "feat!: c", "fix: d"]:
+            consumed.append(msg)
+            yield msg
+
+    assert vm.highest_bump(stream()) == BumpLevel.MAJOR
+    assert consumed == ["fix: a", "feat: b", "feat!: c"]
+    assert vm.highest_bump([]) is None
+    assert vm.determine_bump([]) == BumpLevel.PATCH
+
+
 def test_patterns_in_pyproject(tmp_path, monkeypatch):
     pyproject = tmp_path / "pyproject.toml"
     pyproject.write_text(
@@ -122,6 +138,16 @@ def test_categorize_commits_correctly():
     assert categorized[str(BumpLevel.MAJOR)] == ["BREAKING CHANGE: wow"]
 
 
+def test_categorize_commits_leaves_out_duplicates():
+    vm = create_vm()
+    commits = ["fix: bug", "feat: x", "fix: bug", "fix: bug"]
+    categorized = vm.categorize_commits(commits, {"fix: bug": 2})
+    assert categorized[str(BumpLevel.PATCH)] == ["fix: bug"]
+    assert categorized[str(BumpLevel.MINOR)] == ["feat: x"]
+    store = vm.categorize_commits(CommitStore.from_messages(commits), {"feat: x": 1})
+    assert store[str(BumpLevel.PATCH)] == ["fix: bug"] * 3 and store[str(BumpLevel.MINOR)] == []
+
+
 def test_invalid_pyproject_logs_error(tmp_path, monkeypatch, caplog):
     broken_file = tmp_path / "pyproject.toml"
     broken_file.write_text("{ not: valid: toml")
@@ -182,3 +208,57 @@ def test_missing_default_and_user_config_warns(monkeypatch, tmp_path, caplog):
     # beide Warnungen sollten im Log stehen (lines 34 & 47)
     assert "Default config" in caplog.text
     assert "User config" in caplog.text
+
+
+def test_patterns_see_bounded_subject_and_body():
+    vm = create_vm()
+    vm.max_subject_length = 20
+    vm.max_body_length = 30
+    assert vm.determine_bump(["x" * 30 + " feat!: late"]) == BumpLevel.PATCH
+    assert vm.determine_bump(["feat!: early" + "x" * 30]) == BumpLevel.MAJOR
+    assert vm.determine_bump(["fix: a\n\nBREAKING CHANGE: soon"]) == BumpLevel.MAJOR
+    assert vm.determine_bump(["fix: a\n" + "x" * 40 + "\nBREAKING CHANGE: late"]) == BumpLevel.PATCH
+
+
+def test_classification_budget_exceeded(monkeypatch):
+    vm = create_vm()
+    vm.classification_budget = 1
+    clock = iter(range(0, 100, 1))
+    monkeypatch.setattr("gitag.version_manager.time.perf_counter", lambda: next(clock) * 0.3)
+    with pytest.raises(ClassificationBudgetExceeded, match="exceeded the 1s budget after 4 messages"):
+        vm.categorize_commits(["fix: a"] * 10)
+
+    vm.classification_budget = 0
+    assert vm.determine_bump(["fix: a"] * 10) == BumpLevel.PATCH
+
+
+def test_raw_strategy_agrees_with_text():
+    vm = create_vm()
+    vm.max_subject_length = 20
+    vm.max_body_length = 30
+    vm.patterns = {**vm.patterns, "minor": [*vm.patterns["minor"], r"\s\w+ API$"]}
+    messages = [
+        "  feat(core): x  ",
+        "fix: a\n\nBREAKING CHANGE: soon",
+        "fix: a\n" + "x" * 40 + "\nBREAKING CHANGE: late",
+        "x" * 30 + " feat!: late",
+        "chore: new API",
+        "chore: neue Schnittstelle für API",
+        "chore:\x1cAPI",
+        "feat!: drop ✨",
+    ]
+    for message in messages:
+        assert vm.raw_bump_strategy(memoryview(message.encode())) == vm.regex_bump_strategy(message), message
+    assert [level for _, level in vm.classify(m.encode() for m in messages)] == list(map(vm.strategy, messages))
+
+
+def test_raw_messages_with_non_ascii_patterns_or_custom_strategy_are_decoded():
+    vm = create_vm()
+    vm.patterns = {"major": ["^💥"]}
+    assert vm._compiled_raw is None
+    assert vm.determine_bump(["💥 boom"]) == vm.highest_bump([b"\xf0\x9f\x92\xa5 boom"]) == BumpLevel.MAJOR
+
+    seen = []
+    vm.strategy = lambda msg: seen.append(msg) or BumpLevel.MINOR
+    assert vm.highest_bump([memoryview(b"fix: x")]) == BumpLevel.MINOR
+    assert seen == ["fix: x"]
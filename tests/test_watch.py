@@ -0,0 +1,124 @@
+import json
+import subprocess
+from unittest import mock
+
+import pytest
+
+from gitag.config import MergeStrategy
+from gitag.git_repo import GitRepo
+from gitag.next_version import resolve_base_tag
+from gitag.refs import find_git_dir
+from gitag.version_manager import VersionManager
+from gitag.watch import InotifyWatcher, PendingVersion, PollingWatcher, watch, write_result
+
+from conftest import commit, git, init_repo
+
+
+@pytest.fixture
+def repo(tmp_path):
+    path = init_repo(tmp_path / "repo")
+    commit(path, "feat: first")
+    git(path, "tag", "v1.0.0")
+    commit(path, "fix: one")
+    return path
+
+
+def _pending(repo, strategy=MergeStrategy.AUTO):
+    git_repo = GitRepo(cwd=str(repo), merge_strategy=strategy)
+    return PendingVersion(git_repo, VersionManager(str(repo / "missing.toml")))
+
+
+def test_new_commits_are_classified_incrementally(repo):
+    pending = _pending(repo)
+    assert pending.refresh()["next_version"] == "v1.0.1"
+    assert pending.refresh() is None  # Nothing changed
+
+    commit(repo, "feat: two")
+    with mock.patch.object(pending.repo, "get_commit_messages", wraps=pending.repo.get_commit_messages) as full:
+        result = pending.refresh()
+    full.assert_not_called()
+    assert (result["next_version"], result["commits"]) == ("v1.1.0", 2)
+    assert result["head"] == git(repo, "rev-parse", "HEAD")
+
+
+def test_new_tag_or_reset_recomputes(repo):
+    pending = _pending(repo)
+    pending.refresh()
+    git(repo, "tag", "v1.0.1")
+    assert pending.refresh()["next_version"] is None
+
+    commit(repo, "feat!: break")
+    assert pending.refresh()["next_version"] == "v2.0.0"
+    git(repo, "reset", "-q", "--hard", "HEAD~1")
+    commit(repo, "fix: instead")
+    result = pending.refresh()
+    assert (result["next_version"], result["commits"]) == ("v1.0.2", 1)
+
+
+def test_merge_head_uses_feature_range(repo):
+    pending = _pending(repo)
+    pending.refresh()
+    git(repo, "checkout", "-q", "-b", "feature")
+    commit(repo, "feat: on branch")
+    git(repo, "checkout", "-q", "main")
+    git(repo, "merge", "-q", "--no-ff", "feature", "-m", "Merge branch 'feature'")
+    assert pending.refresh()["commits"] == 1  # auto: only the merged branch
+    assert not pending.incremental
+
+
+def test_polling_watcher_sees_commits(repo):
+    watcher = PollingWatcher(find_git_dir(str(repo)), interval=0.01)
+    assert watcher.wait(timeout=0.05) is False
+    commit(repo, "fix: two")
+    assert watcher.wait(timeout=1) is True
+
+
+@pytest.mark.skipif(not InotifyWatcher.available(), reason="inotify not available")
+def test_inotify_watcher_ignores_non_ref_changes(repo):
+    git_dir = find_git_dir(str(repo))
+    watcher = InotifyWatcher(git_dir)
+    try:
+        (git_dir / "FETCH_HEAD").write_text("")
+        assert watcher.wait(timeout=0.1) is False
+        git(repo, "tag", "release/v1.0.1")  # New refs/tags/release directory
+        assert watcher.wait(timeout=1) is True
+        git(repo, "tag", "release/v1.0.2")
+        assert watcher.wait(timeout=1) is True
+    finally:
+        watcher.close()
+
+
+def test_watch_reports_each_change(repo, tmp_path):
+    pending = _pending(repo)
+    watcher = mock.Mock()
+    watcher.wait.side_effect = lambda timeout=None: timeout is None and not commit(repo, "feat: two")
+    results = []
+    watch(pending, watcher, results.append, debounce=0, updates=2)
+    assert [r["next_version"] for r in results] == ["v1.0.1", "v1.1.0"]
+
+    write_result(results[-1], str(tmp_path / "next.json"))
+    assert json.loads((tmp_path / "next.json").read_text())["bump"] == "minor"
+
+
+def test_fresh_repo_reports_no_commits_until_first_commit(tmp_path):
+    path = init_repo(tmp_path / "fresh")
+    pending = _pending(path)
+    assert pending.refresh()["error"] == "no commits yet"
+    assert pending.refresh() is None  # Still unborn: nothing new to report
+
+    commit(path, "feat: first")
+    result = pending.refresh()
+    assert (result["next_version"], result["commits"]) == ("v0.1.0", 1)
+    assert "error" not in result
+
+
+def test_watch_keeps_going_after_git_failure(repo):
+    pending = _pending(repo)
+    watcher = mock.Mock()
+    watcher.wait.side_effect = lambda timeout=None: timeout is None
+    failure = subprocess.CalledProcessError(128, ["git"], stderr="fatal: bad object\n")
+    results = []
+    with mock.patch("gitag.watch.resolve_base_tag", side_effect=[failure, resolve_base_tag(pending.repo)]):
+        watch(pending, watcher, results.append, debounce=0, updates=2)
+    assert results[0]["error"] == "git failed: fatal: bad object"
+    assert (results[1]["next_version"], results[1]["commits"]) == ("v1.0.1", 1)